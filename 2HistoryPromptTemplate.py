@@ -1,14 +1,16 @@
 import os
-from langchain_openai import ChatOpenAI
 import streamlit as st
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.output_parsers import StrOutputParser
-from langchain_community.chat_message_histories import StreamlitChatMessageHistory
 from langchain_core.runnables.history import RunnableWithMessageHistory
+from llmkit.streaming import stream_to_streamlit
+from llmkit.resources import chat_openai
+from llmkit.history import SummaryBufferHistory
+from llmkit.session_history import SQLiteChatMessageHistory, sqlite_history_store, streamlit_session_id
 
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-llm = ChatOpenAI(model="gpt-5",api_key=OPENAI_API_KEY)
+llm = chat_openai("gpt-5", api_key=OPENAI_API_KEY)
 prompt_template = ChatPromptTemplate.from_messages(
     [
         ("system", "You are a Agile coach. Answer any questions "
@@ -20,11 +22,15 @@ prompt_template = ChatPromptTemplate.from_messages(
 
 chain = prompt_template | llm
 
-history_for_chain=StreamlitChatMessageHistory()
+history_store=sqlite_history_store("chat_history.sqlite3")
+session_id=streamlit_session_id()
+
+def get_session_history(session_id):
+    return SummaryBufferHistory(SQLiteChatMessageHistory(session_id, history_store), llm, max_tokens=2000)
 
 chain_with_history=RunnableWithMessageHistory(
     chain,
-    lambda session_id:history_for_chain,
+    get_session_history,
     input_messages_key="input",
     history_messages_key="chat_history"
 )
@@ -36,5 +42,4 @@ input = st.text_input("Enter the question:")
 
 
 if input:
-    response = chain_with_history.invoke({"input": input},{"configurable":{"session_id":"session-abc"}})
-    st.write(response.content)
\ No newline at end of file
+    stream_to_streamlit(chain_with_history, {"input": input},{"configurable":{"session_id":session_id}})
\ No newline at end of file
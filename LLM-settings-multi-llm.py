@@ -1,7 +1,8 @@
 import streamlit as st
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from llmkit.streaming import stream_to_streamlit
+from llmkit.resources import MAX_ENTRIES, TTL, chat_openai
 
 st.title("💡 Startup Idea Generator & Critique")
 
@@ -14,47 +15,51 @@ top_p = st.sidebar.slider("Top P (nucleus sampling)", 0.0, 1.0, 1.0, 0.05)
 top_k = st.sidebar.slider("Top K (token sampling limit)", 1, 100, 50, 1)
 max_tokens = st.sidebar.number_input("Max Tokens", min_value=50, max_value=2000, value=300, step=50)
 
-# --- LLM Setup ---
-idea_llm = ChatOpenAI(
-    model="gpt-5-mini",
-    temperature=temperature,
-    top_p=top_p,
-    top_k=top_k,
-    max_tokens=max_tokens
-)
-
-critic_llm = ChatOpenAI(
-    model="gpt-5",
-    temperature=temperature,
-    top_p=top_p,
-    top_k=top_k,
-    max_tokens=max_tokens
-)
-
-# --- Prompts ---
-idea_prompt = PromptTemplate(
-    input_variables=["theme"],
-    template="Generate 5 innovative startup ideas in the {theme} industry."
-)
-
-critic_prompt = PromptTemplate(
-    input_variables=["ideas"],
-    template="Critically evaluate these startup ideas for feasibility and originality:\n{ideas}"
-)
-
-# --- Chain ---
-chain = (
-    idea_prompt
-    | idea_llm
-    | StrOutputParser()
-    | critic_prompt
-    | critic_llm
-    | StrOutputParser()
-)
+# --- Chain (built once per slider combination, reused across reruns) ---
+@st.cache_resource(show_spinner=False, max_entries=MAX_ENTRIES, ttl=TTL)
+def build_chain(temperature, top_p, top_k, max_tokens):
+    # --- LLM Setup ---
+    idea_llm = chat_openai(
+        "gpt-5-mini",
+        temperature=temperature,
+        top_p=top_p,
+        top_k=top_k,
+        max_tokens=max_tokens
+    )
+
+    critic_llm = chat_openai(
+        "gpt-5",
+        temperature=temperature,
+        top_p=top_p,
+        top_k=top_k,
+        max_tokens=max_tokens
+    )
+
+    # --- Prompts ---
+    idea_prompt = PromptTemplate(
+        input_variables=["theme"],
+        template="Generate 5 innovative startup ideas in the {theme} industry."
+    )
+
+    critic_prompt = PromptTemplate(
+        input_variables=["ideas"],
+        template="Critically evaluate these startup ideas for feasibility and originality:\n{ideas}"
+    )
+
+    return (
+        idea_prompt
+        | idea_llm
+        | StrOutputParser()
+        | critic_prompt
+        | critic_llm
+        | StrOutputParser()
+    )
+
+
+chain = build_chain(temperature, top_p, top_k, max_tokens)
 
 # --- Run ---
 if st.button("🚀 Generate & Critique"):
-    with st.spinner("Generating and analyzing ideas..."):
-        result = chain.invoke({"theme": theme})
     st.subheader("🧾 Results:")
-    st.write(result)
+    with st.spinner("Generating and analyzing ideas..."):
+        stream_to_streamlit(chain, {"theme": theme})
@@ -1,15 +1,48 @@
 import os
 import streamlit as st
 from datetime import date
-from langchain_aws import ChatBedrock
 from langchain.prompts import PromptTemplate
+from llmkit.streaming import stream_to_streamlit
+from llmkit.resources import chat_bedrock
 
 # --- AWS Bedrock LLM Initialization ---
-llm = ChatBedrock(
+llm = chat_bedrock(
     model_id="anthropic.claude-3-sonnet-20240229-v1:0",
     region_name="us-east-1"
 )
 
+# --- Prompt (built once, not on every click) ---
+prompt_template = PromptTemplate(
+    input_variables=["city", "start_date", "end_date", "interests", "budget", "language"],
+    template="""
+                Create a detailed, day-by-day travel itinerary for a trip to {city} from {start_date} to {end_date}.
+                Traveler interests include: {interests}.
+                Budget level: {budget}.
+                Preferred language: {language}.
+
+                Include:
+                - Key attractions and activities each day
+                - Recommended food or dining spots
+                - Cultural tips or local phrases
+                - Travel time suggestions
+                - Local events or festivals if any
+                - Short travel advice at the end
+                """
+)
+
+
+def prompt_values(city, start_date, end_date, interests, budget, language):
+    """Template variables from the form inputs; batch_generate.py renders its records with this too."""
+    return {
+        "city": city,
+        "start_date": start_date,
+        "end_date": end_date,
+        "interests": ", ".join(interests) if interests else "General sightseeing",
+        "budget": budget,
+        "language": language,
+    }
+
+
 # --- Streamlit Page Setup ---
 st.set_page_config(page_title="AI Travel Itinerary Planner 🧳", page_icon="🌍", layout="centered")
 
@@ -37,46 +70,20 @@ if st.button("✨ Generate Itinerary"):
         st.warning("Please enter city and travel dates.")
     else:
         with st.spinner("Generating your itinerary... 🗺️"):
-            # --- Create Prompt ---
-            prompt_template = PromptTemplate(
-                input_variables=["city", "start_date", "end_date", "interests", "budget", "language"],
-                template="""
-                Create a detailed, day-by-day travel itinerary for a trip to {city} from {start_date} to {end_date}.
-                Traveler interests include: {interests}.
-                Budget level: {budget}.
-                Preferred language: {language}.
-
-                Include:
-                - Key attractions and activities each day
-                - Recommended food or dining spots
-                - Cultural tips or local phrases
-                - Travel time suggestions
-                - Local events or festivals if any
-                - Short travel advice at the end
-                """
-            )
-
             formatted_prompt = prompt_template.format(
-                city=city,
-                start_date=start_date,
-                end_date=end_date,
-                interests=", ".join(interests) if interests else "General sightseeing",
-                budget=budget,
-                language=language
+                **prompt_values(city, start_date, end_date, interests, budget, language)
             )
 
-            # --- Call the Claude model ---
-            response = llm.invoke(formatted_prompt)
-
-            # --- Display Results ---
-            st.success(f"✅ Your {len(response.content.splitlines())//5}-day itinerary for {city} is ready!")
+            # --- Call the Claude model and stream the results ---
+            status = st.empty()
             st.markdown("### 🧳 Your Personalized Itinerary")
-            st.markdown(response.content)
+            itinerary = stream_to_streamlit(llm, formatted_prompt)
+            status.success(f"✅ Your {len(itinerary.splitlines())//5}-day itinerary for {city} is ready!")
 
             # --- Optional Download ---
             st.download_button(
                 label="📥 Download Itinerary as Text",
-                data=response.content,
+                data=itinerary,
                 file_name=f"{city}_itinerary.txt",
                 mime="text/plain"
             )
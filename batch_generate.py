@@ -0,0 +1,51 @@
+# batch_generate.py
+#
+# Pre-generate planner results offline from a JSONL of inputs, one JSON object per line
+# with the app's prompt variables (plus an optional "id"):
+#
+#   python batch_generate.py itinerary trips.jsonl itineraries.jsonl --concurrency 16
+#   {"id": "lisbon-1", "city": "Lisbon", "start_date": "2025-05-01", "end_date": "2025-05-04",
+#    "interests": ["Food", "History"], "budget": "Mid-range", "language": "English"}
+#
+# Re-running the same command resumes: ids already in the output are skipped.
+import argparse
+import logging
+import os
+
+from llmkit.batch import load_app, run_batch
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# app: (script, name of its PromptTemplate, name of the function that turns form values
+# into template variables, or None when the app formats them as they are)
+APPS = {
+    "itinerary": ("ai_itineray_planner.py", "prompt_template", "prompt_values"),
+    "sustainability-plan": ("sustainable_lifestyle_planner.py", "prompt_template", "prompt_values"),
+    "mindful-note": ("mindful_morning_coach.py", "prompt_template", None),
+    "startup-ideas": ("startup_ideator.py", "prompt_template", None),
+    "learning-path": ("learning_path_generator.py", "roadmap_prompt", None),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate planner results for every line of a JSONL file")
+    parser.add_argument("app", choices=list(APPS))
+    parser.add_argument("inputs", help="JSONL file of prompt variables")
+    parser.add_argument("output", help="JSONL file results are appended to")
+    parser.add_argument("--concurrency", type=int, default=8, help="requests in flight")
+    parser.add_argument("--progress-every", type=float, default=10.0, help="seconds between progress lines")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    script, prompt_name, preprocess_name = APPS[args.app]
+    app = load_app(os.path.join(ROOT, script), workdir=ROOT)
+    stats = run_batch(app["llm"], app[prompt_name], args.inputs, args.output,
+                      preprocess=app[preprocess_name] if preprocess_name else None,
+                      concurrency=args.concurrency, progress_every=args.progress_every)
+    print(f"{stats['done']} generated, {stats['skipped']} already done, {stats['failed']} failed "
+          f"in {stats['seconds']:.1f}s ({stats['per_second']:.2f}/s, "
+          f"p50 {stats['p50']:.2f}s, p95 {stats['p95']:.2f}s, p99 {stats['p99']:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
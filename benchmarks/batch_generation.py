@@ -0,0 +1,80 @@
+"""Batch generation throughput vs. concurrency, up to a provider limit.
+
+    python -m benchmarks.batch_generation --records 200 --concurrency 4 16 64 128
+
+Loads ``ai_itineray_planner.py`` headless with its Bedrock model replaced by
+a gateway chat model pointed at a local stub OpenAI server, which takes
+``--latency`` seconds per request and answers 429 above ``--max-in-flight``
+concurrent requests. Each row runs ``llmkit.batch.run_batch`` over
+``--records`` synthetic trips into a fresh output file. The last row
+interrupts a run halfway and resumes it, to show the checkpoint at work.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import tempfile
+
+from benchmarks.chains import fake_models
+from llmkit.batch import arun_batch, load_app, read_records, run_batch
+from llmkit.fakes import FakeEmbeddings, StubOpenAIServer
+from llmkit.gateway import LLMGateway, chat_model
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+CITIES = ["Lisbon", "Kyoto", "Oaxaca", "Tbilisi", "Hanoi", "Porto", "Cusco", "Seville"]
+
+
+def write_records(path, count):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            f.write(json.dumps({"id": f"trip-{i}", "city": CITIES[i % len(CITIES)], "start_date": "2025-05-01",
+                                "end_date": "2025-05-04", "interests": ["Food", "History"],
+                                "budget": f"Mid-range, up to {100 + i} EUR a day", "language": "English"}) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[4, 16, 64, 128])
+    parser.add_argument("--latency", type=float, default=1.0, help="stub seconds per request")
+    parser.add_argument("--max-in-flight", type=int, default=64)
+    args = parser.parse_args()
+    logging.getLogger("llmkit.batch").setLevel(logging.WARNING)
+
+    with StubOpenAIServer(latency=args.latency, max_in_flight=args.max_in_flight) as server, \
+            tempfile.TemporaryDirectory() as tmp:
+        gateway = LLMGateway(max_connections=256, requests_per_second=1000, burst=256)
+        llm = chat_model("stub", base_url=server.base_url, api_key="stub", gateway=gateway)
+        with fake_models(llm, FakeEmbeddings()):
+            app = load_app(os.path.join(ROOT, "ai_itineray_planner.py"), tmp)
+        prompt, preprocess = app["prompt_template"], app["prompt_values"]
+        inputs = os.path.join(tmp, "trips.jsonl")
+        write_records(inputs, args.records)
+
+        print(f"{'concurrency':>12}{'done':>6}{'skipped':>9}{'seconds':>9}{'items/s':>9}{'429':>6}"
+              f"{'p50 s':>7}{'p95 s':>7}{'p99 s':>7}")
+
+        def row(label, stats, rejected):
+            print(f"{label:>12}{stats['done']:>6}{stats['skipped']:>9}{stats['seconds']:>9.2f}"
+                  f"{stats['per_second']:>9.1f}{rejected:>6}{stats['p50']:>7.2f}{stats['p95']:>7.2f}"
+                  f"{stats['p99']:>7.2f}", flush=True)
+
+        for concurrency in args.concurrency:
+            rejected = server.rejected
+            stats = run_batch(llm, prompt, inputs, os.path.join(tmp, f"out-{concurrency}.jsonl"),
+                              preprocess=preprocess, concurrency=concurrency)
+            row(concurrency, stats, server.rejected - rejected)
+
+        output = os.path.join(tmp, "resumed.jsonl")
+        half = list(read_records(inputs))[:args.records // 2]
+        asyncio.run(arun_batch(llm, prompt, iter(half), output, concurrency=16, preprocess=preprocess))
+        rejected = server.rejected
+        row("16 resumed", run_batch(llm, prompt, inputs, output, preprocess=preprocess, concurrency=16),
+            server.rejected - rejected)
+        gateway.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Latency, throughput and allocations of the apps' chains on fake models.
+
+    python -m benchmarks.chains --requests 100 --concurrency 1 8
+    python -m benchmarks.chains --chains rag history-chat --first-token-latency 0.5
+
+Each app script is executed as it ships by ``llmkit.batch.load_app``
+(Streamlit in bare mode, so widgets return their defaults) with every model factory it
+uses - ``llmkit.resources.chat_*``, ``ChatOpenAI``, ``OpenAIEmbeddings`` -
+replaced by ``FakeChatModel``/``FakeEmbeddings``, in a scratch working
+directory so indexes and history databases do not touch the checkout. The
+chain is then taken from the script's globals and invoked ``--requests``
+times from ``--concurrency`` threads.
+
+Reported per chain: p50/p95/p99 latency of one invocation, throughput, and
+the peak memory allocated by one sequential invocation (``tracemalloc``).
+Fake latencies are per model call, so chains that call the model twice
+(speech, marketing email) pay twice.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from unittest import mock
+
+import numpy as np
+
+from llmkit.batch import load_app
+from llmkit.fakes import FakeChatModel, FakeEmbeddings
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+ROADMAP = json.dumps({
+    "weeks_total": 2,
+    "weeks": [{"week": i, "focus": "Python for data", "learning_objectives": ["pandas", "numpy"],
+               "recommended_resources": [{"type": "course", "title": "Data analysis"}],
+               "project_idea": "Analyse a public dataset", "search_keywords": ["pandas tutorial"]}
+              for i in (1, 2)],
+    "meta": {"assessment_checkpoints": ["build a notebook"], "final_project": "A small ML service"},
+})
+
+EMAIL = json.dumps({"subject": "Meet the XYZ smartphone", "audience": "students",
+                    "email": "Dear student, the XYZ smartphone has a great battery and camera. " * 8})
+
+PROSE = "A clear and concise reply written by a fake model to simulate a real answer. " * 6
+
+# name: (script, how to get the chain from its globals, input, fake reply, files the script reads)
+CHAINS = {
+    "speech": ("lcel-speech-generator.py", lambda g: g["final_chain"],
+               {"topic": "climate change"}, PROSE, ()),
+    "rag": ("langchaindemo/rag/rag_demo.py", lambda g: g["rag_chain"],
+            {"input": "What is your return policy?"}, PROSE, ("product-data.txt",)),
+    "history-chat": ("2HistoryPromptTemplate.py", lambda g: g["chain_with_history"],
+                     {"input": "How long should a sprint be?"}, PROSE, ()),
+    "marketing-email": ("langchaindemo/assignments/marketing_email_generator.py",
+                        lambda g: g["overall_chain"],
+                        {"product_name": "XYZ smartphone", "features": "battery, camera"}, EMAIL, ()),
+    "learning-path": ("learning_path_generator.py", lambda g: g["roadmap_prompt"] | g["llm"],
+                      {"current_skill": "Intermediate in Python", "target_role": "ML Engineer",
+                       "months": 6, "learning_style": "Project-first"}, ROADMAP, ()),
+    "itinerary": ("ai_itineray_planner.py", lambda g: g["prompt_template"] | g["llm"],
+                  {"city": "Lisbon", "start_date": "2025-05-01", "end_date": "2025-05-04",
+                   "interests": "Food, History", "budget": "Mid-range", "language": "English"}, PROSE, ()),
+}
+
+
+@contextmanager
+def fake_models(chat, embeddings):
+    """Make every model factory the apps use return ``chat``/``embeddings``."""
+    import langchain_openai
+
+    import llmkit.resources
+
+    with ExitStack() as stack:
+        for name in ("chat_openai", "chat_bedrock", "chat_ollama"):
+            stack.enter_context(mock.patch.object(llmkit.resources, name, lambda *a, **k: chat))
+        stack.enter_context(mock.patch.object(llmkit.resources, "openai_embeddings", lambda *a, **k: embeddings))
+        stack.enter_context(mock.patch.object(langchain_openai, "ChatOpenAI", lambda *a, **k: chat))
+        stack.enter_context(mock.patch.object(langchain_openai, "OpenAIEmbeddings", lambda *a, **k: embeddings))
+        yield
+
+
+def load_chain(name, chat, embeddings, workdir):
+    """Run the app script for ``name`` in ``workdir`` and return its chain."""
+    script, get_chain, _, _, files = CHAINS[name]
+    path = os.path.join(ROOT, script)
+    for file in files:
+        os.symlink(os.path.join(os.path.dirname(path), file), os.path.join(workdir, file))
+    with fake_models(chat, embeddings):
+        return get_chain(load_app(path, workdir))
+
+
+def invoke(chain, inputs):
+    """One request, with a fresh chat session for chains that keep history."""
+    return chain.invoke(inputs, {"configurable": {"session_id": uuid.uuid4().hex}})
+
+
+def measure(chain, inputs, requests, concurrency):
+    def timed(_):
+        start = time.perf_counter()
+        invoke(chain, inputs)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        latencies = list(pool.map(timed, range(requests)))
+    return np.array(latencies), requests / (time.perf_counter() - start)
+
+
+def allocated(chain, inputs, samples=3):
+    """Peak KiB allocated by one invocation, median over ``samples``."""
+    peaks = []
+    for _ in range(samples):
+        tracemalloc.start()
+        invoke(chain, inputs)
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+        tracemalloc.stop()
+    return float(np.median(peaks))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chains", nargs="+", default=list(CHAINS), choices=list(CHAINS))
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--first-token-latency", type=float, default=0.3)
+    parser.add_argument("--token-latency", type=float, default=0.005)
+    parser.add_argument("--prompt-token-latency", type=float, default=0.0)
+    parser.add_argument("--embedding-latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    print(f"{'chain':<17}{'threads':>8}{'p50 s':>8}{'p95 s':>8}{'p99 s':>8}{'req/s':>8}{'alloc KiB':>11}")
+    for name in args.chains:
+        _, _, inputs, reply, _ = CHAINS[name]
+        chat = FakeChatModel(responses=[reply], first_token_latency=args.first_token_latency,
+                             token_latency=args.token_latency, prompt_token_latency=args.prompt_token_latency)
+        embeddings = FakeEmbeddings(latency=args.embedding_latency)
+        with tempfile.TemporaryDirectory() as workdir:
+            chain = load_chain(name, chat, embeddings, workdir)
+            cwd = os.getcwd()
+            os.chdir(workdir)
+            try:
+                kib = allocated(chain, inputs)
+                for concurrency in args.concurrency:
+                    latencies, throughput = measure(chain, inputs, args.requests, concurrency)
+                    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+                    print(f"{name:<17}{concurrency:>8}{p50:>8.3f}{p95:>8.3f}{p99:>8.3f}{throughput:>8.1f}"
+                          f"{kib:>11.0f}", flush=True)
+            finally:
+                os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
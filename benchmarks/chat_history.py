@@ -0,0 +1,75 @@
+"""Prompt tokens and latency per turn over a long synthetic chat.
+
+    python -m benchmarks.chat_history --turns 200
+
+Runs the Agile coach chain of ``2HistoryPromptTemplate.py`` for ``--turns``
+turns, once with the unbounded history the apps used to keep and once with
+``SummaryBufferHistory``. ``FakeChatModel`` charges a prefill cost per
+prompt token, so latency tracks prompt size the way a hosted model's does.
+The bounded run includes the time of its summary calls.
+"""
+import argparse
+import time
+
+from langchain_core.chat_history import InMemoryChatMessageHistory
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables.history import RunnableWithMessageHistory
+
+from llmkit.fakes import FakeChatModel
+from llmkit.history import SummaryBufferHistory
+
+
+def words(n, tag):
+    return " ".join(f"{tag}{i}" for i in range(n))
+
+
+def run(turns, bounded, max_tokens, args):
+    llm = FakeChatModel(responses=[words(args.reply_words, "answer")], first_token_latency=args.first_token_latency,
+                        token_latency=0.0, prompt_token_latency=args.prompt_token_latency)
+    summarizer = FakeChatModel(responses=[words(120, "summary")], first_token_latency=args.first_token_latency,
+                               token_latency=0.0, prompt_token_latency=args.prompt_token_latency)
+    history = InMemoryChatMessageHistory()
+    if bounded:
+        history = SummaryBufferHistory(history, summarizer, max_tokens=max_tokens)
+    prompt = ChatPromptTemplate.from_messages(
+        [("system", "You are an Agile coach."), MessagesPlaceholder("chat_history"), ("human", "{input}")]
+    )
+    chain = RunnableWithMessageHistory(prompt | llm, lambda session_id: history,
+                                       input_messages_key="input", history_messages_key="chat_history")
+
+    latencies = []
+    for turn in range(turns):
+        start = time.perf_counter()
+        chain.invoke({"input": f"Question {turn}: " + words(args.question_words, "q")},
+                     {"configurable": {"session_id": "bench"}})
+        latencies.append(time.perf_counter() - start)
+    return llm.prompt_tokens, latencies, summarizer.calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--max-tokens", type=int, default=2000)
+    parser.add_argument("--question-words", type=int, default=30)
+    parser.add_argument("--reply-words", type=int, default=150)
+    parser.add_argument("--first-token-latency", type=float, default=0.005)
+    parser.add_argument("--prompt-token-latency", type=float, default=0.00001)
+    args = parser.parse_args()
+
+    results = {}
+    for label, bounded in (("unbounded", False), ("summary buffer", True)):
+        results[label] = run(args.turns, bounded, args.max_tokens, args)
+
+    checkpoints = sorted({1, 10, 50, 100, args.turns} & set(range(1, args.turns + 1)))
+    print(f"{'history':<16}{'turn':>6}{'prompt tokens':>15}{'latency s':>11}")
+    for label, (tokens, latencies, _) in results.items():
+        for turn in checkpoints:
+            print(f"{label:<16}{turn:>6}{tokens[turn - 1]:>15}{latencies[turn - 1]:>11.3f}")
+    print()
+    print(f"{'history':<16}{'total tokens':>14}{'total s':>10}{'summary calls':>15}")
+    for label, (tokens, latencies, summaries) in results.items():
+        print(f"{label:<16}{sum(tokens):>14}{sum(latencies):>10.2f}{summaries:>15}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Prompt tokens and latency per answer with and without context packing.
+
+    python -m benchmarks.context_packing --corpus langchaindemo/rag/product-data.txt
+
+Splits the corpus like the RAG demos (1000 characters, 200 overlap) and
+answers a set of questions through ``create_retrieval_chain`` and
+``create_stuff_documents_chain``. The ranking comes from BM25 so it is
+deterministic offline; the answer comes from ``FakeChatModel`` with a
+prefill cost per prompt token. ``stuff k=4`` is what the demos sent before
+(``as_retriever()`` returns 4 chunks); the packed rows retrieve 6 and pack
+them into the given budget.
+"""
+import argparse
+import os
+import time
+from typing import Any
+
+from langchain.chains import create_retrieval_chain
+from langchain.chains.combine_documents import create_stuff_documents_chain
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.retrievers import BaseRetriever
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from llmkit.context import packed_retriever
+from llmkit.fakes import FakeChatModel
+from llmkit.hybrid import BM25Index
+
+CORPUS = os.path.join(os.path.dirname(__file__), "..", "langchaindemo", "rag", "product-data.txt")
+
+QUESTIONS = [
+    "What are the features of the XYZ smartphone?",
+    "Is the ABC laptop available in stock?",
+    "How can I check the status of my order?",
+    "Can I cancel my order after it has been placed?",
+    "How long does shipping take?",
+    "What should I do if I receive a damaged item?",
+    "What is your return policy?",
+    "How do I reset my password?",
+]
+
+PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You are an assistant for answering questions.\nUse the provided context to respond. "
+               "If the answer isn't clear, acknowledge that you don't know.\n"
+               "Limit your response to three concise sentences.\n{context}"),
+    ("human", "{input}"),
+])
+
+
+class BM25Retriever(BaseRetriever):
+    bm25: Any
+    k: int = 4
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        return [doc for doc, _ in self.bm25.search(query, self.k)]
+
+
+def load(path):
+    if path.endswith(".pdf"):
+        from llmkit.pdf import iter_pdf_pages
+
+        return list(iter_pdf_pages(path, workers=1))
+    from langchain_community.document_loaders import TextLoader
+
+    return TextLoader(path).load()
+
+
+def run(retriever, args):
+    llm = FakeChatModel(responses=["The answer in three concise sentences. " * 6],
+                        first_token_latency=args.first_token_latency, token_latency=args.token_latency,
+                        prompt_token_latency=args.prompt_token_latency)
+    chain = create_retrieval_chain(retriever, create_stuff_documents_chain(llm, PROMPT))
+    start = time.perf_counter()
+    for question in QUESTIONS:
+        chain.invoke({"input": question})
+    return sum(llm.prompt_tokens) / len(QUESTIONS), (time.perf_counter() - start) / len(QUESTIONS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=CORPUS)
+    parser.add_argument("--budgets", default="600,400")
+    parser.add_argument("--first-token-latency", type=float, default=0.3)
+    parser.add_argument("--token-latency", type=float, default=0.01)
+    parser.add_argument("--prompt-token-latency", type=float, default=0.0002)
+    args = parser.parse_args()
+
+    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+    chunks = splitter.split_documents(load(args.corpus))
+    bm25 = BM25Index(chunks)
+
+    rows = [("stuff k=4", BM25Retriever(bm25=bm25, k=4))]
+    rows += [(f"packed {budget}", packed_retriever(BM25Retriever(bm25=bm25, k=6), max_tokens=int(budget)))
+             for budget in args.budgets.split(",")]
+
+    print(f"{len(chunks)} chunks, {len(QUESTIONS)} questions\n")
+    print(f"{'context':<14}{'prompt tokens':>15}{'seconds/answer':>16}")
+    for label, retriever in rows:
+        tokens, seconds = run(retriever, args)
+        print(f"{label:<14}{tokens:>15.0f}{seconds:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Time to retrieved documents per turn in history-aware RAG.
+
+    python -m benchmarks.history_rewrite
+
+Plays a scripted support conversation (self-contained questions mixed with
+follow-ups) through the retrieval half of the historyaware RAG demo and
+reports the rewrite calls and the mean time from question to retrieved
+documents. ``create_history_aware_retriever`` is the demo's previous setup
+(QA model and QA prompt for the rewrite); ``history_aware_retriever`` uses
+a faster model and rewrites only follow-ups. The conversation is played
+twice; the second pass shows cached rewrites.
+"""
+import argparse
+import time
+
+from langchain.chains import create_history_aware_retriever
+from langchain_community.document_loaders import TextLoader
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from benchmarks.context_packing import CORPUS, PROMPT, BM25Retriever
+from llmkit.condense import QuestionRewriter
+from llmkit.fakes import FakeChatModel
+from llmkit.hybrid import BM25Index
+
+CONVERSATION = [
+    "What are the features of the XYZ smartphone?",
+    "How much does it cost?",
+    "Is the ABC laptop available in stock?",
+    "What about the warranty?",
+    "How can I check the status of my order?",
+    "Can I cancel my order after it has been placed?",
+    "How long does shipping take?",
+    "And internationally?",
+    "What is your return policy?",
+    "How do I reset my password?",
+]
+
+
+def play(retriever, passes=2):
+    """Mean seconds to documents per pass."""
+    results = []
+    for _ in range(passes):
+        history = []
+        start = time.perf_counter()
+        for question in CONVERSATION:
+            retriever.invoke({"input": question, "chat_history": history})
+            history += [HumanMessage(question), AIMessage("A short answer in three concise sentences.")]
+        results.append((time.perf_counter() - start) / len(CONVERSATION))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--qa-first-token-latency", type=float, default=0.5)
+    parser.add_argument("--fast-first-token-latency", type=float, default=0.2)
+    parser.add_argument("--prompt-token-latency", type=float, default=0.0002)
+    args = parser.parse_args()
+
+    chunks = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200).split_documents(
+        TextLoader(CORPUS).load())
+    retriever = BM25Retriever(bm25=BM25Index(chunks), k=4)
+    reply = ["What is the standalone version of the question?"]
+
+    qa_llm = FakeChatModel(responses=reply, first_token_latency=args.qa_first_token_latency,
+                           token_latency=0.01, prompt_token_latency=args.prompt_token_latency)
+    fast_llm = FakeChatModel(responses=reply, first_token_latency=args.fast_first_token_latency,
+                             token_latency=0.004, prompt_token_latency=args.prompt_token_latency / 4)
+    rewriter = QuestionRewriter(fast_llm)
+
+    rows = [
+        ("create_history_aware_retriever", qa_llm,
+         create_history_aware_retriever(qa_llm, retriever, PROMPT.partial(context=""))),
+        ("history_aware_retriever", fast_llm,
+         RunnableLambda(rewriter.rewrite) | retriever),
+    ]
+    print(f"{len(CONVERSATION)} turns\n")
+    print(f"{'retriever':<32}{'rewrites':>9}{'first pass s':>14}{'second pass s':>15}")
+    for label, llm, chain in rows:
+        first, second = play(chain)
+        print(f"{label:<32}{llm.calls:>9}{first:>14.3f}{second:>15.3f}")
+    print(f"\nhistory_aware_retriever: {rewriter.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Cost of the BM25 side of ``HybridRetriever``.
+
+    python -m benchmarks.hybrid_retrieval --sizes 1000,10000,100000
+
+Builds a ``BM25Index`` over synthetic product FAQ chunks (each naming a
+SKU) and reports build time, query latency and the rate at which a query
+for a SKU ranks that SKU's chunk first. The last columns compare a dense
+retriever with simulated embedding latency against the hybrid retriever on
+top of it: the lexical search runs while the query is being embedded, so
+it adds next to nothing end to end.
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+from langchain_core.documents import Document
+
+from llmkit.fakes import FakeEmbeddings
+from llmkit.hybrid import BM25Index, HybridRetriever
+from llmkit.numpy_index import NumpyVectorStore
+
+WORDS = ("battery display storage camera shipping order return warranty refund delivery "
+         "laptop phone charger screen account payment discount stock exchange support").split()
+
+
+def chunks(size, seed=0):
+    rng = random.Random(seed)
+    return [Document(page_content=f"SKU-{i:06d}: " + " ".join(rng.choices(WORDS, k=60)))
+            for i in range(size)]
+
+
+def timed(fn, repeat):
+    latencies = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        latencies.append(time.perf_counter() - start)
+    return float(np.median(latencies))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--embedding-latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    print(f"{'chunks':>8}{'build s':>9}{'bm25 ms':>9}{'sku@1':>7}{'dense ms':>10}{'hybrid ms':>11}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        docs = chunks(size)
+        start = time.perf_counter()
+        bm25 = BM25Index(docs)
+        build = time.perf_counter() - start
+
+        rng = random.Random(1)
+        skus = [rng.randrange(size) for _ in range(args.queries)]
+        queries = [f"battery warranty for SKU-{sku:06d}" for sku in skus]
+        bm25_ms = timed(lambda i: bm25.search(queries[i], 10), args.queries) * 1e3
+        hits = sum(bm25.search(q, 1)[0][0].page_content.startswith(f"SKU-{sku:06d}")
+                   for q, sku in zip(queries, skus))
+
+        embeddings = FakeEmbeddings(size=64, latency=args.embedding_latency, per_text_latency=0)
+        store = NumpyVectorStore(embeddings)
+        store.add_embeddings([(str(i), d) for i, d in enumerate(docs)],
+                             np.random.default_rng(0).normal(size=(size, 64)))
+        dense = store.as_retriever(search_kwargs={"k": 10})
+        hybrid = HybridRetriever(vector_retriever=dense, bm25=bm25)
+        repeat = 20
+        dense_ms = timed(lambda i: dense.invoke(queries[i]), repeat) * 1e3
+        hybrid_ms = timed(lambda i: hybrid.invoke(queries[i]), repeat) * 1e3
+
+        print(f"{size:>8}{build:>9.2f}{bm25_ms:>9.3f}{hits / len(queries):>7.2f}{dense_ms:>10.1f}{hybrid_ms:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Vision request payload: raw base64 upload vs. ``llmkit.images.encode_image``.
+
+    python -m benchmarks.image_payload --repeats 20
+
+Compares, for the demo's ``airport_terminal_journey.jpeg`` and a synthetic
+12-megapixel phone photo with EXIF (GPS included), the base64 payload the
+apps used to send with what ``encode_image`` sends at ``"detail": "low"``:
+payload size, time per request over ``--repeats`` reruns with the same
+upload, and peak Python allocations of one request.
+"""
+import argparse
+import base64
+import io
+import os
+import time
+import tracemalloc
+
+from PIL import Image
+
+from llmkit.images import EncodedImageCache, encode_image
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "langchaindemo", "imageprocessing",
+                      "airport_terminal_journey.jpeg")
+
+
+def phone_photo(width=4000, height=3000):
+    """A noisy, photo-like JPEG with EXIF orientation and GPS tags."""
+    gradient = Image.linear_gradient("L").resize((width, height))
+    noise = Image.effect_noise((width, height), 40)
+    image = Image.merge("RGB", (gradient, noise, gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+    exif = Image.Exif()
+    exif[0x0112] = 1
+    exif[0x010F] = "PhoneMaker"
+    exif[0x8825] = {1: "N", 2: (51.0, 30.0, 0.0), 3: "W", 4: (0.0, 7.0, 0.0)}
+    out = io.BytesIO()
+    image.save(out, "JPEG", quality=92, exif=exif)
+    return out.getvalue()
+
+
+def raw(data):
+    return base64.b64encode(data).decode()
+
+
+def measure(encode, data, repeats):
+    tracemalloc.start()
+    start = time.perf_counter()
+    payload = encode(data)
+    first = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        encode(data)
+    return len(payload), first, (time.perf_counter() - start) / repeats, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    with open(SAMPLE, "rb") as f:
+        images = {"demo 1024x1024": f.read(), "photo 4000x3000": phone_photo()}
+    print(f"{'image':<17}{'mode':<14}{'payload KB':>11}{'first ms':>10}{'rerun ms':>10}{'peak MB':>9}")
+    for name, data in images.items():
+        cache = EncodedImageCache()
+        for label, encode in (("raw base64", raw),
+                              ("encode_image", lambda d: encode_image(d, "low", cache=cache))):
+            size, first, rerun, peak = measure(encode, data, args.repeats)
+            print(f"{name:<17}{label:<14}{size / 1024:>11.1f}{first * 1000:>10.1f}{rerun * 1000:>10.2f}"
+                  f"{peak / 2 ** 20:>9.1f}")
+        payload = base64.b64decode(encode_image(data, "low", cache=cache))
+        with Image.open(io.BytesIO(payload)) as image:
+            print(f"{'':<17}sent {image.size[0]}x{image.size[1]}, EXIF tags left: {len(image.getexif())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Ingestion throughput (chunks/sec) vs. concurrency.
+
+    python -m benchmarks.ingest_throughput --chunks 2000 --concurrency 1 2 4 8 16
+
+Runs the ``llmkit.ingest`` pipeline with a real ``OpenAIEmbeddings`` client
+pointed at a local stub OpenAI server, writing into an in-memory Chroma
+collection. ``--max-in-flight`` makes the stub answer 429 above that many
+concurrent requests, to exercise the backoff path.
+"""
+import argparse
+import asyncio
+import uuid
+
+from langchain_chroma import Chroma
+from langchain_core.documents import Document
+from langchain_openai import OpenAIEmbeddings
+
+from llmkit.fakes import StubOpenAIServer
+from llmkit.ingest import PrecomputedEmbeddings, aingest
+
+
+def synthetic_chunks(n):
+    for i in range(n):
+        text = f"Job listing {i}: Senior engineer wanted for team {i % 97}. " * 4
+        yield str(i), Document(page_content=text, metadata={"source": "synthetic"})
+
+
+async def run(args, embeddings):
+    print(f"{'concurrency':>12}{'seconds':>10}{'chunks/s':>10}{'retries':>9}")
+    for concurrency in args.concurrency:
+        store = Chroma(collection_name=f"bench-{uuid.uuid4().hex[:8]}",
+                       embedding_function=PrecomputedEmbeddings(embeddings))
+        stats = await aingest(store, synthetic_chunks(args.chunks), embeddings,
+                              concurrency=concurrency, batch_size=args.batch_size)
+        rate = stats["chunks"] / stats["seconds"]
+        print(f"{concurrency:>12}{stats['seconds']:>10.2f}{rate:>10.0f}{stats['retries']:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.1, help="stub seconds per request")
+    parser.add_argument("--max-in-flight", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    with StubOpenAIServer(latency=args.latency, size=64, max_in_flight=args.max_in_flight) as server:
+        embeddings = OpenAIEmbeddings(
+            model="text-embedding-3-small",
+            api_key="stub",
+            base_url=server.base_url,
+            check_embedding_ctx_length=False,
+            max_retries=0,
+        )
+        asyncio.run(run(args, embeddings))
+
+
+if __name__ == "__main__":
+    main()
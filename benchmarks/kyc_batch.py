@@ -0,0 +1,103 @@
+"""Bulk KYC throughput against a local stub vision endpoint.
+
+    python -m benchmarks.kyc_batch --documents 300 --concurrency 8 32 64
+
+Writes ``--documents`` synthetic ID scans (``--size`` pixels, noisy so they
+compress like photos) with their name/DOB sidecars into a temporary
+directory and verifies them with ``llmkit.kyc.verify_documents`` through a
+gateway model pointed at ``StubOpenAIServer``, which answers a schema-valid
+verdict after ``--latency`` seconds. The first row is the old per-document
+flow for comparison: one document at a time, full-size base64 upload.
+"""
+import argparse
+import base64
+import json
+import logging
+import os
+import tempfile
+from unittest import mock
+
+from PIL import Image
+
+import llmkit.kyc
+from llmkit.batch import load_app
+from llmkit.fakes import StubOpenAIServer
+from llmkit.gateway import LLMGateway, chat_model
+from llmkit.kyc import verify_documents
+
+APP = os.path.join(os.path.dirname(__file__), "..", "langchaindemo", "imageprocessing", "kyc_verification.py")
+
+
+def write_documents(directory, count, size):
+    width, height = size
+    background = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+    for i in range(count):
+        noise = Image.effect_noise((width, height), 30 + i % 20).convert("RGB")
+        scan = Image.blend(background, noise, 0.3)
+        scan.save(os.path.join(directory, f"doc-{i:05d}.jpg"), "JPEG", quality=90)
+        with open(os.path.join(directory, f"doc-{i:05d}.json"), "w", encoding="utf-8") as f:
+            json.dump({"name": f"Applicant {i}", "dob": f"19{60 + i % 40}-01-{1 + i % 28:02d}"}, f)
+
+
+def raw_base64(path, detail="low"):
+    with open(path, "rb") as f:
+        return base64.b64encode(f.read()).decode()
+
+
+def payload_kb(path, encode):
+    return len(encode(path)) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=300)
+    parser.add_argument("--size", type=int, nargs=2, default=[1600, 1000])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 32, 64])
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--latency", type=float, default=1.0, help="stub seconds per request")
+    parser.add_argument("--baseline-documents", type=int, default=10)
+    args = parser.parse_args()
+    logging.getLogger("llmkit.batch").setLevel(logging.WARNING)
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+
+    with StubOpenAIServer(latency=args.latency) as server, tempfile.TemporaryDirectory() as tmp:
+        prompt = load_app(APP)["prompt"]
+        documents = os.path.join(tmp, "documents")
+        os.mkdir(documents)
+        write_documents(documents, args.documents, args.size)
+        sample = os.path.join(documents, "doc-00000.jpg")
+        print(f"{args.documents} documents of {args.size[0]}x{args.size[1]}: "
+              f"{payload_kb(sample, raw_base64):.0f} KB raw base64, "
+              f"{payload_kb(sample, llmkit.kyc.encode_file):.0f} KB preprocessed\n")
+        print(f"{'mode':<26}{'done':>6}{'docs/min':>10}{'p50 s':>7}{'p95 s':>7}{'preprocess ms':>15}")
+
+        def row(label, output, stats):
+            with open(output, encoding="utf-8") as f:
+                lines = [json.loads(line) for line in f]
+            assert all(line["verdict"]["verified"] in (True, False) for line in lines)
+            preprocess = sum(line["preprocess_seconds"] for line in lines) / len(lines)
+            print(f"{label:<26}{stats['done']:>6}{stats['per_second'] * 60:>10.0f}{stats['p50']:>7.2f}"
+                  f"{stats['p95']:>7.2f}{preprocess * 1000:>15.1f}", flush=True)
+
+        gateway = LLMGateway(max_connections=256, requests_per_second=1000, burst=256)
+        llm = chat_model("stub-vision", base_url=server.base_url, api_key="stub", gateway=gateway)
+
+        baseline = os.path.join(tmp, "baseline")
+        os.mkdir(baseline)
+        for name in sorted(os.listdir(documents))[:2 * args.baseline_documents]:
+            os.link(os.path.join(documents, name), os.path.join(baseline, name))
+        output = os.path.join(tmp, "baseline.jsonl")
+        with mock.patch.object(llmkit.kyc, "encode_file", raw_base64):
+            stats = verify_documents(llm, prompt, baseline, output, concurrency=1, workers=1)
+        row("one at a time, raw", output, stats)
+
+        for concurrency in args.concurrency:
+            output = os.path.join(tmp, f"verdicts-{concurrency}.jsonl")
+            stats = verify_documents(llm, prompt, documents, output, concurrency=concurrency,
+                                     workers=args.workers)
+            row(f"pipeline, concurrency {concurrency}", output, stats)
+        gateway.close()
+
+
+if __name__ == "__main__":
+    main()
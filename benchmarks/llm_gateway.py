@@ -0,0 +1,71 @@
+"""Load test: 500 concurrent chat requests, ``ChatOpenAI`` vs. ``llmkit.gateway``.
+
+    python -m benchmarks.llm_gateway --requests 500 --distinct 100 500
+
+Fires ``--requests`` concurrent ``ainvoke`` calls at a local stub
+OpenAI-compatible server that takes ``--latency`` seconds per request and
+answers 429 above ``--max-in-flight`` concurrent requests. The prompts cycle
+through ``--distinct`` different questions, as when many users ask the same
+thing at once. ``ChatOpenAI`` runs with its default retries; the gateway
+with a token bucket of ``--rate`` requests/sec. ``upstream`` and ``429``
+are counted by the stub.
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+from langchain_openai import ChatOpenAI
+
+from llmkit.fakes import StubOpenAIServer
+from llmkit.gateway import LLMGateway, chat_model
+
+
+async def fire(llm, prompts):
+    async def one(prompt):
+        start = time.perf_counter()
+        try:
+            await llm.ainvoke(prompt)
+            return time.perf_counter() - start, True
+        except Exception:
+            return time.perf_counter() - start, False
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one(p) for p in prompts))
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--distinct", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--latency", type=float, default=0.2, help="stub seconds per request")
+    parser.add_argument("--max-in-flight", type=int, default=64)
+    parser.add_argument("--rate", type=float, default=200, help="gateway requests/sec")
+    parser.add_argument("--max-connections", type=int, default=64)
+    args = parser.parse_args()
+
+    print(f"{'client':<12}{'distinct':>9}{'seconds':>9}{'ok':>6}{'failed':>8}{'upstream':>10}{'429':>6}"
+          f"{'p50 s':>8}{'p95 s':>8}")
+    with StubOpenAIServer(latency=args.latency, max_in_flight=args.max_in_flight) as server:
+        for distinct in args.distinct:
+            prompts = [f"Question {i % distinct}: which laptop has the best battery?" for i in range(args.requests)]
+            gateway = LLMGateway(max_connections=args.max_connections, requests_per_second=args.rate,
+                                 burst=args.max_connections)
+            clients = [
+                ("ChatOpenAI", ChatOpenAI(model="gpt-4o", api_key="stub", base_url=server.base_url)),
+                ("gateway", chat_model("gpt-4o", base_url=server.base_url, api_key="stub", gateway=gateway)),
+            ]
+            for label, llm in clients:
+                requests, rejected = server.requests, server.rejected
+                seconds, results = asyncio.run(fire(llm, prompts))
+                latencies = np.array([latency for latency, ok in results if ok] or [0.0])
+                ok = sum(ok for _, ok in results)
+                print(f"{label:<12}{distinct:>9}{seconds:>9.2f}{ok:>6}{len(results) - ok:>8}"
+                      f"{server.requests - requests:>10}{server.rejected - rejected:>6}"
+                      f"{np.percentile(latencies, 50):>8.2f}{np.percentile(latencies, 95):>8.2f}", flush=True)
+            gateway.close()
+
+
+if __name__ == "__main__":
+    main()
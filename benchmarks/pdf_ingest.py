@@ -0,0 +1,119 @@
+"""Peak memory and pages/sec: ``PyPDFLoader.load()`` vs. ``iter_pdf_pages``.
+
+    python -m benchmarks.pdf_ingest --pages 2000
+
+Writes a synthetic text PDF, then loads, splits and embeds it (with
+``FakeEmbeddings``) in a fresh process per mode. Embedded chunks go to a
+sink that only counts them, so the memory reported is that of the loading
+pipeline itself. ``peak MiB`` is the peak RSS of the main process and
+``worker MiB`` that of the largest parser process.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from llmkit.fakes import FakeEmbeddings
+from llmkit.ingest import ingest_documents, iter_chunks
+from llmkit.pdf import iter_pdf_pages
+from llmkit.process_pool import shutdown
+
+WORDS = ("model data training results method analysis sample error table figure "
+         "experiment baseline accuracy section dataset evaluation").split()
+
+
+def write_pdf(path, pages, lines_per_page=48, seed=0):
+    """Minimal PDF with ``pages`` pages of Helvetica text."""
+    rng = random.Random(seed)
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        lines = [f"Page {page + 1} line {i}: " + " ".join(rng.choices(WORDS, k=12)) for i in range(lines_per_page)]
+        text = "".join(f"({line}) '\n" for line in lines)
+        stream = f"BT /F1 9 Tf 12 TL 40 800 Td\n{text}ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids), pages)
+
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(f.tell())
+            f.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+        xref = f.tell()
+        f.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+        f.writelines(b"%010d 00000 n \n" % offset for offset in offsets)
+        f.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+
+
+class CountingSink:
+    """Stands in for a vector store on disk: stores nothing, counts chunks."""
+
+    def __init__(self):
+        self.chunks = 0
+
+    def add_embeddings(self, items, vectors):
+        self.chunks += len(items)
+
+
+def run(mode, path):
+    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+    embeddings = FakeEmbeddings(latency=0.0, per_text_latency=0.0)
+    sink = CountingSink()
+    start = time.perf_counter()
+    if mode == "PyPDFLoader":
+        from langchain_community.document_loaders import PyPDFLoader
+
+        pages = PyPDFLoader(path).load()
+        count = len(pages)
+        ingest_documents(sink, splitter.split_documents(pages), embeddings)
+    else:
+        pages = iter_pdf_pages(path, workers=int(mode.split("=")[1]))
+        counted = []
+
+        def counting(docs):
+            for doc in docs:
+                counted.append(1)
+                yield doc
+
+        ingest_documents(sink, iter_chunks(counting(pages), splitter), embeddings)
+        count = len(counted)
+        shutdown()
+    seconds = time.perf_counter() - start
+    return {"pages": count, "chunks": sink.chunks, "seconds": seconds,
+            "peak": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            "worker": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--modes", default="PyPDFLoader,workers=1,workers=2,workers=4")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "synthetic.pdf")
+        write_pdf(path, args.pages)
+        print(f"{args.pages} pages, {os.path.getsize(path) / 2 ** 20:.1f} MiB, {os.cpu_count()} CPUs\n")
+        print(f"{'mode':<14}{'pages':>7}{'chunks':>8}{'seconds':>9}{'pages/s':>9}{'peak MiB':>10}{'worker MiB':>12}")
+        for mode in args.modes.split(","):
+            with ProcessPoolExecutor(1, mp_context=context) as pool:
+                r = pool.submit(run, mode, path).result()
+            print(f"{mode:<14}{r['pages']:>7}{r['chunks']:>8}{r['seconds']:>9.2f}{r['pages'] / r['seconds']:>9.0f}"
+                  f"{r['peak']:>10.0f}{r['worker']:>12.0f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Cold vs. warm startup of the persistent RAG index.
+
+    python -m benchmarks.rag_index --chunks 2000
+
+Builds a synthetic corpus, opens the index in an empty directory (cold),
+reopens it (warm), then edits one line and reopens it again. The last two
+rows use an ``IndexWatcher`` on the corpus file instead: a poll with no
+change, and a poll right after a one-line edit.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from llmkit.fakes import FakeEmbeddings
+from llmkit.vector_index import IndexWatcher, open_persistent_index
+
+
+def synthetic_corpus(n_chunks, chunk_size):
+    paragraphs = []
+    for i in range(n_chunks):
+        body = f"Product {i:06d} SKU-{i * 7919 % 100000:05d} is a sample item. "
+        paragraphs.append((body * (chunk_size // len(body)))[:chunk_size - 50])
+    return "\n\n".join(paragraphs)
+
+
+def timed_open(text, embeddings, splitter, directory):
+    start = time.perf_counter()
+    calls_before = embeddings.texts_embedded
+    chunks = splitter.split_documents([Document(page_content=text, metadata={"source": "synthetic"})])
+    open_persistent_index(chunks, embeddings, splitter, directory, collection_prefix="bench")
+    return time.perf_counter() - start, embeddings.texts_embedded - calls_before
+
+
+def timed_check(watcher, embeddings):
+    start = time.perf_counter()
+    calls_before = embeddings.texts_embedded
+    watcher.check()
+    return time.perf_counter() - start, embeddings.texts_embedded - calls_before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per embedding request")
+    args = parser.parse_args()
+
+    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+    embeddings = FakeEmbeddings(latency=args.latency)
+    text = synthetic_corpus(args.chunks, 1000)
+
+    with tempfile.TemporaryDirectory() as directory:
+        cold, cold_embedded = timed_open(text, embeddings, splitter, directory)
+        warm, warm_embedded = timed_open(text, embeddings, splitter, directory)
+        edited = text.replace("Product 000001 ", "Product 000001 (edited) ", 1)
+        delta, delta_embedded = timed_open(edited, embeddings, splitter, directory)
+
+        path = os.path.join(directory, "corpus.txt")
+        with open(path, "w") as f:
+            f.write(text)
+        vector_store = open_persistent_index([], embeddings, splitter, os.path.join(directory, "watched"),
+                                             collection_prefix="bench")
+        watcher = IndexWatcher(vector_store, [path], splitter)
+        watcher.check()
+        idle, idle_embedded = timed_check(watcher, embeddings)
+        with open(path, "w") as f:
+            f.write(text.replace("Product 000002 ", "Product 000002 (edited) ", 1))
+        watched, watched_embedded = timed_check(watcher, embeddings)
+
+    print(f"{'run':<12}{'seconds':>10}{'embedded':>10}")
+    print(f"{'cold':<12}{cold:>10.2f}{cold_embedded:>10}")
+    print(f"{'warm':<12}{warm:>10.2f}{warm_embedded:>10}")
+    print(f"{'one edit':<12}{delta:>10.2f}{delta_embedded:>10}")
+    print(f"{'watch idle':<12}{idle:>10.4f}{idle_embedded:>10}")
+    print(f"{'watch edit':<12}{watched:>10.2f}{watched_embedded:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Hit rate and saved latency of the response cache per chain.
+
+    python -m benchmarks.response_cache --requests 200
+
+Replays skewed (Zipf-like) traffic against the four cached chains from
+``--threads`` threads, using ``FakeChatModel`` for the model. Popular inputs
+repeat often, as they do in our deployment, so most requests after warm-up
+are served from cache. The replay runs once with exact keys only and once
+in semantic mode, where every miss also embeds the prompt with
+``FakeEmbeddings`` (``--embedding-latency`` seconds per call).
+"""
+import argparse
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import PromptTemplate
+
+from llmkit.fakes import FakeChatModel, FakeEmbeddings
+from llmkit.response_cache import ResponseCache, cached_chat_model
+
+CHAINS = {
+    "cuisine": ("What is the traditional cuisine of {country}?", ["India", "Japan", "Italy", "Mexico",
+                                                                   "France", "Peru", "Ghana", "Turkey"]),
+    "travel-guide": ("Travel guide for {country} in May", ["Paris", "Tokyo", "Lima", "Rome", "Accra"]),
+    "recipe": ("Favourite recipe from {country}", ["Spain", "Thailand", "Korea", "Greece", "Brazil"]),
+    "startup-ideator": ("Startup ideas for skills in {country}", ["python", "design", "sales", "ml"]),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--first-token-latency", type=float, default=0.2)
+    parser.add_argument("--embedding-latency", type=float, default=0.1)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'mode':<10}{'chain':<18}{'hits':>6}{'misses':>8}{'hit rate':>10}{'saved s':>9}{'spent s':>9}"
+          f"{'wall s':>8}")
+    for mode, embeddings in (("exact", None), ("semantic", FakeEmbeddings(latency=args.embedding_latency))):
+        rng = random.Random(0)
+        requests = []
+        for _ in range(args.requests):
+            name = rng.choice(list(CHAINS))
+            values = CHAINS[name][1]
+            requests.append((name, values[min(int(rng.paretovariate(1.2)) - 1, len(values) - 1)]))
+
+        with tempfile.NamedTemporaryFile(suffix=".sqlite3") as f:
+            cache = ResponseCache(f.name, embeddings=embeddings)
+            chains = {}
+            for name, (template, _) in CHAINS.items():
+                llm = FakeChatModel(responses=[f"{name} answer " * 50],
+                                    first_token_latency=args.first_token_latency, token_latency=0.0005)
+                prompt = PromptTemplate.from_template(template)
+                chains[name] = prompt | cached_chat_model(llm, cache, name, [prompt]) | StrOutputParser()
+
+            elapsed = {name: 0.0 for name in CHAINS}
+            lock = threading.Lock()
+
+            def run(request):
+                name, value = request
+                start = time.perf_counter()
+                chains[name].invoke({"country": value})
+                with lock:
+                    elapsed[name] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(args.threads) as pool:
+                list(pool.map(run, requests))
+            wall = time.perf_counter() - start
+
+            for row in cache.report():
+                print(f"{mode:<10}{row['name']:<18}{row['hits'] + row['semantic_hits']:>6}{row['misses']:>8}"
+                      f"{row['hit_rate']:>10.0%}{row['saved_seconds']:>9.2f}{elapsed[row['name']]:>9.2f}"
+                      f"{wall:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
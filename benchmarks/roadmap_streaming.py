@@ -0,0 +1,80 @@
+"""Time to first rendered week: parse-at-the-end vs. ``JSONItemStream``.
+
+    python -m benchmarks.roadmap_streaming --weeks 96
+
+Streams a synthetic roadmap (24 months = 96 weeks) from ``FakeChatModel``
+and simulates each YouTube lookup with ``--lookup-latency`` seconds.
+``parse at end`` is what the learning path generators did before: wait for
+the whole reply, ``json.loads`` it, then look up every week's keyword
+concurrently. ``JSONItemStream`` yields each week as it closes and starts
+its lookup right away, so lookups overlap generation.
+"""
+import argparse
+import json
+import time
+from unittest import mock
+
+import llmkit.youtube
+from llmkit.fakes import FakeChatModel
+from llmkit.json_stream import JSONItemStream
+from llmkit.youtube import PlaylistPrefetcher, search_playlists_many
+
+
+def roadmap(weeks):
+    return json.dumps({
+        "weeks_total": weeks,
+        "weeks": [{"week": i, "focus": f"Topic {i}", "learning_objectives": ["Understand it", "Apply it"],
+                   "recommended_resources": [{"type": "course", "title": f"Course {i}"}],
+                   "project_idea": "Build a small project that uses this week's topic",
+                   "search_keywords": [f"topic {i} tutorial"]} for i in range(1, weeks + 1)],
+        "meta": {"assessment_checkpoints": ["Ship a project"], "final_project": "A capstone"},
+    }, indent=2)
+
+
+def parse_at_end(llm):
+    start = time.perf_counter()
+    raw = "".join(chunk.content for chunk in llm.stream("roadmap"))
+    weeks = json.loads(raw)["weeks"]
+    first = time.perf_counter() - start
+    search_playlists_many([w["search_keywords"][0] for w in weeks], "key")
+    return first, time.perf_counter() - start
+
+
+def streamed(llm):
+    start = time.perf_counter()
+    first = None
+    futures = []
+    with PlaylistPrefetcher("key") as prefetcher:
+        for week in JSONItemStream(llm.stream("roadmap")):
+            first = first or time.perf_counter() - start
+            futures.append(prefetcher.submit(week["search_keywords"][0]))
+        for future in futures:
+            future.result()
+    return first, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--weeks", type=int, default=96)
+    parser.add_argument("--first-token-latency", type=float, default=0.5)
+    parser.add_argument("--token-latency", type=float, default=0.002)
+    parser.add_argument("--lookup-latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    def lookup(query, *args_, **kwargs):
+        time.sleep(args.lookup_latency)
+        return [{"title": query, "url": "https://www.youtube.com/playlist?list=x"}]
+
+    reply = roadmap(args.weeks)
+    print(f"{args.weeks} weeks, {len(reply)} characters\n")
+    print(f"{'mode':<16}{'first week s':>13}{'all + lookups s':>17}")
+    with mock.patch.object(llmkit.youtube, "search_playlists", lookup):
+        for label, run in (("parse at end", parse_at_end), ("JSONItemStream", streamed)):
+            llm = FakeChatModel(responses=[reply], first_token_latency=args.first_token_latency,
+                                token_latency=args.token_latency)
+            first, total = run(llm)
+            print(f"{label:<16}{first:>13.2f}{total:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
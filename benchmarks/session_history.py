@@ -0,0 +1,83 @@
+"""Append and window-load latency of the SQLite session history.
+
+    python -m benchmarks.session_history --sessions 10000 --turns 100
+
+Fills a fresh database with ``--sessions`` sessions of ``--turns`` turns
+(a human and an AI message each), then measures, on randomly chosen
+sessions, the latency of appending one turn and of loading the last
+``--window`` messages, both single-threaded and from ``--threads`` threads
+at once, as a busy Streamlit server would.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from llmkit.session_history import SQLiteChatMessageHistory, SQLiteHistoryStore
+
+
+def turn(i):
+    return [HumanMessage(content=f"Question {i} about sprint planning and story points?"),
+            AIMessage(content=f"Answer {i}: " + "keep the sprint goal small and visible. " * 8)]
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def report(label, latencies, wall):
+    print(f"{label:<26}{percentile(latencies, 0.5) * 1e3:>9.3f}{percentile(latencies, 0.99) * 1e3:>9.3f}"
+          f"{len(latencies) / wall:>12.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--window", type=int, default=20)
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteHistoryStore(os.path.join(tmp, "history.sqlite3"))
+        start = time.perf_counter()
+        for s in range(args.sessions):
+            store.append(f"session-{s}", [m for i in range(args.turns) for m in turn(i)])
+        fill = time.perf_counter() - start
+        size = os.path.getsize(os.path.join(tmp, "history.sqlite3")) / 2 ** 20
+        print(f"filled {args.sessions} sessions x {args.turns} turns in {fill:.1f}s ({size:.0f} MiB)\n")
+
+        rng = random.Random(0)
+        histories = [SQLiteChatMessageHistory(f"session-{rng.randrange(args.sessions)}", store, window=args.window)
+                     for _ in range(args.samples)]
+        message = turn(args.turns)
+
+        print(f"{'operation':<26}{'p50 ms':>9}{'p99 ms':>9}{'ops/s':>12}")
+        for label, op in (("append turn", lambda h: h.add_messages(message)),
+                          (f"load last {args.window}", lambda h: h.messages),
+                          ("load full session", lambda h: h.store.load(h.session_id))):
+            start = time.perf_counter()
+            latencies = [timed(lambda: op(h)) for h in histories]
+            report(label, latencies, time.perf_counter() - start)
+
+            with ThreadPoolExecutor(args.threads) as pool:
+                start = time.perf_counter()
+                latencies = list(pool.map(lambda h: timed(lambda: op(h)), histories))
+                report(f"  {args.threads} threads", latencies, time.perf_counter() - start)
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Pairwise vs. batched similarity scoring of N queries against M candidates.
+
+    python -m benchmarks.similarity --queries 20 --candidates 100
+
+``pairwise`` is the old ``similarity_finder`` loop: two ``embed_query``
+calls and one ``np.dot`` per pair. ``batched`` is ``similarity_search``:
+two ``embed_documents`` calls and one matrix multiply. Both use
+``FakeEmbeddings`` with its simulated API latency and report the embedding
+calls each approach would have paid for.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from llmkit.fakes import FakeEmbeddings
+from llmkit.similarity import similarity_search
+
+
+def pairwise(embeddings, queries, candidates, k):
+    results = []
+    for query in queries:
+        scores = [np.dot(embeddings.embed_query(query), embeddings.embed_query(candidate))
+                  for candidate in candidates]
+        best = np.argsort(scores)[::-1][:k]
+        results.append([(int(i), scores[i]) for i in best])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--candidates", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.002)
+    args = parser.parse_args()
+
+    queries = [f"query text {i}" for i in range(args.queries)]
+    candidates = [f"candidate text {i}" for i in range(args.candidates)]
+
+    print(f"{'mode':<10}{'pairs':>8}{'api calls':>11}{'seconds':>10}")
+    for label, run in (("pairwise", pairwise), ("batched", similarity_search)):
+        embeddings = FakeEmbeddings(latency=args.latency)
+        start = time.perf_counter()
+        run(embeddings, queries, candidates, args.top_k)
+        seconds = time.perf_counter() - start
+        print(f"{label:<10}{len(queries) * len(candidates):>8}{embeddings.calls:>11}{seconds:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
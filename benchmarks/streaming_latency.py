@@ -0,0 +1,84 @@
+"""Time-to-first-token vs. total latency of the Streamlit apps' chain shapes.
+
+    python -m benchmarks.streaming_latency
+
+Each app is modelled by the shape of its chain (single call, chat with
+history, or two chained calls) on top of ``FakeChatModel``. Before the
+streaming change the user saw nothing until ``total``; now the first words
+show up after ``ttft``.
+"""
+import argparse
+
+from langchain_core.chat_history import InMemoryChatMessageHistory
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder, PromptTemplate
+from langchain_core.runnables.history import RunnableWithMessageHistory
+
+from llmkit.fakes import FakeChatModel
+from llmkit.streaming import TimedStream
+
+
+def words(n):
+    return " ".join(f"word{i}" for i in range(n))
+
+
+def single_call(llm):
+    return PromptTemplate.from_template("Answer: {input}") | llm, {"input": "question"}, None
+
+
+def with_history(llm):
+    prompt = ChatPromptTemplate.from_messages(
+        [("system", "You are an Agile coach."), MessagesPlaceholder("chat_history"), ("human", "{input}")]
+    )
+    history = InMemoryChatMessageHistory()
+    chain = RunnableWithMessageHistory(prompt | llm, lambda session_id: history,
+                                       input_messages_key="input", history_messages_key="chat_history")
+    return chain, {"input": "question"}, {"configurable": {"session_id": "bench"}}
+
+
+def two_step(llm):
+    first = PromptTemplate.from_template("Title for {topic}") | llm | StrOutputParser()
+    second = PromptTemplate.from_template("Write about {title}") | llm
+    return first | (lambda title: {"title": title}) | second, {"topic": "topic"}, None
+
+
+# (app, chain shape, words in the final reply, words in the first step)
+APPS = [
+    ("basics/streamlit_demo.py", single_call, 150, 0),
+    ("chains/lcel_demo.py", single_call, 300, 0),
+    ("ai_itineray_planner.py", single_call, 800, 0),
+    ("sustainable_lifestyle_planner.py", single_call, 700, 0),
+    ("mindful_morning_coach.py", single_call, 80, 0),
+    ("startup_ideator.py", single_call, 400, 0),
+    ("2HistoryPromptTemplate.py", with_history, 200, 0),
+    ("lcel-speech-generator.py", two_step, 350, 10),
+    ("recipe.py", two_step, 100, 8),
+    ("multi-llm-creative-chain.py", two_step, 500, 250),
+]
+
+
+def measure(shape, final_words, first_words, first_token_latency, token_latency):
+    responses = [words(final_words)] if not first_words else [words(first_words), words(final_words)]
+    llm = FakeChatModel(responses=responses, first_token_latency=first_token_latency,
+                        token_latency=token_latency)
+    chain, inputs, config = shape(llm)
+    timed = TimedStream(chain.stream(inputs, config))
+    for _ in timed:
+        pass
+    return timed.ttft, timed.total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--first-token-latency", type=float, default=0.5)
+    parser.add_argument("--token-latency", type=float, default=0.01)
+    args = parser.parse_args()
+
+    print(f"{'app':<34}{'ttft s':>8}{'total s':>9}{'saved':>8}")
+    for app, shape, final_words, first_words in APPS:
+        ttft, total = measure(shape, final_words, first_words, args.first_token_latency, args.token_latency)
+        print(f"{app:<34}{ttft:>8.2f}{total:>9.2f}{1 - ttft / total:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Cost of a malformed roadmap reply: full rerun vs. local repair and fragment re-requests.
+
+    python -m benchmarks.structured_output --weeks 24
+
+Each case is a roadmap reply from ``FakeChatModel`` with one of the faults
+models actually produce. ``JsonOutputParser + rerun`` is what the apps did
+before: parse the reply and, when that fails, generate the whole roadmap
+again. ``parse_structured`` repairs the text locally, validates it against
+``llmkit.schemas.Roadmap`` and asks again only for the weeks that are
+still invalid. Output tokens are the tokens of every reply generated.
+
+The second table cuts a ``--sweep-weeks`` roadmap at every character, as
+``max_tokens`` may, and repairs each cut with a model that answers every
+re-request with the matching part of the full roadmap.
+"""
+import argparse
+import json
+import re
+import time
+
+from langchain_core.exceptions import OutputParserException
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.runnables import RunnableLambda
+
+from benchmarks.roadmap_streaming import roadmap
+from llmkit.fakes import FakeChatModel
+from llmkit.ingest import estimate_tokens
+from llmkit.schemas import Roadmap
+from llmkit.structured import parse_structured, repair_json
+
+PROMPT = [HumanMessage("Produce a week-by-week learning roadmap as JSON.")]
+
+
+def cases(weeks):
+    good = roadmap(weeks)
+    document = json.loads(good)
+    last_week = json.dumps(document["weeks"][-1])
+    middle = weeks // 2
+    cut_middle = good.find('"project_idea"', good.find(f'"week": {middle},'))
+    missing_focus = json.loads(good)
+    del missing_focus["weeks"][weeks // 2]["focus"]
+    return {
+        "valid": (good, good),
+        "code fence": (f"```json\n{good}\n```", good),
+        "trailing comma": (good.replace('"Apply it"\n', '"Apply it",\n'), good),
+        # Cut off at max_tokens inside the last week, and halfway through
+        "truncated end": (good[:good.rfind('"project_idea"')], last_week),
+        "truncated half": (good[:cut_middle], json.dumps(document["weeks"][middle - 1:])),
+        "invalid week": (json.dumps(missing_focus, indent=2), json.dumps(document["weeks"][weeks // 2])),
+    }
+
+
+def rerun(llm):
+    parser = JsonOutputParser()
+    while True:
+        try:
+            return Roadmap.model_validate(parser.invoke(llm.invoke(PROMPT)))
+        except (OutputParserException, ValueError):
+            continue
+
+
+def repair(llm):
+    return parse_structured(llm.invoke(PROMPT).content, Roadmap, llm, PROMPT)
+
+
+def answering(document, replies):
+    """Fake model that answers each re-request with the requested part of ``document``."""
+
+    def lookup(path):
+        value = document
+        for part in re.findall(r"[^.\[\]]+", path):
+            value = value[int(part)] if isinstance(value, list) else value[part]
+        return value
+
+    def answer(messages):
+        request = messages[-1].content
+        if match := re.search(r"elements (\d+) to (\d+) of `([^`]+)`", request):
+            value = lookup(match[3])[int(match[1]) - 1:int(match[2])]
+        elif match := re.search(r"JSON value for `([^`]+)`", request):
+            value = lookup(match[1])
+        else:
+            value = document
+        replies.append(json.dumps(value, indent=2))
+        return AIMessage(replies[-1])
+
+    return RunnableLambda(answer)
+
+
+def sweep(weeks):
+    good = roadmap(weeks)
+    document = json.loads(good)
+    expected = Roadmap.model_validate(document).model_dump(exclude={"meta"})
+    parsed = valid = 0
+    calls = tokens = 0
+    for cut in range(len(good)):
+        parsed += repair_json(good[:cut]) is not None
+        replies = []
+        result = parse_structured(good[:cut], Roadmap, answering(document, replies), PROMPT,
+                                  max_repairs=3)
+        # ``meta`` has defaults, so a cut inside or before it validates as is
+        assert result.model_dump(exclude={"meta"}) == expected, cut
+        valid += not replies
+        calls += 1 + len(replies)
+        tokens += estimate_tokens(good[:cut]) + sum(estimate_tokens(reply) for reply in replies)
+    rerun_tokens = sum(estimate_tokens(good[:cut]) + estimate_tokens(good) for cut in range(len(good)))
+    print(f"\n{weeks}-week roadmap cut at each of {len(good)} positions: {parsed} parsed locally, "
+          f"{valid} valid without a re-request, all recovered")
+    print(f"{'mode':<26}{'calls':>8}{'out tokens':>12}")
+    print(f"{'JsonOutputParser + rerun':<26}{2.0:>8.2f}{rerun_tokens / len(good):>12.0f}")
+    print(f"{'parse_structured':<26}{calls / len(good):>8.2f}{tokens / len(good):>12.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--weeks", type=int, default=24)
+    parser.add_argument("--first-token-latency", type=float, default=0.5)
+    parser.add_argument("--token-latency", type=float, default=0.002)
+    parser.add_argument("--sweep-weeks", type=int, default=6)
+    args = parser.parse_args()
+
+    print(f"{'case':<16}{'mode':<26}{'calls':>6}{'out tokens':>12}{'seconds':>9}")
+    for case, (bad, fix) in cases(args.weeks).items():
+        good = roadmap(args.weeks)
+        for label, run, responses in (("JsonOutputParser + rerun", rerun, [bad, good]),
+                                      ("parse_structured", repair, [bad, fix])):
+            llm = FakeChatModel(responses=responses, first_token_latency=args.first_token_latency,
+                                token_latency=args.token_latency, prompt_tokens=[])
+            start = time.perf_counter()
+            result = run(llm)
+            seconds = time.perf_counter() - start
+            assert len(result.weeks) == args.weeks
+            tokens = sum(estimate_tokens(responses[i % 2]) for i in range(llm.calls))
+            print(f"{case:<16}{label:<26}{llm.calls:>6}{tokens:>12}{seconds:>9.2f}")
+    sweep(args.sweep_weeks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Build time, query latency, recall and memory: NumPy flat/IVF vs. Chroma.
+
+    python -m benchmarks.vector_store --sizes 1000,100000,1000000
+
+Each (backend, size) runs in a fresh process on the same synthetic,
+clustered float32 vectors, stored through the ``write_embedded`` path used
+by ``llmkit.ingest``. ``rss MiB`` is the growth of resident memory from
+after the data was generated to after the queries, i.e. what the index
+itself costs; ``recall@10`` is measured against exact search. Chroma is
+skipped above ``--chroma-max`` chunks, where its HNSW build takes too long
+to be practical on a laptop. At 1M chunks the vectors alone take
+``4 * dim`` MB, so pick ``--dim`` to fit the machine's memory.
+"""
+import argparse
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from langchain_core.documents import Document
+
+from llmkit.fakes import FakeEmbeddings
+from llmkit.ingest import PrecomputedEmbeddings, write_embedded
+from llmkit.numpy_index import NumpyVectorStore
+from llmkit.similarity import normalize
+
+BATCH = 5000
+QUERIES = 100
+
+
+def rss_mib():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * 4096 / 2 ** 20
+
+
+def synthetic(size, dim, seed=0, clusters=256, chunk=100000):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    vectors = np.empty((size, dim), dtype=np.float32)
+    for start in range(0, size, chunk):
+        end = min(size, start + chunk)
+        vectors[start:end] = centers[rng.integers(clusters, size=end - start)]
+        vectors[start:end] += rng.normal(scale=0.6, size=(end - start, dim)).astype(np.float32)
+    queries = vectors[rng.choice(size, QUERIES, replace=False)] + rng.normal(
+        scale=0.3, size=(QUERIES, dim)).astype(np.float32)
+    return vectors, queries
+
+
+def exact_top10(vectors, queries, chunk=100000):
+    q = normalize(queries)
+    scores = np.concatenate([normalize(vectors[i:i + chunk]) @ q.T for i in range(0, len(vectors), chunk)])
+    return [set(np.argsort(-scores[:, j])[:10].tolist()) for j in range(len(q))]
+
+
+def make_store(backend, dim):
+    embeddings = FakeEmbeddings(size=dim, latency=0, per_text_latency=0)
+    if backend == "chroma":
+        from langchain_chroma import Chroma
+
+        return Chroma(collection_name="bench", embedding_function=PrecomputedEmbeddings(embeddings),
+                      collection_metadata={"hnsw:space": "cosine"})
+    return NumpyVectorStore(embeddings)
+
+
+def run(backend, size, dim):
+    vectors, queries = synthetic(size, dim)
+    truth = exact_top10(vectors, queries)
+    base = rss_mib()
+
+    start = time.perf_counter()
+    store = make_store(backend, dim)
+    for i in range(0, size, BATCH):
+        batch = [(str(j), Document(page_content=f"chunk {j}")) for j in range(i, min(size, i + BATCH))]
+        write_embedded(store, batch, vectors[i:i + BATCH].tolist() if backend == "chroma" else vectors[i:i + BATCH])
+    if backend == "numpy-ivf":
+        store.build_ivf()
+    build = time.perf_counter() - start
+
+    latencies, hits = [], 0
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        docs = store.similarity_search_by_vector(query.tolist(), k=10)
+        latencies.append(time.perf_counter() - start)
+        hits += len({int(doc.page_content.split()[1]) for doc in docs} & expected)
+    return {"build": build, "p50": float(np.median(latencies)), "p99": float(np.percentile(latencies, 99)),
+            "recall": hits / (10 * len(queries)), "rss": rss_mib() - base}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,100000")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--backends", default="numpy-flat,numpy-ivf,chroma")
+    parser.add_argument("--chroma-max", type=int, default=100000)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    print(f"{'backend':<12}{'chunks':>9}{'build s':>9}{'p50 ms':>9}{'p99 ms':>9}{'recall@10':>11}{'rss MiB':>9}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        for backend in args.backends.split(","):
+            if backend == "chroma" and size > args.chroma_max:
+                continue
+            with ProcessPoolExecutor(1, mp_context=context) as pool:
+                r = pool.submit(run, backend, size, args.dim).result()
+            print(f"{backend:<12}{size:>9}{r['build']:>9.2f}{r['p50'] * 1e3:>9.2f}{r['p99'] * 1e3:>9.2f}"
+                  f"{r['recall']:>11.3f}{r['rss']:>9.0f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""First vs. repeated transcription latency on ``sample_english.m4a``.
+
+    python -m benchmarks.whisper_cache --size base
+
+Requires ``openai-whisper`` and ffmpeg. Runs against an empty temporary
+cache: the first call loads the model and transcribes, the second is a
+cache hit, and the third transcribes into a fresh cache with the model
+already loaded (the old code paid load + transcribe on every call).
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from llmkit.transcription import transcribe_file
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "langchaindemo", "audio_whisper", "sample_english.m4a")
+
+
+def timed(audio, size, cache_dir):
+    start = time.perf_counter()
+    transcribe_file(audio, size=size, cache_dir=cache_dir)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", default="base")
+    parser.add_argument("--audio", default=SAMPLE)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir, tempfile.TemporaryDirectory() as fresh_dir:
+        first = timed(args.audio, args.size, cache_dir)
+        repeat = timed(args.audio, args.size, cache_dir)
+        warm_model = timed(args.audio, args.size, fresh_dir)
+
+    print(f"{'run':<28}{'seconds':>10}")
+    print(f"{'first (load + transcribe)':<28}{first:>10.3f}")
+    print(f"{'repeat (cache hit)':<28}{repeat:>10.3f}")
+    print(f"{'new audio, model loaded':<28}{warm_model:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,14 @@
 import os
-from langchain_openai import ChatOpenAI
 import streamlit as st
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from llmkit.streaming import stream_to_streamlit
+from llmkit.resources import chat_openai
 
 #from travelapp_demo import prompt_template
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-llm = ChatOpenAI(model="gpt-5",api_key=OPENAI_API_KEY)
+llm = chat_openai("gpt-5", api_key=OPENAI_API_KEY)
 prompt_template = ChatPromptTemplate.from_messages(
     [
         ("system", "You are a Agile coach. Answer any questions"
@@ -23,5 +24,4 @@ input = st.text_input("Enter the question:")
 chain = prompt_template | llm
 
 if input:
-    response = chain.invoke({"input": input})
-    st.write(response.content)
+    stream_to_streamlit(chain, {"input": input})
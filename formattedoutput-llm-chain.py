@@ -1,11 +1,13 @@
 import os
-from langchain_openai import ChatOpenAI
 import streamlit as st
 from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import StrOutputParser, JsonOutputParser
+from langchain_core.output_parsers import StrOutputParser
+from llmkit.resources import chat_openai
+from llmkit.schemas import Speech
+from llmkit.structured import structured_output
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-llm = ChatOpenAI(model="gpt-4o", api_key=OPENAI_API_KEY)
+llm = chat_openai("gpt-4o", api_key=OPENAI_API_KEY)
 
 title_prompt = PromptTemplate(
     input_variables=["topic"],
@@ -25,7 +27,7 @@ speech_prompt = PromptTemplate(
 )
 
 first_chain = title_prompt | llm | StrOutputParser() | (lambda title: (st.write("title"), title)[1])
-second_chain = speech_prompt | llm | JsonOutputParser()
+second_chain = speech_prompt | structured_output(llm, Speech)
 ##
 #You can also do this instead of lambda
 #def display_and_return_title(title):
@@ -43,4 +45,4 @@ emotion = st.text_input("Enter the emotion:")
 
 if topic:
     response = final_chain.invoke({"topic": topic})
-    st.write(response)
+    st.write(response.model_dump())
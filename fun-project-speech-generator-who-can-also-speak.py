@@ -2,15 +2,16 @@ import os
 import streamlit as st
 from gtts import gTTS
 from tempfile import NamedTemporaryFile
-from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from llmkit.streaming import stream_to_streamlit
+from llmkit.resources import chat_openai
 
 # -------------------------------
 # Initialize GPT LLM
 # -------------------------------
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-llm = ChatOpenAI(model="gpt-5", api_key=OPENAI_API_KEY)
+llm = chat_openai("gpt-5", api_key=OPENAI_API_KEY)
 
 # -------------------------------
 # Streamlit UI
@@ -43,9 +44,8 @@ if topic:
         ),
     )
     speech_chain = speech_prompt | llm | StrOutputParser()
-    speech_result = speech_chain.invoke({"title": title_result})
     st.subheader("🗣️ Generated Speech")
-    st.write(speech_result)
+    speech_result = stream_to_streamlit(speech_chain, {"title": title_result})
 
     # Step 3: Convert Speech to Audio using gTTS
     st.subheader("🔊 Listen to Speech")
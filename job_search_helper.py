@@ -2,17 +2,21 @@ import os
 from langchain_openai import OpenAIEmbeddings
 from langchain_community.document_loaders import TextLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_chroma import Chroma
+from llmkit.embedding_cache import cached_embeddings
+from llmkit.ingest import ingest_documents, iter_chunks
+from llmkit.numpy_index import NumpyVectorStore
 
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-llm=OpenAIEmbeddings(api_key=OPENAI_API_KEY)
+llm=cached_embeddings(OpenAIEmbeddings(api_key=OPENAI_API_KEY),
+                      path="embedding_cache.sqlite3")
 
-document = TextLoader("job_listings.txt").load()
+document = TextLoader("job_listings.txt").lazy_load()
 text_splitter= RecursiveCharacterTextSplitter(chunk_size=200,
                                               chunk_overlap=10)
-chunks=text_splitter.split_documents(document)
-db=Chroma.from_documents(chunks,llm)
+# A few hundred chunks: exact in-process search, no Chroma client to start
+db=NumpyVectorStore(llm)
+ingest_documents(db,iter_chunks(document,text_splitter),llm)
 retriever = db.as_retriever()
 
 text = input("Enter the query")
@@ -3,6 +3,10 @@ from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llmkit.streaming import stream_to_streamlit
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
@@ -38,6 +42,5 @@ st.title("Blog Post Generator")
 topic = st.text_input("Input Topic")
 
 if topic:
-    response = overall_chain.invoke({"topic": topic})
-    st.write(response.content)
+    stream_to_streamlit(overall_chain, {"topic": topic})
 
@@ -1,8 +1,12 @@
 import os
+import sys
 from langchain_openai import ChatOpenAI
 import streamlit as st
 from langchain.prompts import PromptTemplate
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llmkit.streaming import stream_to_streamlit
+
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 prompt = PromptTemplate(
@@ -23,8 +27,7 @@ strengths = st.text_area("Your Strengths", height=100)
 weaknesses = st.text_area("Your Weaknesses", height=100)
 
 if company and position and strengths and weaknesses:
-    response = llm.invoke(prompt.format(company=company,
-                                        position=position,
-                                        strengths=strengths,
-                                        weaknesses=weaknesses))
-    st.write(response.content)
\ No newline at end of file
+    stream_to_streamlit(llm, prompt.format(company=company,
+                                           position=position,
+                                           strengths=strengths,
+                                           weaknesses=weaknesses))
\ No newline at end of file
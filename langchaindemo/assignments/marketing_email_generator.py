@@ -1,8 +1,13 @@
 from langchain_openai import ChatOpenAI
 import streamlit as st
 from langchain.prompts import PromptTemplate
-from langchain_core.output_parsers import StrOutputParser, JsonOutputParser
+from langchain_core.output_parsers import StrOutputParser
 import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llmkit.schemas import MarketingEmail
+from llmkit.structured import structured_output
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
@@ -33,7 +38,7 @@ email_prompt = PromptTemplate(
 )
 
 first_chain = product_prompt | llm | StrOutputParser()
-second_chain = email_prompt | llm | JsonOutputParser()
+second_chain = email_prompt | structured_output(llm, MarketingEmail)
 
 overall_chain = (
     first_chain |
@@ -49,4 +54,4 @@ target_audience = st.text_input("Input Target Audience")
 
 if product_name and features and target_audience:
     response = overall_chain.invoke({"product_name": product_name, "features": features})
-    st.write(response)
\ No newline at end of file
+    st.write(response.model_dump())
\ No newline at end of file
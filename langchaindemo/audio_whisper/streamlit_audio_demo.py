@@ -1,17 +1,30 @@
 import os
-import whisper
+import sys
 import streamlit as st
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llmkit.transcription import transcribe_bytes, transcribe_long
+
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 llm = ChatOpenAI(model="gpt-4o", api_key=OPENAI_API_KEY)
 
-def get_transcription(audio_path):
-    model = whisper.load_model("base")
-    result = model.transcribe(audio_path)
+def get_transcription(audio_bytes, suffix):
+    result = transcribe_bytes(audio_bytes, suffix, size="base")
     return result['text']
 
+def get_long_transcription(audio_bytes, suffix, placeholder):
+    # Segments finish out of order; keep them sorted by position and
+    # redraw the partial transcript every time one arrives.
+    parts = {}
+    for segment in transcribe_long(audio_bytes, suffix, size="base"):
+        parts[segment["index"]] = segment
+        placeholder.markdown("\n\n".join(
+            f"`{parts[i]['start']:.0f}s` {parts[i]['text'].strip()}" for i in sorted(parts)
+        ))
+    return " ".join(parts[i]["text"].strip() for i in sorted(parts))
+
 def process_transcription(transcription, query):
     prompt = ChatPromptTemplate.from_messages(
         [
@@ -32,16 +45,17 @@ def process_transcription(transcription, query):
 st.title("Audio Transcription and Query Assistant")
 
 uploaded_file = st.file_uploader("Choose an audio file", type=["wav", "mp3", "m4a"])
+long_recording = st.checkbox("Long recording (transcribe segments in parallel and show partial results)")
 
 if uploaded_file is not None:
 
-    audio_path = "uploaded_audio" + os.path.splitext(uploaded_file.name)[1]
-    with open(audio_path, "wb") as f:
-        f.write(uploaded_file.read())
-
-    transcription = get_transcription(audio_path)
     st.write("Transcription:")
-    st.write(transcription)
+    suffix = os.path.splitext(uploaded_file.name)[1]
+    if long_recording:
+        transcription = get_long_transcription(uploaded_file.getvalue(), suffix, st.empty())
+    else:
+        transcription = get_transcription(uploaded_file.getvalue(), suffix)
+        st.write(transcription)
 
     query = st.text_input("Enter your query:")
 
@@ -1,10 +1,12 @@
 import os
-import whisper
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llmkit.transcription import transcribe_file
 
 def get_transcription(audio_file):
 
-    model = whisper.load_model("base")
-    result = model.transcribe(audio_file)
+    result = transcribe_file(audio_file, size="base")
     return result['text']
 
 audio_file = "sample_english.m4a"
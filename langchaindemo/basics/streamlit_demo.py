@@ -1,8 +1,12 @@
 import os
+import sys
 from langchain_openai import ChatOpenAI
 import streamlit as st
 from langchain.globals import set_debug
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llmkit.streaming import stream_to_streamlit
+
 set_debug(True)
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -13,5 +17,4 @@ st.title("Ask Anything")
 question = st.text_input("Enter the question:")
 
 if question:
-    response = llm.invoke(question)
-    st.write(response.content)
\ No newline at end of file
+    stream_to_streamlit(llm, question)
\ No newline at end of file
@@ -1,11 +1,15 @@
 import os
+import sys
 from langchain_openai import ChatOpenAI
 import streamlit as st
 from langchain.prompts import PromptTemplate
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llmkit.streaming import stream_to_streamlit
+from llmkit.response_cache import cached_chat_model, response_cache
+
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-llm=ChatOpenAI(model="gpt-4o", api_key=OPENAI_API_KEY)
 prompt_template = PromptTemplate(
     input_variables=["city","month","language","budget"],
     template="""Welcome to the {city} travel guide!
@@ -17,6 +21,9 @@ prompt_template = PromptTemplate(
     Enjoy your trip!
     """
 )
+llm=cached_chat_model(ChatOpenAI(model="gpt-4o", api_key=OPENAI_API_KEY),
+                      response_cache("response_cache.sqlite3"), name="travel-guide",
+                      templates=[prompt_template])
 
 st.title("Travel Guide")
 
@@ -28,9 +35,8 @@ budget = st.selectbox("Travel Budget",["Low","Medium","High"])
 chain = prompt_template | llm
 
 if city and month and language and budget:
-    response = chain.invoke({"city":city,
-                             "month":month,
-                             "language":language,
-                             "budget":budget
-                             })
-    st.write(response.content)
\ No newline at end of file
+    stream_to_streamlit(chain, {"city":city,
+                                "month":month,
+                                "language":language,
+                                "budget":budget
+                                })
\ No newline at end of file
@@ -1,9 +1,13 @@
 import os
+import sys
 from langchain_openai import ChatOpenAI
 import streamlit as st
 from langchain.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser,JsonOutputParser
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llmkit.streaming import stream_to_streamlit
+
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 llm=ChatOpenAI(model="gpt-4o", api_key=OPENAI_API_KEY)
 title_prompt = PromptTemplate(
@@ -32,6 +36,5 @@ topic = st.text_input("Enter the topic:")
 emotion = st.text_input("Enter the emotion:")
 
 if topic and emotion:
-    response = final_chain.invoke({"topic":topic})
-    st.write(response.content)
+    stream_to_streamlit(final_chain, {"topic":topic})
 
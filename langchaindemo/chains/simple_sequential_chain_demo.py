@@ -1,9 +1,13 @@
 import os
+import sys
 from langchain_openai import ChatOpenAI
 import streamlit as st
 from langchain.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llmkit.streaming import stream_to_streamlit
+
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 llm=ChatOpenAI(model="gpt-4o", api_key=OPENAI_API_KEY)
 title_prompt = PromptTemplate(
@@ -31,5 +35,4 @@ st.title("Speech Generator")
 topic = st.text_input("Enter the topic:")
 
 if topic:
-    response = final_chain.invoke({"topic":topic})
-    st.write(response.content)
\ No newline at end of file
+    stream_to_streamlit(final_chain, {"topic":topic})
\ No newline at end of file
@@ -1,9 +1,13 @@
 import os
+import sys
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_community.chat_message_histories.in_memory import ChatMessageHistory
 from langchain_core.runnables.history import RunnableWithMessageHistory
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llmkit.history import SummaryBufferHistory
+from llmkit.session_history import SQLiteChatMessageHistory, sqlite_history_store
+
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 llm = ChatOpenAI(model="gpt-4o", api_key=OPENAI_API_KEY)
 prompt_template = ChatPromptTemplate.from_messages(
@@ -17,16 +21,20 @@ prompt_template = ChatPromptTemplate.from_messages(
 
 chain = prompt_template | llm
 
-history_for_chain = ChatMessageHistory()
+history_store = sqlite_history_store("chat_history.sqlite3")
+
+def get_session_history(session_id):
+    return SummaryBufferHistory(SQLiteChatMessageHistory(session_id, history_store), llm, max_tokens=2000)
 
 chain_with_history = RunnableWithMessageHistory(
     chain,
-    lambda session_id: history_for_chain,
+    get_session_history,
     input_messages_key="input",
     history_messages_key="chat_history"
 )
 
 print("Agile Guide")
+session_id = input("Session name (reuse one to continue a chat):") or "abc123"
 
 while True:
     question = input("Enter the question:")
@@ -34,6 +42,6 @@ while True:
         response = (chain_with_history
                     .invoke({"input": question},
                             {"configurable":{
-                                "session_id":"abc123"
+                                "session_id":session_id
                             }}))
         print(response.content)
\ No newline at end of file
@@ -1,8 +1,12 @@
 import os
+import sys
 from langchain_openai import ChatOpenAI
 import streamlit as st
 from langchain.prompts import ChatPromptTemplate
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llmkit.streaming import stream_to_streamlit
+
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 llm=ChatOpenAI(model="gpt-4o", api_key=OPENAI_API_KEY)
 prompt_template = ChatPromptTemplate.from_messages(
@@ -20,5 +24,4 @@ input = st.text_input("Enter the question:")
 chain = prompt_template | llm
 
 if input:
-    response = chain.invoke({"input":input})
-    st.write(response.content)
\ No newline at end of file
+    stream_to_streamlit(chain, {"input":input})
\ No newline at end of file
@@ -1,10 +1,15 @@
 import os
+import sys
 from langchain_openai import ChatOpenAI
 import streamlit as st
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_community.chat_message_histories import StreamlitChatMessageHistory
 from langchain_core.runnables.history import RunnableWithMessageHistory
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llmkit.streaming import stream_to_streamlit
+from llmkit.history import SummaryBufferHistory
+from llmkit.session_history import SQLiteChatMessageHistory, sqlite_history_store, streamlit_session_id
+
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 llm=ChatOpenAI(model="gpt-4o", api_key=OPENAI_API_KEY)
 prompt_template = ChatPromptTemplate.from_messages(
@@ -18,11 +23,16 @@ prompt_template = ChatPromptTemplate.from_messages(
 
 chain = prompt_template | llm
 
-history_for_chain = StreamlitChatMessageHistory()
+history_store = sqlite_history_store("chat_history.sqlite3")
+session_id = streamlit_session_id()
+history_for_chain = SQLiteChatMessageHistory(session_id, history_store)
+
+def get_session_history(session_id):
+    return SummaryBufferHistory(SQLiteChatMessageHistory(session_id, history_store), llm, max_tokens=2000)
 
 chain_with_history = RunnableWithMessageHistory(
     chain,
-    lambda session_id : history_for_chain,
+    get_session_history,
     input_messages_key="input",
     history_messages_key="chat_history"
 )
@@ -32,9 +42,8 @@ st.title("Agile Guide")
 input = st.text_input("Enter the question:")
 
 if input:
-    response = chain_with_history.invoke({"input":input},
-                                         {"configurable":{"session_id":"abc123"}})
-    st.write(response.content)
+    stream_to_streamlit(chain_with_history, {"input":input},
+                        {"configurable":{"session_id":session_id}})
 
 st.write("HISTORY")
 st.write(history_for_chain)
\ No newline at end of file
@@ -1,8 +1,13 @@
 import os
+import sys
 from langchain_openai import OpenAIEmbeddings
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llmkit.embedding_cache import cached_embeddings
+
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-llm=OpenAIEmbeddings(api_key=OPENAI_API_KEY)
+llm=cached_embeddings(OpenAIEmbeddings(api_key=OPENAI_API_KEY),
+                      path="embedding_cache.sqlite3")
 
 text = input("Enter the text")
 response = llm.embed_query(text)
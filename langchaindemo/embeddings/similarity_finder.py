@@ -1,15 +1,38 @@
 import os
+import sys
+import argparse
 from langchain_openai import OpenAIEmbeddings
-import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llmkit.embedding_cache import cached_embeddings
+from llmkit.similarity import cosine_matrix, embed_matrix, similarity_search
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-llm=OpenAIEmbeddings(api_key=OPENAI_API_KEY)
+llm=cached_embeddings(OpenAIEmbeddings(api_key=OPENAI_API_KEY),
+                      path="embedding_cache.sqlite3")
+
+parser = argparse.ArgumentParser(description="Cosine similarity between texts")
+parser.add_argument("queries", nargs="?", help="file with one query text per line (batch mode)")
+parser.add_argument("candidates", nargs="?", help="file with one candidate text per line (batch mode)")
+parser.add_argument("--top-k", type=int, default=5)
+args = parser.parse_args()
+
+if args.queries and args.candidates:
+    with open(args.queries) as f:
+        queries = [line.strip() for line in f if line.strip()]
+    with open(args.candidates) as f:
+        candidates = [line.strip() for line in f if line.strip()]
 
-text1 = input("Enter the text1")
-text2 = input("Enter the text2")
-response1 = llm.embed_query(text1)
-response2 = llm.embed_query(text2)
+    # Two batched embedding calls and one matrix multiply for all pairs
+    for query, matches in zip(queries, similarity_search(llm, queries, candidates, k=args.top_k)):
+        print(query)
+        for index, score in matches:
+            print(f"  {score*100:6.2f} %  {candidates[index]}")
+else:
+    text1 = input("Enter the text1")
+    text2 = input("Enter the text2")
+    vectors = embed_matrix(llm, [text1, text2])
 
-similarity_score = np.dot(response1,response2)
+    similarity_score = cosine_matrix(vectors[:1], vectors[1:])[0, 0]
 
-print(similarity_score*100,'%')
\ No newline at end of file
+    print(similarity_score*100,'%')
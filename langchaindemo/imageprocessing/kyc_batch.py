@@ -0,0 +1,56 @@
+# kyc_batch.py
+#
+# Verify a backlog of identification documents with the KYC app's prompt, offline:
+#
+#   python kyc_batch.py documents/ verdicts.jsonl --concurrency 32
+#   python kyc_batch.py manifest.csv verdicts.jsonl --base-url http://localhost:8000/v1
+#
+# The source is a directory of images, each with a <name>.json holding {"name": ..., "dob": ...},
+# or a JSONL/CSV manifest with image, name, dob (and optionally id) columns.
+# Re-running the same command resumes: ids already in the output are skipped.
+import argparse
+import logging
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llmkit.batch import load_app
+from llmkit.gateway import LLMGateway, chat_model
+from llmkit.kyc import verify_documents
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify every identification document of a directory or manifest")
+    parser.add_argument("source", help="directory of images with <name>.json details, or a JSONL/CSV manifest")
+    parser.add_argument("output", help="JSONL file verdicts are appended to")
+    parser.add_argument("--model", default="gpt-4o")
+    parser.add_argument("--base-url", help="OpenAI-compatible endpoint (default: OpenAI)")
+    parser.add_argument("--api-key", default=os.getenv("OPENAI_API_KEY"))
+    parser.add_argument("--concurrency", type=int, default=32, help="documents in progress")
+    parser.add_argument("--requests-per-second", type=float, default=50)
+    parser.add_argument("--workers", type=int, help="image preprocessing processes (default: one per CPU)")
+    parser.add_argument("--detail", default="low", choices=["low", "high", "auto"],
+                        help="image detail level: sets both the preprocessing size and the request")
+    parser.add_argument("--progress-every", type=float, default=10.0, help="seconds between progress lines")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    # The app builds its own ChatOpenAI client when loaded, which needs a key
+    os.environ.setdefault("OPENAI_API_KEY", args.api_key or "unused")
+    prompt = load_app(os.path.join(HERE, "kyc_verification.py"), workdir=HERE)["prompt"]
+    gateway = LLMGateway(max_connections=args.concurrency, requests_per_second=args.requests_per_second)
+    llm = chat_model(args.model, base_url=args.base_url, api_key=args.api_key, temperature=0, gateway=gateway)
+    try:
+        stats = verify_documents(llm, prompt, args.source, args.output, concurrency=args.concurrency,
+                                 workers=args.workers, detail=args.detail, progress_every=args.progress_every)
+    finally:
+        gateway.close()
+    print(f"{stats['done']} verified, {stats['skipped']} already done, {stats['failed']} failed "
+          f"in {stats['seconds']:.1f}s ({stats['per_second'] * 60:.0f} docs/min, "
+          f"p50 {stats['p50']:.2f}s, p95 {stats['p95']:.2f}s, p99 {stats['p99']:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
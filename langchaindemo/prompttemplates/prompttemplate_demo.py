@@ -1,10 +1,14 @@
 import os
+import sys
 from langchain_openai import ChatOpenAI
 import streamlit as st
 from langchain.prompts import PromptTemplate
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llmkit.streaming import stream_to_streamlit
+from llmkit.response_cache import cached_chat_model, response_cache
+
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-llm=ChatOpenAI(model="gpt-4o", api_key=OPENAI_API_KEY)
 prompt_template = PromptTemplate(
     input_variables=["country","no_of_paras","language"],
     template="""You are an expert in traditional cuisines.
@@ -15,6 +19,9 @@ prompt_template = PromptTemplate(
     Answer in {no_of_paras} short paras in {language}
     """
 )
+llm=cached_chat_model(ChatOpenAI(model="gpt-4o", api_key=OPENAI_API_KEY),
+                      response_cache("response_cache.sqlite3"), name="cuisine",
+                      templates=[prompt_template])
 
 st.title("Cuisine Info")
 
@@ -23,8 +30,7 @@ no_of_paras = st.number_input("Enter the number of paras",min_value=1,max_value=
 language = st.text_input("Enter the language:")
 
 if country:
-    response = llm.invoke(prompt_template.format(country=country,
-                                                 no_of_paras=no_of_paras,
-                                                 language=language
-                                                 ))
-    st.write(response.content)
\ No newline at end of file
+    stream_to_streamlit(llm, prompt_template.format(country=country,
+                                                    no_of_paras=no_of_paras,
+                                                    language=language
+                                                    ))
\ No newline at end of file
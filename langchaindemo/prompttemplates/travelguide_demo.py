@@ -1,8 +1,13 @@
+import os
+import sys
 import streamlit as st
 from langchain.prompts import PromptTemplate
 
 from langchain_community.chat_models import ChatOllama
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llmkit.streaming import stream_to_streamlit
+
 llm=ChatOllama(model="llama3.2")
 prompt_template = PromptTemplate(
     input_variables=["city","month","language","budget"],
@@ -25,9 +30,8 @@ budget = st.selectbox("Travel Budget",["Low","Medium","High"])
 
 
 if city and month and language and budget:
-    response = llm.invoke(prompt_template.format(city=city,
-                                                 month=month,
-                                                 language=language,
-                                                 budget=budget
-                                                 ))
-    st.write(response.content)
\ No newline at end of file
+    stream_to_streamlit(llm, prompt_template.format(city=city,
+                                                    month=month,
+                                                    language=language,
+                                                    budget=budget
+                                                    ))
\ No newline at end of file
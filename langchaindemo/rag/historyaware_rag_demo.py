@@ -1,26 +1,49 @@
 import os
-from langchain_openai import OpenAIEmbeddings,ChatOpenAI
+import sys
+from langchain_openai import OpenAIEmbeddings
 from langchain_community.document_loaders import TextLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_chroma import Chroma
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain.chains import create_retrieval_chain,create_history_aware_retriever
+from langchain.chains import create_retrieval_chain
 from langchain.chains.combine_documents import create_stuff_documents_chain
 import streamlit as st
-from langchain_community.chat_message_histories import StreamlitChatMessageHistory
 from langchain_core.runnables.history import RunnableWithMessageHistory
 
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llmkit.embedding_cache import cached_embeddings
+from llmkit.vector_index import IndexWatcher, open_persistent_index
+from llmkit.streaming import stream_to_streamlit
+from llmkit.resources import chat_openai
+from llmkit.session_history import SQLiteChatMessageHistory, sqlite_history_store, streamlit_session_id
+from llmkit.hybrid import BM25Index, hybrid_retriever
+from llmkit.context import packed_retriever
+from llmkit.condense import history_aware_retriever
+
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-embeddings=OpenAIEmbeddings(api_key=OPENAI_API_KEY)
-llm=ChatOpenAI(model="gpt-4o", api_key=OPENAI_API_KEY)
+llm=chat_openai("gpt-4o", api_key=OPENAI_API_KEY)
+# Small, fast model for rewriting follow-up questions into standalone ones
+rewrite_llm=chat_openai("gpt-4o-mini", api_key=OPENAI_API_KEY, temperature=0)
+
+# Built once per process instead of on every Streamlit rerun
+@st.cache_resource(show_spinner="Loading product data...")
+def build_retriever():
+    embeddings=cached_embeddings(OpenAIEmbeddings(api_key=OPENAI_API_KEY),
+                                 path="embedding_cache.sqlite3")
+    document = TextLoader("product-data.txt").load()
+    text_splitter= RecursiveCharacterTextSplitter(chunk_size=1000,
+                                                  chunk_overlap=200)
+    chunks=text_splitter.split_documents(document)
+    vector_store=open_persistent_index(chunks,embeddings,text_splitter,"chroma_db",
+                                       collection_prefix="product-data")
+    # Dense + BM25 so exact product names are found too
+    retriever=hybrid_retriever(vector_store,chunks,k=6)
+    # Pick up edits to product-data.txt while the app runs; only changed chunks are re-embedded
+    IndexWatcher(vector_store,["product-data.txt"],text_splitter,
+                 on_change=lambda watcher: setattr(retriever,"bm25",BM25Index(watcher.chunks()))).start()
+    return packed_retriever(retriever,max_tokens=600)
 
-document = TextLoader("product-data.txt").load()
-text_splitter= RecursiveCharacterTextSplitter(chunk_size=1000,
-                                              chunk_overlap=200)
-chunks=text_splitter.split_documents(document)
-vector_store=Chroma.from_documents(chunks,embeddings)
-retriever = vector_store.as_retriever()
+retriever = build_retriever()
 
 prompt_template = ChatPromptTemplate.from_messages(
 [
@@ -36,15 +59,23 @@ prompt_template = ChatPromptTemplate.from_messages(
 ]
 )
 
-history_aware_retriever = create_history_aware_retriever(llm,retriever,prompt_template)
+# Only follow-up questions go through the model before retrieval; rewrites are
+# cached in the retriever, so it is kept across reruns
+@st.cache_resource(show_spinner=False)
+def build_chat_retriever():
+    return history_aware_retriever(rewrite_llm,retriever)
+
+chat_retriever = build_chat_retriever()
 qa_chain = create_stuff_documents_chain(llm,prompt_template)
-rag_chain = create_retrieval_chain(history_aware_retriever,qa_chain)
+rag_chain = create_retrieval_chain(chat_retriever,qa_chain)
 
-history_for_chain = StreamlitChatMessageHistory()
+history_store = sqlite_history_store("chat_history.sqlite3")
+session_id = streamlit_session_id()
 
 chain_with_history = RunnableWithMessageHistory(
     rag_chain,
-    lambda session_id : history_for_chain,
+    # Only the last 20 messages are loaded into the prompt
+    lambda session_id : SQLiteChatMessageHistory(session_id, history_store, window=20),
     input_messages_key="input",
     history_messages_key="chat_history"
 )
@@ -53,6 +84,6 @@ st.write("Chat with Document")
 question=st.text_input("Your Question")
 
 if question:
-    response = chain_with_history.invoke({"input":question},{"configurable":{"session_id":"abc123"}})
-    st.write(response['answer'])
+    stream_to_streamlit(chain_with_history,{"input":question},{"configurable":{"session_id":session_id}},
+                        key="answer")
 
@@ -1,24 +1,24 @@
 import os
+import sys
 from langchain_openai import OpenAIEmbeddings,ChatOpenAI
-from langchain_community.document_loaders import PyPDFLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_chroma import Chroma
 from langchain.prompts import ChatPromptTemplate
 from langchain.chains import create_retrieval_chain
 from langchain.chains.combine_documents import create_stuff_documents_chain
 
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llmkit.embedding_cache import cached_embeddings
+from llmkit.vector_index import open_persistent_index
+from llmkit.ingest import iter_chunks
+from llmkit.pdf import iter_pdf_pages
+from llmkit.context import packed_retriever
+
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-embeddings=OpenAIEmbeddings(api_key=OPENAI_API_KEY)
+embeddings=cached_embeddings(OpenAIEmbeddings(api_key=OPENAI_API_KEY),
+                             path="embedding_cache.sqlite3")
 llm=ChatOpenAI(model="gpt-4o", api_key=OPENAI_API_KEY)
 
-document = PyPDFLoader("academic_research_data.pdf").load()
-text_splitter= RecursiveCharacterTextSplitter(chunk_size=1000,
-                                              chunk_overlap=200)
-chunks=text_splitter.split_documents(document)
-vector_store=Chroma.from_documents(chunks,embeddings)
-retriever = vector_store.as_retriever()
-
 prompt_template = ChatPromptTemplate.from_messages(
 [
     ("system","""You are an assistant for answering questions.
@@ -33,11 +33,22 @@ prompt_template = ChatPromptTemplate.from_messages(
 )
 
 qa_chain = create_stuff_documents_chain(llm,prompt_template)
-rag_chain = create_retrieval_chain(retriever,qa_chain)
 
-print("Chat with Document")
-question=input("Your Question")
+# Workers spawned by iter_pdf_pages re-import this script
+if __name__ == "__main__":
+    # Pages are parsed in worker processes and split/embedded as they arrive
+    document = iter_pdf_pages("academic_research_data.pdf")
+    text_splitter= RecursiveCharacterTextSplitter(chunk_size=1000,
+                                                  chunk_overlap=200)
+    chunks=iter_chunks(document,text_splitter)
+    vector_store=open_persistent_index(chunks,embeddings,text_splitter,"chroma_db",
+                                       collection_prefix="academic-research")
+    retriever = packed_retriever(vector_store.as_retriever(search_kwargs={"k": 6}),max_tokens=600)
+    rag_chain = create_retrieval_chain(retriever,qa_chain)
+
+    print("Chat with Document")
+    question=input("Your Question")
 
-if question:
-    response = rag_chain.invoke({"input":question})
-    print(response['answer'])
\ No newline at end of file
+    if question:
+        response = rag_chain.invoke({"input":question})
+        print(response['answer'])
\ No newline at end of file
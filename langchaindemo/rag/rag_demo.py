@@ -1,23 +1,32 @@
 import os
+import sys
 from langchain_openai import OpenAIEmbeddings,ChatOpenAI
 from langchain_community.document_loaders import TextLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_chroma import Chroma
 from langchain.prompts import ChatPromptTemplate
 from langchain.chains import create_retrieval_chain
 from langchain.chains.combine_documents import create_stuff_documents_chain
 
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llmkit.embedding_cache import cached_embeddings
+from llmkit.vector_index import open_persistent_index
+from llmkit.hybrid import hybrid_retriever
+from llmkit.context import packed_retriever
+
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-embeddings=OpenAIEmbeddings(api_key=OPENAI_API_KEY)
+embeddings=cached_embeddings(OpenAIEmbeddings(api_key=OPENAI_API_KEY),
+                             path="embedding_cache.sqlite3")
 llm=ChatOpenAI(model="gpt-4o", api_key=OPENAI_API_KEY)
 
 document = TextLoader("product-data.txt").load()
 text_splitter= RecursiveCharacterTextSplitter(chunk_size=1000,
                                               chunk_overlap=200)
 chunks=text_splitter.split_documents(document)
-vector_store=Chroma.from_documents(chunks,embeddings)
-retriever = vector_store.as_retriever()
+vector_store=open_persistent_index(chunks,embeddings,text_splitter,"chroma_db",
+                                   collection_prefix="product-data")
+# Dense + BM25 so exact product names are found too
+retriever = packed_retriever(hybrid_retriever(vector_store,chunks,k=6),max_tokens=600)
 
 prompt_template = ChatPromptTemplate.from_messages(
 [
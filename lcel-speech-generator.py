@@ -1,11 +1,12 @@
 import os
-from langchain_openai import ChatOpenAI
 import streamlit as st
 from langchain.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from llmkit.streaming import stream_to_streamlit
+from llmkit.resources import chat_openai
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-llm = ChatOpenAI(model="gpt-5",api_key=OPENAI_API_KEY)
+llm = chat_openai("gpt-5", api_key=OPENAI_API_KEY)
 title_prompt = PromptTemplate(
     input_variables = ["topic"],
     template = """
@@ -32,7 +33,6 @@ st.title("Speech Generator App")
 topic = st.text_input("Enter the topic:")
 
 if topic:
-    response = final_chain.invoke({"topic": topic
+    response = stream_to_streamlit(final_chain, {"topic": topic
     })
-    st.write(response.content)
     print(response)
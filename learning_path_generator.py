@@ -2,11 +2,15 @@
 import os
 import json
 import math
-import requests
 import streamlit as st
 from datetime import date
-from langchain_aws import ChatBedrock
 from langchain.prompts import PromptTemplate
+from langchain_core.messages import HumanMessage
+from llmkit.resources import chat_bedrock
+from llmkit.youtube import PlaylistPrefetcher, search_playlists
+from llmkit.json_stream import JSONItemStream
+from llmkit.schemas import Roadmap
+from llmkit.structured import StructuredOutputError, parse_structured
 
 # ---------------------------
 # Configuration / LLM Setup
@@ -14,7 +18,7 @@ from langchain.prompts import PromptTemplate
 BEDROCK_MODEL_ID = "anthropic.claude-3-sonnet-20240229-v1:0"
 BEDROCK_REGION = "us-east-1"
 
-llm = ChatBedrock(
+llm = chat_bedrock(
     model_id=BEDROCK_MODEL_ID,
     region_name=BEDROCK_REGION
 )
@@ -30,34 +34,7 @@ def search_youtube_playlists(query, max_results=3):
     Requires environment variable YOUTUBE_API_KEY to be set.
     Returns list of dicts: {title, url}
     """
-    if not YOUTUBE_API_KEY:
-        return []
-
-    url = "https://www.googleapis.com/youtube/v3/search"
-    params = {
-        "part": "snippet",
-        "q": query,
-        "type": "playlist",
-        "maxResults": max_results,
-        "key": YOUTUBE_API_KEY,
-    }
-    try:
-        r = requests.get(url, params=params, timeout=10)
-        r.raise_for_status()
-        js = r.json()
-        results = []
-        for item in js.get("items", []):
-            playlist_id = item["id"].get("playlistId")
-            title = item["snippet"].get("title")
-            if playlist_id:
-                results.append({
-                    "title": title,
-                    "url": f"https://www.youtube.com/playlist?list={playlist_id}"
-                })
-        return results
-    except Exception as e:
-        # return empty list on any error
-        return []
+    return search_playlists(query, YOUTUBE_API_KEY, max_results=max_results)
 
 # ---------------------------
 # Prompt Template
@@ -114,97 +91,123 @@ with st.form("inputs"):
     include_youtube = st.checkbox("🔎 Also search YouTube playlists for each week's keywords (requires YOUTUBE_API_KEY env var)", value=False)
     submitted = st.form_submit_button("Generate Learning Roadmap")
 
+# ---------------------------
+# Progressive rendering
+# ---------------------------
+def show_playlists(placeholder, playlists):
+    with placeholder.container():
+        if playlists:
+            for p in playlists:
+                st.write(f"- [{p['title']}]({p['url']})")
+        else:
+            st.write("_No playlists found / API key missing or API error._")
+
+def render_week(w, prefetcher, pending):
+    week_num = w.get("week")
+    with st.expander(f"Week {week_num}: {w.get('focus')}"):
+        st.markdown("**Learning objectives**")
+        for obj in w.get("learning_objectives", []):
+            st.write(f"- {obj}")
+
+        st.markdown("**Recommended resources**")
+        for res in w.get("recommended_resources", []):
+            typ = res.get("type", "resource")
+            title = res.get("title", "")
+            note = res.get("note", "")
+            line = f"- {title} ({typ})"
+            if note:
+                line += f" — {note}"
+            st.write(line)
+
+        st.markdown("**Project idea**")
+        st.write(w.get("project_idea", "—"))
+
+        # Optionally search YouTube
+        if prefetcher:
+            # choose a primary keyword (first in list)
+            keywords = w.get("search_keywords", [])
+            if keywords:
+                kw = keywords[0]
+                st.markdown(f"**YouTube playlists for:** `{kw}`")
+                placeholder = st.empty()
+                placeholder.write("_Searching..._")
+                # The lookup starts now, while later weeks are still being generated
+                pending.append((prefetcher.submit(kw), placeholder))
+            else:
+                st.write("_No search keywords provided for this week._")
+
+def show_ready_playlists(pending, wait=False):
+    for item in list(pending):
+        future, placeholder = item
+        if wait or future.done():
+            show_playlists(placeholder, future.result())
+            pending.remove(item)
+
 if submitted:
     # Basic validation
     if not current_skill.strip() or not target_role.strip():
         st.error("Please provide your current skill and target role.")
     else:
-        with st.spinner("Designing your roadmap..."):
-            # Generate the prompt and call the LLM
-            prompt_text = roadmap_prompt.format(
-                current_skill=current_skill,
-                target_role=target_role,
-                months=months,
-                learning_style=learning_style
-            )
-
+        # Generate the prompt and stream the LLM reply
+        prompt_text = roadmap_prompt.format(
+            current_skill=current_skill,
+            target_role=target_role,
+            months=months,
+            learning_style=learning_style
+        )
+
+        overview = st.container()
+        st.markdown("---")
+        # Each week is rendered as soon as the model closes its JSON object,
+        # instead of after the whole roadmap has been generated
+        with PlaylistPrefetcher(YOUTUBE_API_KEY, max_results=3) as prefetcher:
+            pending = []
+            roadmap_stream = JSONItemStream(llm.stream(prompt_text))
             try:
-                response = llm.invoke(prompt_text)
-                raw = response.content.strip()
+                with st.spinner("Designing your roadmap..."):
+                    for w in roadmap_stream:
+                        render_week(w, prefetcher if include_youtube else None, pending)
+                        show_ready_playlists(pending)
             except Exception as e:
                 st.error(f"LLM call failed: {e}")
-                raw = None
+            if pending:
+                with st.spinner("Searching YouTube playlists..."):
+                    show_ready_playlists(pending, wait=True)
+        raw = roadmap_stream.text.strip()
 
         if not raw:
             st.error("No response from LLM.")
         else:
-            # Try parse JSON
-            parsed = None
+            # Validate the complete reply against the roadmap schema. Backticks,
+            # trailing commas and a truncated reply are repaired locally; weeks
+            # that are still missing or invalid are requested again on their own
             try:
-                parsed = json.loads(raw)
-            except Exception:
-                # Sometimes LLM adds backticks or explanation — try to extract the JSON block
-                try:
-                    start = raw.index("{")
-                    end = raw.rindex("}") + 1
-                    json_text = raw[start:end]
-                    parsed = json.loads(json_text)
-                except Exception as e:
-                    parsed = None
+                with st.spinner("Checking the roadmap..."):
+                    parsed = parse_structured(raw, Roadmap, llm, [HumanMessage(prompt_text)]).model_dump()
+            except StructuredOutputError:
+                parsed = None
 
             if not parsed:
                 st.warning("Could not parse JSON from model output. Showing raw output below — you can copy it and try again.")
                 st.code(raw, language="json")
             else:
-                # Display summary
-                weeks_total = parsed.get("weeks_total") or len(parsed.get("weeks", []))
-                st.success(f"Generated a {weeks_total}-week learning roadmap to become a **{target_role}**.")
-                st.markdown("### 📋 Roadmap Overview")
-                meta = parsed.get("meta", {})
-                if meta:
-                    st.markdown("**Assessment checkpoints:**")
-                    for chk in meta.get("assessment_checkpoints", []):
-                        st.write(f"- {chk}")
-                    st.markdown("**Final project:**")
-                    st.write(meta.get("final_project", "—"))
-
-                st.markdown("---")
-                # Render each week in an expander
-                for w in parsed.get("weeks", []):
-                    week_num = w.get("week")
-                    with st.expander(f"Week {week_num}: {w.get('focus')}"):
-                        st.markdown("**Learning objectives**")
-                        for obj in w.get("learning_objectives", []):
-                            st.write(f"- {obj}")
-
-                        st.markdown("**Recommended resources**")
-                        for res in w.get("recommended_resources", []):
-                            typ = res.get("type", "resource")
-                            title = res.get("title", "")
-                            note = res.get("note", "")
-                            line = f"- {title} ({typ})"
-                            if note:
-                                line += f" — {note}"
-                            st.write(line)
-
-                        st.markdown("**Project idea**")
-                        st.write(w.get("project_idea", "—"))
-
-                        # Optionally search YouTube
-                        if include_youtube:
-                            # choose a primary keyword (first in list)
-                            keywords = w.get("search_keywords", [])
-                            if keywords:
-                                kw = keywords[0]
-                                st.markdown(f"**YouTube playlists for:** `{kw}`")
-                                playlists = search_youtube_playlists(kw, max_results=3)
-                                if playlists:
-                                    for p in playlists:
-                                        st.write(f"- [{p['title']}]({p['url']})")
-                                else:
-                                    st.write("_No playlists found / API key missing or API error._")
-                            else:
-                                st.write("_No search keywords provided for this week._")
+                # Weeks that were malformed in the stream or only exist after the repair
+                for i, w in enumerate(parsed["weeks"]):
+                    if i >= roadmap_stream.items or i in roadmap_stream.invalid:
+                        render_week(w, None, [])
+
+                # Display summary above the weeks
+                with overview:
+                    weeks_total = parsed.get("weeks_total") or len(parsed.get("weeks", []))
+                    st.success(f"Generated a {weeks_total}-week learning roadmap to become a **{target_role}**.")
+                    st.markdown("### 📋 Roadmap Overview")
+                    meta = parsed.get("meta", {})
+                    if meta:
+                        st.markdown("**Assessment checkpoints:**")
+                        for chk in meta.get("assessment_checkpoints", []):
+                            st.write(f"- {chk}")
+                        st.markdown("**Final project:**")
+                        st.write(meta.get("final_project", "—"))
 
                 # Download button — export cleaned JSON or text
                 st.markdown("---")
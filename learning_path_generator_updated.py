@@ -1,39 +1,68 @@
 import streamlit as st
-import json
-import requests
-from datetime import datetime, timedelta
 from openai import OpenAI
+from langchain_core.messages import HumanMessage, SystemMessage
+from llmkit.youtube import PlaylistPrefetcher
+from llmkit.json_stream import JSONItemStream
+from llmkit.resources import chat_openai
+from llmkit.schemas import Roadmap
+from llmkit.structured import parse_structured
 
 # ---- CONFIG ----
 st.set_page_config(page_title="🧠 Personal Learning Path Generator", page_icon="🧭", layout="centered")
 
+# One client (and connection pool) per process, reused across reruns
+@st.cache_resource(show_spinner=False)
+def get_openai_client(api_key):
+    return OpenAI(api_key=api_key)
+
 # Replace with your API key
 try:
     api_key = st.secrets["OPENAI_API_KEY"]
-    client = OpenAI(api_key=api_key)
+    client = get_openai_client(api_key)
+    # Re-requests only the weeks of a roadmap that fail validation
+    repair_llm = chat_openai("gpt-4o-mini", api_key=api_key, temperature=0)
 except (KeyError, FileNotFoundError):
     client = None
 
-# Optional YouTube search function
-def search_youtube(query, max_results=3):
-    """Search YouTube for learning videos related to a topic"""
+# Optional YouTube search
+def get_youtube_api_key():
     try:
         YOUTUBE_API_KEY = st.secrets["YOUTUBE_API_KEY"]
     except (KeyError, FileNotFoundError):
-        return []
+        return None
     if not YOUTUBE_API_KEY or YOUTUBE_API_KEY == "your_youtube_api_key_here":
-        return []
-    url = (
-        f"https://www.googleapis.com/youtube/v3/search?part=snippet&type=playlist&q={query}&maxResults={max_results}"
-        f"&key={YOUTUBE_API_KEY}"
-    )
-    response = requests.get(url).json()
-    results = []
-    for item in response.get("items", []):
-        title = item["snippet"]["title"]
-        video_url = f"https://www.youtube.com/playlist?list={item['id']['playlistId']}"
-        results.append({"title": title, "url": video_url})
-    return results
+        return None
+    return YOUTUBE_API_KEY
+
+
+# ---- PROGRESSIVE RENDERING ----
+def render_week(week, prefetcher, pending):
+    with st.expander(f"📘 Week {week['week']}: {week['focus']}"):
+        st.write("**🎯 Learning Objectives:**")
+        for obj in week["learning_objectives"]:
+            st.markdown(f"- {obj}")
+
+        st.write("**📚 Recommended Resources:**")
+        for r in week["recommended_resources"]:
+            st.markdown(f"- *{r['type'].capitalize()}*: **{r['title']}**")
+
+        st.write("**💡 Project Idea:**")
+        st.info(week["project_idea"])
+
+        if prefetcher:
+            st.write("**🎥 YouTube Playlists:**")
+            for kw in week.get("search_keywords", []):
+                placeholder = st.empty()
+                pending.append((prefetcher.submit(f"{kw} tutorial"), placeholder))
+
+def show_ready_playlists(pending, wait=False):
+    for item in list(pending):
+        future, placeholder = item
+        if wait or future.done():
+            with placeholder.container():
+                for p in future.result():
+                    st.markdown(f"- [{p['title']}]({p['url']})")
+            pending.remove(item)
 
 
 # ---- APP TITLE ----
@@ -75,50 +104,49 @@ if submitted:
           ]
         }}
         """
-        try:
-            if not client:
-                st.error("⚠️ OpenAI API key not configured. Please add your API key to .streamlit/secrets.toml")
-                st.stop()
-                
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are an AI learning path creator."},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.8,
-            )
-            raw_output = response.choices[0].message.content.strip()
-            # Clean and parse JSON
-            json_start = raw_output.find("{")
-            json_end = raw_output.rfind("}")
-            json_data = json.loads(raw_output[json_start:json_end + 1])
-        except Exception as e:
-            st.error(f"Error parsing model output: {e}")
-            if 'raw_output' in locals():
-                st.code(raw_output)
+        if not client:
+            st.error("⚠️ OpenAI API key not configured. Please add your API key to .streamlit/secrets.toml")
             st.stop()
 
-        # ---- DISPLAY LEARNING PATH ----
-        st.success(f"✅ Generated {json_data.get('weeks_total', len(json_data['weeks']))} Weeks Plan!")
-        for week in json_data["weeks"]:
-            with st.expander(f"📘 Week {week['week']}: {week['focus']}"):
-                st.write("**🎯 Learning Objectives:**")
-                for obj in week["learning_objectives"]:
-                    st.markdown(f"- {obj}")
-
-                st.write("**📚 Recommended Resources:**")
-                for r in week["recommended_resources"]:
-                    st.markdown(f"- *{r['type'].capitalize()}*: **{r['title']}**")
-
-                st.write("**💡 Project Idea:**")
-                st.info(week["project_idea"])
-
-                if fetch_youtube:
-                    st.write("**🎥 YouTube Playlists:**")
-                    for kw in week.get("search_keywords", []):
-                        playlists = search_youtube(f"{kw} tutorial")
-                        for p in playlists:
-                            st.markdown(f"- [{p['title']}]({p['url']})")
-
-        st.balloons()
+        summary = st.empty()
+        # Weeks render as soon as the model closes each one, and their YouTube
+        # lookups start right away, instead of waiting for the whole roadmap
+        with PlaylistPrefetcher(get_youtube_api_key()) as prefetcher:
+            pending = []
+            system = "You are an AI learning path creator."
+            try:
+                response = client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[
+                        {"role": "system", "content": system},
+                        {"role": "user", "content": prompt},
+                    ],
+                    temperature=0.8,
+                    # JSON mode: no code fences or commentary around the roadmap
+                    response_format={"type": "json_object"},
+                    stream=True,
+                )
+                roadmap_stream = JSONItemStream(chunk.choices[0].delta.content or ""
+                                                for chunk in response if chunk.choices)
+                for week in roadmap_stream:
+                    render_week(week, prefetcher if fetch_youtube else None, pending)
+                    show_ready_playlists(pending)
+                if pending:
+                    with st.spinner("Fetching YouTube playlists..."):
+                        show_ready_playlists(pending, wait=True)
+                # A truncated or invalid reply is repaired locally, or by asking
+                # again for just the weeks that fail validation
+                json_data = parse_structured(roadmap_stream.text, Roadmap, repair_llm,
+                                             [SystemMessage(system), HumanMessage(prompt)]).model_dump()
+                for i, week in enumerate(json_data["weeks"]):
+                    if i >= roadmap_stream.items or i in roadmap_stream.invalid:
+                        render_week(week, None, [])
+            except Exception as e:
+                st.error(f"Error parsing model output: {e}")
+                if 'roadmap_stream' in locals():
+                    st.code(roadmap_stream.text)
+                st.stop()
+
+    # ---- SUMMARY ----
+    summary.success(f"✅ Generated {json_data.get('weeks_total', len(json_data['weeks']))} Weeks Plan!")
+    st.balloons()
@@ -0,0 +1,5 @@
+"""Shared helpers for the demo apps in this repository.
+
+Root-level apps can import ``llmkit`` directly; the scripts under
+``langchaindemo/`` add the repository root to ``sys.path`` first.
+"""
@@ -0,0 +1,215 @@
+"""Headless batch generation from the Streamlit apps' prompts.
+
+The planner apps produce one result per button click. ``load_app`` runs an
+app script without a Streamlit server (bare mode: widgets return their
+defaults, nothing is rendered) and returns its globals, so its
+``PromptTemplate`` and model can be reused as they are. ``run_batch`` then
+renders the template for every record of a JSONL file and sends the
+prompts to the model with at most ``concurrency`` requests in flight:
+
+* records hold the raw form values; an app that normalizes them before
+  formatting (lower-casing a choice, defaulting an empty multiselect)
+  exposes that step as a function, which is passed as ``preprocess`` so
+  batch prompts read exactly like the app's;
+
+* inputs are read lazily, so thousands of records never sit in memory;
+* each result is appended to the output JSONL as soon as it is ready, with
+  its latency; records whose ``id`` is already in the output are skipped,
+  so an interrupted run resumes where it stopped;
+* throttling and timeout errors are retried with jittered exponential
+  backoff; records that still fail go to ``<output>.errors.jsonl`` and are
+  retried on the next run;
+* progress (done, rate, latency percentiles) is logged every
+  ``progress_every`` seconds.
+
+Synchronous-only clients such as ``ChatBedrock`` run ``ainvoke`` on the
+event loop's default executor, which is sized to ``concurrency`` so the
+thread pool is not what caps throughput.
+"""
+import asyncio
+import builtins
+import json
+import logging
+import os
+import random
+import runpy
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from unittest import mock
+
+import numpy as np
+
+from llmkit.ingest import _is_retryable, _retry_after
+from llmkit.streaming import chunk_text
+
+logger = logging.getLogger(__name__)
+
+
+def load_app(path, workdir=None):
+    """Execute the app script at ``path`` headless and return its globals.
+
+    The script runs in ``workdir`` (default: the current directory), with
+    Streamlit's bare-mode warnings and the script's own prints silenced and
+    ``input()`` answering an empty string.
+    """
+    cwd = os.getcwd()
+    if workdir:
+        os.chdir(workdir)
+    # Streamlit warns about bare mode on every widget call
+    logging.disable(logging.WARNING)
+    try:
+        with mock.patch.object(builtins, "input", lambda *a: ""), redirect_stdout(None):
+            return runpy.run_path(path, run_name="__headless__")
+    finally:
+        logging.disable(logging.NOTSET)
+        os.chdir(cwd)
+
+
+def read_records(path):
+    """``(id, variables)`` for every non-empty line of a JSONL file; ``id`` defaults to the line number."""
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            if line.strip():
+                record = json.loads(line)
+                yield str(record.pop("id", number)), record
+
+
+def completed_ids(path):
+    """Ids already in the JSONL file ``path``.
+
+    A run killed mid-write leaves a partial last line; it is cut off so the
+    next result starts on a line of its own.
+    """
+    if not os.path.exists(path):
+        return set()
+    ids, end = set(), 0
+    with open(path, "r+b") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            end += len(line)
+            if line.strip():
+                try:
+                    ids.add(json.loads(line)["id"])
+                except (ValueError, KeyError):
+                    logger.warning("Ignoring an unreadable line in %s", path)
+        if f.seek(0, os.SEEK_END) != end:
+            logger.warning("Dropping a partial last line from %s", path)
+            f.truncate(end)
+    return ids
+
+
+def render(prompt, variables, preprocess=None):
+    """Format ``prompt`` with ``preprocess(**variables)``.
+
+    Without ``preprocess`` the values are used as they are, except that list
+    values are joined with commas like the apps' multiselects.
+    """
+    if preprocess is not None:
+        return prompt.format(**preprocess(**variables))
+    values = {k: ", ".join(map(str, v)) if isinstance(v, list) else v for k, v in variables.items()}
+    return prompt.format(**values)
+
+
+def _is_throttled(exc):
+    return _is_retryable(exc) or "Throttl" in type(exc).__name__ or "ThrottlingException" in str(exc)
+
+
+async def invoke_with_backoff(llm, prompt, max_retries=6, base_delay=1.0, max_delay=60.0):
+    """``llm.ainvoke`` with jittered exponential backoff on throttling; returns ``(text, retries)``."""
+    for attempt in range(max_retries + 1):
+        try:
+            return chunk_text(await llm.ainvoke(prompt)), attempt
+        except Exception as exc:
+            if attempt == max_retries or not _is_throttled(exc):
+                raise
+            delay = _retry_after(exc) or min(max_delay, base_delay * 2 ** attempt)
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+
+
+class _Progress:
+    def __init__(self, every):
+        self.every = every
+        self.start = self.last = time.perf_counter()
+        self.latencies = []
+        self.failed = 0
+        self.retries = 0
+
+    def stats(self):
+        seconds = time.perf_counter() - self.start
+        p50, p95, p99 = np.percentile(self.latencies, [50, 95, 99]) if self.latencies else (0.0, 0.0, 0.0)
+        return {"done": len(self.latencies), "failed": self.failed, "retries": self.retries,
+                "seconds": seconds, "per_second": len(self.latencies) / seconds if seconds else 0.0,
+                "p50": float(p50), "p95": float(p95), "p99": float(p99)}
+
+    def tick(self):
+        if time.perf_counter() - self.last >= self.every:
+            self.last = time.perf_counter()
+            logger.info("%(done)d done, %(failed)d failed, %(per_second).1f/s, "
+                        "p50 %(p50).2fs p95 %(p95).2fs", self.stats())
+
+
+async def arun_records(records, output, process, concurrency=8, progress_every=10.0):
+    """Run the coroutine ``process(variables)`` for every ``(id, variables)`` record.
+
+    ``process`` returns ``(fields, retries)``; ``fields`` are written to the
+    record's line of the JSONL file ``output`` along with its latency.
+    """
+    done = completed_ids(output)
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(concurrency))
+    progress = _Progress(progress_every)
+    skipped = 0
+
+    with open(output, "a", encoding="utf-8") as out, \
+            open(f"{os.path.splitext(output)[0]}.errors.jsonl", "a", encoding="utf-8") as errors:
+
+        async def run(record_id, variables):
+            start = time.perf_counter()
+            try:
+                fields, retries = await process(variables)
+            except Exception as exc:
+                progress.failed += 1
+                errors.write(json.dumps({"id": record_id, "input": variables, "error": repr(exc)}) + "\n")
+                errors.flush()
+                return
+            latency = time.perf_counter() - start
+            progress.latencies.append(latency)
+            progress.retries += retries
+            out.write(json.dumps({"id": record_id, "input": variables, **fields,
+                                  "latency": round(latency, 3)}, ensure_ascii=False) + "\n")
+            out.flush()
+            progress.tick()
+
+        pending = set()
+        try:
+            for record_id, variables in records:
+                if record_id in done:
+                    skipped += 1
+                    continue
+                if len(pending) >= concurrency:
+                    _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                pending.add(asyncio.ensure_future(run(record_id, variables)))
+        finally:
+            # Results in flight are still written if reading the records fails
+            if pending:
+                await asyncio.wait(pending)
+
+    return {**progress.stats(), "skipped": skipped}
+
+
+async def arun_batch(llm, prompt, records, output, concurrency=8, progress_every=10.0, preprocess=None,
+                     **retry_options):
+    """Generate one result per ``(id, variables)`` record into the JSONL file ``output``."""
+
+    async def generate(variables):
+        text, retries = await invoke_with_backoff(llm, render(prompt, variables, preprocess), **retry_options)
+        return {"output": text}, retries
+
+    return await arun_records(records, output, generate, concurrency, progress_every)
+
+
+def run_batch(llm, prompt, inputs, output, **kwargs):
+    """Blocking ``arun_batch`` over the JSONL file ``inputs``; returns the run's stats."""
+    return asyncio.run(arun_batch(llm, prompt, read_records(inputs), output, **kwargs))
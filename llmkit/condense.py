@@ -0,0 +1,114 @@
+"""History-aware retrieval that only rewrites the question when it has to.
+
+``create_history_aware_retriever(llm, retriever, prompt)`` sends the chat
+history and the question through ``llm`` on every turn with history, to
+turn a follow-up like "is it in stock?" into a standalone search query. That
+is a full model round trip before retrieval can even start, and most
+questions ("What is your return policy?") do not need it.
+
+``history_aware_retriever`` returns a drop-in replacement that:
+
+* passes the question to the retriever unchanged on the first turn, or when
+  ``is_follow_up`` finds nothing in it that refers back to the conversation
+  (pronouns like "it"/"those", openers like "what about", very short
+  questions);
+* otherwise rewrites it with ``llm`` and ``CONDENSE_PROMPT`` (a dedicated
+  prompt, not the QA prompt), so a small fast model can be used;
+* remembers rewrites per (chat history, question), so asking again over the
+  same history does not call the model.
+
+``QuestionRewriter.stats`` counts skipped, cached and rewritten questions.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+from langchain_core.messages import get_buffer_string
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnableLambda
+
+CONDENSE_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "Given the conversation and a follow-up question, rewrite the question so it can be "
+               "understood without the conversation. Keep product names, numbers and other specifics. "
+               "Do not answer it; reply with the question only."),
+    MessagesPlaceholder(variable_name="chat_history"),
+    ("human", "{input}"),
+])
+
+FOLLOW_UP = re.compile(
+    r"\b(it|its|it's|they|them|their|this|that|these|those|he|him|his|she|her|one|ones|same|"
+    r"also|too|else|other|another|above|previous|earlier|former|latter)\b",
+    re.IGNORECASE,
+)
+CONTINUATION = re.compile(r"^\s*(and|but|or|so|then|what about|how about|why|what else)\b", re.IGNORECASE)
+
+
+def is_follow_up(question, min_words=4):
+    """Whether ``question`` probably depends on earlier turns to make sense."""
+    return (len(question.split()) < min_words
+            or bool(CONTINUATION.search(question))
+            or bool(FOLLOW_UP.search(question)))
+
+
+class QuestionRewriter:
+    """Turns follow-up questions into standalone ones, skipping and caching where it can."""
+
+    def __init__(self, llm, prompt=CONDENSE_PROMPT, is_follow_up=is_follow_up, max_entries=1024):
+        self.chain = prompt | llm | StrOutputParser()
+        self.is_follow_up = is_follow_up
+        self.max_entries = max_entries
+        self.stats = {"skipped": 0, "cached": 0, "rewritten": 0}
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(history, question):
+        return hashlib.sha256(f"{get_buffer_string(history)}\0{question}".encode("utf-8")).hexdigest()
+
+    def _lookup(self, inputs):
+        """``(key, question)``: the question to use now, or a key to rewrite and store under."""
+        question, history = inputs["input"], inputs.get("chat_history") or []
+        with self._lock:
+            if not history or not self.is_follow_up(question):
+                self.stats["skipped"] += 1
+                return None, question
+            key = self.key(history, question)
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.stats["cached"] += 1
+                return None, self._cache[key]
+            return key, None
+
+    def _store(self, key, rewritten):
+        rewritten = rewritten.strip()
+        with self._lock:
+            self._cache[key] = rewritten
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+            self.stats["rewritten"] += 1
+        return rewritten
+
+    def rewrite(self, inputs):
+        key, question = self._lookup(inputs)
+        if key is None:
+            return question
+        return self._store(key, self.chain.invoke(inputs))
+
+    async def arewrite(self, inputs):
+        key, question = self._lookup(inputs)
+        if key is None:
+            return question
+        return self._store(key, await self.chain.ainvoke(inputs))
+
+
+def history_aware_retriever(llm, retriever, **kwargs):
+    """Drop-in for ``create_history_aware_retriever`` that rewrites only follow-up questions.
+
+    Takes ``{"input": ..., "chat_history": [...]}`` and returns documents.
+    ``llm`` is only used for rewrites, so pass a small fast model.
+    """
+    rewriter = QuestionRewriter(llm, **kwargs)
+    chain = RunnableLambda(rewriter.rewrite, afunc=rewriter.arewrite) | retriever
+    return chain.with_config(run_name="chat_retriever_chain")
@@ -0,0 +1,86 @@
+"""Token-budgeted packing of retrieved chunks for ``create_stuff_documents_chain``.
+
+The stuff chain pastes every retrieved chunk into the prompt verbatim. With
+``chunk_overlap`` the same text can appear twice, neighbouring chunks of one
+file are sent as separate fragments, and the prompt grows with ``k`` no
+matter how relevant the tail of the ranking is. ``pack_documents`` walks the
+chunks in relevance order and:
+
+* drops a chunk whose text is already contained in what was packed;
+* merges a chunk with an already packed piece of the same source when one
+  ends with the start of the other (the splitter's overlap), keeping the
+  shared text once;
+* adds chunks only while they fit in ``max_tokens``.
+
+``ContextPackingRetriever`` applies this to any retriever, so it slots in
+front of ``create_retrieval_chain`` or ``create_history_aware_retriever``
+without touching the QA chain.
+"""
+from typing import Any, Callable
+
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from llmkit.ingest import estimate_tokens
+
+
+def overlap(left, right, max_overlap=400, min_overlap=20):
+    """Length of the longest suffix of ``left`` that is a prefix of ``right``."""
+    for size in range(min(len(left), len(right), max_overlap), min_overlap - 1, -1):
+        if left.endswith(right[:size]):
+            return size
+    return 0
+
+
+def pack_documents(documents, max_tokens=600, count_tokens=estimate_tokens):
+    """Deduplicated, merged chunks that fit in ``max_tokens``, most relevant first."""
+    pieces = []
+    used = 0
+    for doc in documents:
+        text = doc.page_content
+        if any(text in piece.page_content for piece in pieces):
+            continue
+
+        source = doc.metadata.get("source")
+        merged = None
+        for piece in pieces:
+            if piece.metadata.get("source") != source:
+                continue
+            if size := overlap(piece.page_content, text):
+                merged = piece, piece.page_content + text[size:]
+            elif size := overlap(text, piece.page_content):
+                merged = piece, text + piece.page_content[size:]
+            if merged:
+                break
+
+        if merged:
+            piece, combined = merged
+            extra = count_tokens(combined) - count_tokens(piece.page_content)
+            if used + extra <= max_tokens:
+                piece.page_content = combined
+                used += extra
+        else:
+            tokens = count_tokens(text)
+            if used + tokens <= max_tokens:
+                pieces.append(Document(page_content=text, metadata=dict(doc.metadata)))
+                used += tokens
+    return pieces
+
+
+class ContextPackingRetriever(BaseRetriever):
+    """Retriever whose results are packed into a token budget by ``pack_documents``."""
+
+    retriever: Any
+    max_tokens: int = 600
+    count_tokens: Callable = estimate_tokens
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        return pack_documents(self.retriever.invoke(query), self.max_tokens, self.count_tokens)
+
+    async def _aget_relevant_documents(self, query, *, run_manager=None):
+        return pack_documents(await self.retriever.ainvoke(query), self.max_tokens, self.count_tokens)
+
+
+def packed_retriever(retriever, max_tokens=600, **kwargs):
+    """Wrap ``retriever`` so its chunks are deduplicated, merged and cut to ``max_tokens``."""
+    return ContextPackingRetriever(retriever=retriever, max_tokens=max_tokens, **kwargs)
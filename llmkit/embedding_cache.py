@@ -0,0 +1,184 @@
+"""Caching wrapper for LangChain embedding models.
+
+Vectors are keyed by the model name plus a hash of the whitespace-normalized
+text. Lookups go to an in-memory LRU first and then, when a ``path`` is
+given, to a SQLite file holding float32 blobs; only texts missing from both
+tiers are sent to the wrapped model, in one batched call.
+"""
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+def embedding_model_name(embeddings):
+    """Best-effort identifier of the model behind an embeddings object.
+
+    A reduced output size (OpenAI's ``dimensions``) is part of it, since it
+    changes every vector.
+    """
+    name = type(embeddings).__name__
+    for attr in ("model", "model_name", "model_id"):
+        value = getattr(embeddings, attr, None)
+        if isinstance(value, str) and value:
+            name = value
+            break
+    dimensions = getattr(embeddings, "dimensions", None)
+    return f"{name}:{dimensions}" if isinstance(dimensions, int) else name
+
+
+def _api_key_digest(embeddings):
+    api_key = getattr(embeddings, "openai_api_key", None) or getattr(embeddings, "api_key", None)
+    if hasattr(api_key, "get_secret_value"):
+        api_key = api_key.get_secret_value()
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest() if isinstance(api_key, str) else None
+
+
+def normalize_text(text):
+    return " ".join(text.split())
+
+
+class CachedEmbeddings(Embeddings):
+    """Two-tier (LRU + optional SQLite) cache in front of an embeddings model.
+
+    ``hits``, ``disk_hits`` and ``misses`` count per-text lookups; a disk
+    hit is also promoted into the LRU tier.
+    """
+
+    def __init__(self, underlying, path=None, maxsize=10000):
+        self.underlying = underlying
+        self.model = embedding_model_name(underlying)
+        self.maxsize = maxsize
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._db.commit()
+
+    def key(self, text):
+        digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{self.model}:{digest}"
+
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+        }
+
+    def _remember(self, key, vector):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def _load(self, keys):
+        """Return ``({key: vector}, keys found in memory)`` for both tiers."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+            in_memory = set(found)
+            missing = [k for k in keys if k not in found]
+            if self._db is not None and missing:
+                for start in range(0, len(missing), 500):
+                    batch = missing[start:start + 500]
+                    rows = self._db.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})",
+                        batch,
+                    ).fetchall()
+                    for key, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32).tolist()
+                        found[key] = vector
+                        self._remember(key, vector)
+        return found, in_memory
+
+    def _store(self, items):
+        with self._lock:
+            for key, vector in items:
+                self._remember(key, vector)
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [(k, np.asarray(v, dtype=np.float32).tobytes()) for k, v in items],
+                )
+                self._db.commit()
+
+    def _lookup(self, texts):
+        """Split ``texts`` into cached vectors and ``{key: text}`` still to embed."""
+        keys = [self.key(text) for text in texts]
+        found, in_memory = self._load(list(dict.fromkeys(keys)))
+
+        todo = {}
+        for key, text in zip(keys, texts):
+            if key in in_memory:
+                self.hits += 1
+            elif key in found:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+                todo.setdefault(key, text)
+        return keys, found, todo
+
+    def _finish(self, keys, found, todo, vectors):
+        computed = list(zip(todo.keys(), vectors))
+        if computed:
+            self._store(computed)
+            found.update(computed)
+        return [found[key] for key in keys]
+
+    def embed_documents(self, texts):
+        keys, found, todo = self._lookup(texts)
+        vectors = self.underlying.embed_documents(list(todo.values())) if todo else []
+        return self._finish(keys, found, todo, vectors)
+
+    async def aembed_documents(self, texts):
+        keys, found, todo = self._lookup(texts)
+        vectors = await self.underlying.aembed_documents(list(todo.values())) if todo else []
+        return self._finish(keys, found, todo, vectors)
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+    async def aembed_query(self, text):
+        return (await self.aembed_documents([text]))[0]
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def cached_embeddings(underlying, path=None, maxsize=10000):
+    """Process-wide ``CachedEmbeddings`` for a model, API key and path.
+
+    Call sites that build their own ``OpenAIEmbeddings`` still share one
+    LRU (and one SQLite connection) when they use the same model and key;
+    a different key gets its own instance, so its misses are billed to it.
+    """
+    key = (embedding_model_name(underlying), _api_key_digest(underlying), path)
+    with _shared_lock:
+        if key not in _shared:
+            _shared[key] = CachedEmbeddings(underlying, path=path, maxsize=maxsize)
+        return _shared[key]
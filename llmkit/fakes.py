@@ -0,0 +1,294 @@
+"""Offline stand-ins for the OpenAI models, used by the benchmarks.
+
+They never reach a real provider, but they sleep to simulate the round-trip
+of an API call so timings are comparable to a live run. ``StubOpenAIServer``
+goes one step further and speaks the OpenAI HTTP API on localhost.
+"""
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from llmkit.ingest import estimate_tokens
+
+
+class FakeEmbeddings(Embeddings):
+    """Deterministic embeddings with a simulated per-call latency.
+
+    Each call to ``embed_documents``/``embed_query`` sleeps for
+    ``latency + per_text_latency * len(texts)`` seconds. ``calls`` and
+    ``texts_embedded`` count the work done so benchmarks can report how
+    many API requests a run would have cost.
+    """
+
+    def __init__(self, size=256, latency=0.05, per_text_latency=0.001, model="fake-embedding"):
+        self.size = size
+        self.latency = latency
+        self.per_text_latency = per_text_latency
+        self.model = model
+        self.calls = 0
+        self.texts_embedded = 0
+
+    def _vector(self, text):
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+        vector = np.random.default_rng(seed).standard_normal(self.size)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        self.texts_embedded += len(texts)
+        time.sleep(self.latency + self.per_text_latency * len(texts))
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts):
+        self.calls += 1
+        self.texts_embedded += len(texts)
+        await asyncio.sleep(self.latency + self.per_text_latency * len(texts))
+        return [self._vector(text) for text in texts]
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that streams canned replies with realistic pacing.
+
+    The first token arrives after ``first_token_latency`` seconds plus
+    ``prompt_token_latency`` per estimated prompt token (prefill), and each
+    following token ``token_latency`` seconds later. Replies cycle through
+    ``responses``; a token is one word plus its trailing whitespace.
+    ``prompt_tokens`` records the prompt size of every call.
+    """
+
+    responses: list = ["This is a fake reply from a streaming chat model."]
+    first_token_latency: float = 0.3
+    token_latency: float = 0.02
+    prompt_token_latency: float = 0.0
+    model_name: str = "fake-chat"
+    calls: int = 0
+    prompt_tokens: list = []
+
+    @property
+    def _llm_type(self):
+        return "fake-chat"
+
+    def _next_response(self, messages):
+        response = self.responses[self.calls % len(self.responses)]
+        self.calls += 1
+        self.prompt_tokens.append(sum(estimate_tokens(str(m.content)) for m in messages))
+        return response
+
+    def _first_token_latency(self):
+        return self.first_token_latency + self.prompt_token_latency * self.prompt_tokens[-1]
+
+    @staticmethod
+    def _tokens(text):
+        tokens, start = [], 0
+        for i in range(1, len(text)):
+            if text[i - 1].isspace() and not text[i].isspace():
+                tokens.append(text[start:i])
+                start = i
+        tokens.append(text[start:])
+        return tokens
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        text = "".join(chunk.message.content for chunk in self._stream(messages, stop, run_manager))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        for i, token in enumerate(self._tokens(self._next_response(messages))):
+            time.sleep(self._first_token_latency() if i == 0 else self.token_latency)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        chunks = [chunk async for chunk in self._astream(messages, stop, run_manager)]
+        text = "".join(chunk.message.content for chunk in chunks)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        for i, token in enumerate(self._tokens(self._next_response(messages))):
+            await asyncio.sleep(self._first_token_latency() if i == 0 else self.token_latency)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+
+def schema_instance(schema, defs=None):
+    """Smallest JSON value that is valid against the JSON ``schema`` (as Pydantic emits it)."""
+    defs = defs if defs is not None else schema.get("$defs", {})
+    if "$ref" in schema:
+        return schema_instance(defs[schema["$ref"].rsplit("/", 1)[-1]], defs)
+    if "default" in schema:
+        return schema["default"]
+    if "anyOf" in schema:
+        return schema_instance(schema["anyOf"][0], defs)
+    if "enum" in schema:
+        return schema["enum"][0]
+    kind = schema.get("type", "object")
+    if kind == "object":
+        properties = schema.get("properties", {})
+        return {name: schema_instance(properties[name], defs) for name in schema.get("required", [])}
+    return {"array": [], "string": "stub", "integer": 0, "number": 0.0, "boolean": True, "null": None}[kind]
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default listen backlog of 5 drops connections under a burst of clients
+    request_queue_size = 1024
+
+
+class StubOpenAIServer:
+    """Local OpenAI-compatible HTTP server for load tests.
+
+    Serves ``POST /v1/embeddings`` with deterministic vectors and
+    ``POST /v1/chat/completions`` (plain or ``stream``-ed as server-sent
+    events) with a reply echoing the last message, or the smallest valid
+    object when a JSON-schema ``response_format`` is set, after ``latency``
+    seconds. When more than ``max_in_flight`` requests are being served at
+    once, extra requests get a 429 with a ``Retry-After`` header, like a
+    provider enforcing a concurrency limit. Use as a context manager;
+    ``base_url`` is what to pass to the OpenAI client.
+    """
+
+    def __init__(self, latency=0.05, size=256, max_in_flight=None):
+        self.latency = latency
+        self.max_in_flight = max_in_flight
+        self.requests = 0
+        self.rejected = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._embeddings = FakeEmbeddings(size=size, latency=0, per_text_latency=0)
+        self._server = _Server(("127.0.0.1", 0), self._handler())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/v1"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _admit(self):
+        with self._lock:
+            self.requests += 1
+            if self.max_in_flight is not None and self._in_flight >= self.max_in_flight:
+                self.rejected += 1
+                return False
+            self._in_flight += 1
+            return True
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    def _handle_embeddings(self, body):
+        inputs = body["input"]
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        vectors = self._embeddings.embed_documents([str(i) for i in inputs])
+        return {
+            "object": "list",
+            "model": body.get("model", "stub"),
+            "data": [{"object": "embedding", "index": i, "embedding": v} for i, v in enumerate(vectors)],
+            "usage": {"prompt_tokens": 0, "total_tokens": 0},
+        }
+
+    @staticmethod
+    def _reply(body):
+        response_format = body.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            return json.dumps(schema_instance(response_format["json_schema"]["schema"]))
+        last = body["messages"][-1]["content"] if body.get("messages") else ""
+        return f"Stub reply to: {str(last)[:200]}"
+
+    def _handle_chat(self, body):
+        reply = self._reply(body)
+        tokens = estimate_tokens(reply)
+        return {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": reply},
+                         "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": tokens, "total_tokens": tokens},
+        }
+
+    def _chat_chunks(self, body):
+        words = self._reply(body).split(" ")
+        for i, word in enumerate(words):
+            delta = {"content": word if i == len(words) - 1 else word + " "}
+            if i == 0:
+                delta["role"] = "assistant"
+            yield {"id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": int(time.time()),
+                   "model": body.get("model", "stub"),
+                   "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+        yield {"id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": int(time.time()),
+               "model": body.get("model", "stub"),
+               "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, payload, headers=()):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_events(self, events):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                for event in events:
+                    self.wfile.write(b"data: " + json.dumps(event).encode("utf-8") + b"\n\n")
+                    self.wfile.flush()
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.close_connection = True
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                route = self.path.rstrip("/").rsplit("/", 1)[-1]
+                if route not in ("embeddings", "completions"):
+                    self._send(404, {"error": {"message": f"unknown route {self.path}"}})
+                    return
+                if not stub._admit():
+                    self._send(429, {"error": {"message": "rate limited", "type": "rate_limit"}},
+                               headers=[("Retry-After", "0.1")])
+                    return
+                try:
+                    time.sleep(stub.latency)
+                    if route == "embeddings":
+                        self._send(200, stub._handle_embeddings(body))
+                    elif body.get("stream"):
+                        self._send_events(stub._chat_chunks(body))
+                    else:
+                        self._send(200, stub._handle_chat(body))
+                finally:
+                    stub._release()
+
+        return Handler
@@ -0,0 +1,403 @@
+"""Shared, async-first gateway for OpenAI-compatible chat completion APIs.
+
+Every ``ChatOpenAI``/``ChatOllama`` built by an app opens its own HTTP
+connections, retries on its own schedule and knows nothing about the other
+requests the process is making. ``LLMGateway`` is one per process and owns,
+for every provider base URL:
+
+* a pooled ``httpx.AsyncClient`` (at most ``max_connections`` sockets);
+* a token bucket allowing ``requests_per_second`` with bursts of ``burst``,
+  which halves its rate on every 429/5xx and creeps back up on success;
+* retries of 429/5xx answers and of dropped or timed-out connections, with
+  jittered exponential backoff honouring ``Retry-After``;
+* single-flight deduplication: identical non-streaming requests that are in
+  flight at the same time share one upstream call.
+
+The gateway runs its own event loop on a daemon thread, so synchronous
+callers (Streamlit scripts, ``chain.invoke``) and coroutines on any other
+loop share the same connections and limits. ``GatewayChatModel`` is the
+LangChain chat model on top of it; ``chat_model(model, provider=...)``
+builds one on the process-wide gateway.
+
+Providers are OpenAI-compatible endpoints: ``"openai"`` (``OPENAI_API_KEY``,
+``OPENAI_BASE_URL``) and ``"ollama"`` (its ``/v1`` API); pass ``base_url``
+for anything else that speaks the same protocol.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import queue
+import random
+import threading
+import time
+from typing import Any, Optional
+
+import httpx
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, convert_to_openai_messages
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+PROVIDERS = {
+    "openai": ("OPENAI_BASE_URL", "https://api.openai.com/v1", "OPENAI_API_KEY"),
+    "ollama": ("OLLAMA_BASE_URL", "http://localhost:11434/v1", None),
+}
+
+RETRYABLE = (429, 500, 502, 503, 504)
+# Failures before a complete answer arrived, which a new connection may not hit
+RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.ReadTimeout, httpx.RemoteProtocolError)
+
+
+def provider_endpoint(provider, base_url=None, api_key=None):
+    """``(base_url, api_key)`` for ``provider``, filling gaps from the environment."""
+    url_env, default_url, key_env = PROVIDERS[provider]
+    base_url = base_url or os.getenv(url_env) or default_url
+    if api_key is None and key_env:
+        api_key = os.getenv(key_env)
+    return base_url.rstrip("/"), api_key
+
+
+class TokenBucket:
+    """Async token bucket whose rate adapts to the provider's answers.
+
+    ``slow_down`` halves the rate (down to ``min_rate``) when the provider
+    pushes back; ``speed_up`` adds ``increase`` per success up to
+    ``max_rate``.
+    """
+
+    def __init__(self, rate, burst=None, min_rate=1.0, increase=0.5):
+        self.max_rate = self.rate = float(rate)
+        self.burst = float(burst or rate)
+        self.min_rate = min_rate
+        self.increase = increase
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    def slow_down(self):
+        self._refill()
+        self.rate = max(self.min_rate, self.rate / 2)
+
+    def speed_up(self):
+        self._refill()
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+
+class LLMGateway:
+    """Pooled, rate-limited, deduplicating client for chat completion endpoints."""
+
+    def __init__(self, max_connections=100, requests_per_second=50, burst=None, max_retries=6,
+                 base_delay=0.5, max_delay=30.0, timeout=120.0):
+        self.max_connections = max_connections
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.stats = {"requests": 0, "upstream": 0, "coalesced": 0, "retries": 0, "errors": 0}
+        self._clients = {}
+        self._buckets = {}
+        self._in_flight = {}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="llm-gateway", daemon=True)
+        self._thread.start()
+
+    def _client(self, base_url):
+        if base_url not in self._clients:
+            limits = httpx.Limits(max_connections=self.max_connections,
+                                  max_keepalive_connections=self.max_connections)
+            self._clients[base_url] = httpx.AsyncClient(base_url=base_url, limits=limits,
+                                                        timeout=self.timeout)
+            self._buckets[base_url] = TokenBucket(self.requests_per_second, self.burst)
+        return self._clients[base_url], self._buckets[base_url]
+
+    @staticmethod
+    def _headers(api_key):
+        return {"Authorization": f"Bearer {api_key}"} if api_key else {}
+
+    @staticmethod
+    def key(base_url, api_key, payload):
+        blob = json.dumps([base_url, api_key, payload], sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    async def _backoff(self, bucket, attempt, response=None):
+        bucket.slow_down()
+        self.stats["retries"] += 1
+        try:
+            delay = float(response.headers.get("retry-after"))
+        except (AttributeError, TypeError, ValueError):
+            delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+
+    async def _post(self, base_url, api_key, payload):
+        client, bucket = self._client(base_url)
+        for attempt in range(self.max_retries + 1):
+            await bucket.acquire()
+            self.stats["upstream"] += 1
+            try:
+                response = await client.post("/chat/completions", json=payload, headers=self._headers(api_key))
+            except RETRYABLE_ERRORS:
+                if attempt == self.max_retries:
+                    raise
+                await self._backoff(bucket, attempt)
+                continue
+            if response.status_code in RETRYABLE and attempt < self.max_retries:
+                await self._backoff(bucket, attempt, response)
+                continue
+            response.raise_for_status()
+            bucket.speed_up()
+            return response.json()
+
+    async def _complete(self, base_url, api_key, payload):
+        self.stats["requests"] += 1
+        key = self.key(base_url, api_key, payload)
+        if key in self._in_flight:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(self._in_flight[key])
+        future = self._loop.create_future()
+        self._in_flight[key] = future
+        try:
+            result = await self._post(base_url, api_key, payload)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            self.stats["errors"] += 1
+            future.set_exception(exc)
+            # Waiters re-raise it; this keeps asyncio from logging it as never retrieved
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    async def _stream(self, base_url, api_key, payload, put):
+        """Send each streamed chunk to ``put``; retries only before the first byte."""
+        self.stats["requests"] += 1
+        client, bucket = self._client(base_url)
+        payload = {**payload, "stream": True}
+        for attempt in range(self.max_retries + 1):
+            await bucket.acquire()
+            self.stats["upstream"] += 1
+            sent = False
+            try:
+                async with client.stream("POST", "/chat/completions", json=payload,
+                                         headers=self._headers(api_key)) as response:
+                    if response.status_code in RETRYABLE and attempt < self.max_retries:
+                        await response.aread()
+                        await self._backoff(bucket, attempt, response)
+                        continue
+                    if response.is_error:
+                        await response.aread()
+                        response.raise_for_status()
+                    bucket.speed_up()
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[len("data:"):].strip()
+                        if data == "[DONE]":
+                            break
+                        put(json.loads(data))
+                        sent = True
+                    return
+            except RETRYABLE_ERRORS:
+                # Chunks already handed to the caller cannot be taken back
+                if sent or attempt == self.max_retries:
+                    raise
+            await self._backoff(bucket, attempt)
+
+    def complete(self, base_url, api_key, payload):
+        """Blocking chat completion; returns the response JSON."""
+        return asyncio.run_coroutine_threadsafe(self._complete(base_url, api_key, payload), self._loop).result()
+
+    async def acomplete(self, base_url, api_key, payload):
+        future = asyncio.run_coroutine_threadsafe(self._complete(base_url, api_key, payload), self._loop)
+        return await asyncio.wrap_future(future)
+
+    def stream(self, base_url, api_key, payload):
+        """Blocking iterator over streamed completion chunks."""
+        chunks = queue.Queue()
+        done = object()
+
+        async def run():
+            try:
+                await self._stream(base_url, api_key, payload, chunks.put)
+            finally:
+                chunks.put(done)
+
+        future = asyncio.run_coroutine_threadsafe(run(), self._loop)
+        try:
+            while (chunk := chunks.get()) is not done:
+                yield chunk
+            future.result()
+        finally:
+            future.cancel()
+
+    async def astream(self, base_url, api_key, payload):
+        loop = asyncio.get_running_loop()
+        chunks = asyncio.Queue()
+        done = object()
+
+        def put(chunk):
+            loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+
+        async def run():
+            try:
+                await self._stream(base_url, api_key, payload, put)
+            finally:
+                put(done)
+
+        future = asyncio.run_coroutine_threadsafe(run(), self._loop)
+        try:
+            while (chunk := await chunks.get()) is not done:
+                yield chunk
+            await asyncio.wrap_future(future)
+        finally:
+            future.cancel()
+
+    def close(self):
+        """Close the pooled connections and stop the gateway's event loop."""
+        async def aclose():
+            for client in self._clients.values():
+                await client.aclose()
+            self._clients.clear()
+
+        asyncio.run_coroutine_threadsafe(aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def default_gateway():
+    """The process-wide gateway, created on first use."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway()
+        return _gateway
+
+
+def _openai_parameters(payload):
+    """Adjust ``payload`` to what current OpenAI models accept, as ``ChatOpenAI`` does.
+
+    ``max_tokens`` is deprecated in favour of ``max_completion_tokens``, which
+    gpt-5 and o-series models require, and gpt-5 models other than
+    gpt-5-chat only accept the default temperature.
+    """
+    if "max_tokens" in payload:
+        payload["max_completion_tokens"] = payload.pop("max_tokens")
+    model = payload.get("model") or ""
+    if model.startswith("gpt-5") and "chat" not in model and payload.get("temperature") not in (None, 1):
+        del payload["temperature"]
+
+
+class GatewayChatModel(BaseChatModel):
+    """Chat model that sends its requests through an ``LLMGateway``.
+
+    ``model_kwargs`` are added to the request body as they are (``top_k``,
+    ``seed``, ``response_format``, ...).
+    """
+
+    model_name: str
+    provider: str = "openai"
+    base_url: Optional[str] = None
+    api_key: Optional[str] = None
+    temperature: Optional[float] = None
+    top_p: Optional[float] = None
+    max_tokens: Optional[int] = None
+    model_kwargs: dict = {}
+    gateway: Any = None
+
+    @property
+    def _llm_type(self):
+        return "gateway-chat"
+
+    @property
+    def _identifying_params(self):
+        return {"model_name": self.model_name, "provider": self.provider, "base_url": self.base_url,
+                "temperature": self.temperature, "top_p": self.top_p, "max_tokens": self.max_tokens,
+                **self.model_kwargs}
+
+    def _request(self, messages, stop, kwargs):
+        base_url, api_key = provider_endpoint(self.provider, self.base_url, self.api_key)
+        payload = {"model": self.model_name, "messages": convert_to_openai_messages(messages)}
+        for name in ("temperature", "top_p", "max_tokens"):
+            if getattr(self, name) is not None:
+                payload[name] = getattr(self, name)
+        if stop:
+            payload["stop"] = stop
+        payload.update(self.model_kwargs)
+        payload.update(kwargs)
+        if self.provider == "openai":
+            _openai_parameters(payload)
+        return (self.gateway or default_gateway()), base_url, api_key, payload
+
+    @staticmethod
+    def _result(response):
+        choice = response["choices"][0]
+        usage = response.get("usage") or {}
+        message = AIMessage(
+            content=choice["message"].get("content") or "",
+            response_metadata={"model_name": response.get("model"), "finish_reason": choice.get("finish_reason")},
+            usage_metadata={"input_tokens": usage.get("prompt_tokens", 0),
+                            "output_tokens": usage.get("completion_tokens", 0),
+                            "total_tokens": usage.get("total_tokens", 0)} if usage else None,
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)],
+                          llm_output={"token_usage": usage, "model_name": response.get("model")})
+
+    @staticmethod
+    def _chunk(data):
+        if not data.get("choices"):
+            return None
+        choice = data["choices"][0]
+        metadata = {"finish_reason": choice["finish_reason"]} if choice.get("finish_reason") else {}
+        return ChatGenerationChunk(message=AIMessageChunk(content=choice.get("delta", {}).get("content") or "",
+                                                          response_metadata=metadata))
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        gateway, base_url, api_key, payload = self._request(messages, stop, kwargs)
+        return self._result(gateway.complete(base_url, api_key, payload))
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        gateway, base_url, api_key, payload = self._request(messages, stop, kwargs)
+        return self._result(await gateway.acomplete(base_url, api_key, payload))
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        gateway, base_url, api_key, payload = self._request(messages, stop, kwargs)
+        for data in gateway.stream(base_url, api_key, payload):
+            if chunk := self._chunk(data):
+                yield chunk
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        gateway, base_url, api_key, payload = self._request(messages, stop, kwargs)
+        async for data in gateway.astream(base_url, api_key, payload):
+            if chunk := self._chunk(data):
+                yield chunk
+
+
+FIELDS = ("base_url", "api_key", "temperature", "top_p", "max_tokens", "gateway")
+
+
+def chat_model(model, provider="openai", **kwargs):
+    """``GatewayChatModel`` for ``model``; unknown keyword arguments go to ``model_kwargs``."""
+    fields = {name: kwargs.pop(name) for name in FIELDS if name in kwargs}
+    return GatewayChatModel(model_name=model, provider=provider, model_kwargs=kwargs, **fields)
@@ -0,0 +1,101 @@
+"""Chat history with a bounded prompt footprint.
+
+Feeding a plain ``ChatMessageHistory`` into ``MessagesPlaceholder`` sends
+the whole conversation on every turn, so prompt size and latency grow with
+the length of the chat. ``SummaryBufferHistory`` wraps any history store
+(in-memory, ``StreamlitChatMessageHistory``, ...) and keeps only:
+
+* a window of the most recent messages that fits in ``max_tokens``, and
+* a running summary of everything older, stored as one system message at
+  the head of the window.
+
+When the window overflows, the oldest messages are folded into the summary
+with a single model call, and the window is trimmed to ``trim_to`` tokens
+so the next overflow (and summary call) is several turns away. The summary
+itself is asked to stay under ``summary_words`` words, so the prompt stays
+roughly constant however long the chat goes on.
+"""
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import SystemMessage, get_buffer_string
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import PromptTemplate
+
+from llmkit.ingest import estimate_tokens
+
+SUMMARY_ID = "running-summary"
+SUMMARY_PREFIX = "Summary of the earlier conversation: "
+
+SUMMARY_PROMPT = PromptTemplate.from_template(
+    "Progressively summarize the conversation, adding onto the previous summary. "
+    "Keep names, numbers, decisions and open questions. "
+    "Use at most {summary_words} words.\n\n"
+    "Previous summary:\n{summary}\n\n"
+    "New lines of conversation:\n{new_lines}\n\n"
+    "New summary:"
+)
+
+
+def message_tokens(messages, count_tokens=estimate_tokens):
+    return sum(count_tokens(str(m.content)) for m in messages)
+
+
+class SummaryBufferHistory(BaseChatMessageHistory):
+    """Token-budgeted window of recent messages plus a running summary of older ones.
+
+    All state lives in ``store``, so wrapping a ``StreamlitChatMessageHistory``
+    keeps the summary per session and across reruns.
+    """
+
+    def __init__(self, store, llm, max_tokens=1000, trim_to=None, summary_words=150,
+                 count_tokens=estimate_tokens, prompt=SUMMARY_PROMPT):
+        self.store = store
+        self.max_tokens = max_tokens
+        self.trim_to = trim_to if trim_to is not None else max_tokens // 2
+        self.summary_words = summary_words
+        self.count_tokens = count_tokens
+        self.summarizer = prompt | llm | StrOutputParser()
+
+    @property
+    def messages(self):
+        return self.store.messages
+
+    @property
+    def summary(self):
+        return self._split()[0]
+
+    def _split(self):
+        """``(summary text, recent messages)`` as currently held by the store."""
+        messages = self.store.messages
+        if messages and messages[0].id == SUMMARY_ID:
+            return messages[0].content[len(SUMMARY_PREFIX):], list(messages[1:])
+        return "", list(messages)
+
+    def add_messages(self, messages):
+        self.store.add_messages(messages)
+        summary, window = self._split()
+        if message_tokens(window, self.count_tokens) <= self.max_tokens:
+            return
+
+        # Evict whole messages from the front until the window fits in trim_to,
+        # always keeping the newest exchange verbatim.
+        evicted = []
+        while len(window) > 2 and message_tokens(window, self.count_tokens) > self.trim_to:
+            evicted.append(window.pop(0))
+        if not evicted:
+            return
+
+        summary = self.summarizer.invoke({
+            "summary": summary or "(none)",
+            "new_lines": get_buffer_string(evicted),
+            "summary_words": self.summary_words,
+        })
+        messages = [SystemMessage(content=SUMMARY_PREFIX + summary, id=SUMMARY_ID)] + window
+        if hasattr(self.store, "replace_messages"):
+            # One transaction, so a crash cannot leave the session empty
+            self.store.replace_messages(messages)
+        else:
+            self.store.clear()
+            self.store.add_messages(messages)
+
+    def clear(self):
+        self.store.clear()
@@ -0,0 +1,114 @@
+"""Hybrid lexical + dense retrieval fused with reciprocal rank fusion.
+
+Dense retrieval finds paraphrases but often misses exact identifiers such
+as product names, model numbers or SKUs, which BM25 matches trivially.
+``HybridRetriever`` runs a vector retriever and an in-memory ``BM25Index``
+concurrently and merges the two rankings with reciprocal rank fusion
+(score ``sum(1 / (rrf_k + rank))``), which needs no score calibration
+between the two sides.
+
+``BM25Index`` stores one posting list per term as two compact NumPy arrays
+(chunk numbers and precomputed BM25 weights), so a query is a handful of
+``np.add.at`` calls over short arrays: microseconds for the demo corpora and
+about a millisecond for tens of thousands of chunks.
+"""
+import asyncio
+import math
+import re
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import numpy as np
+from langchain_core.retrievers import BaseRetriever
+
+# Words and identifiers such as "xyz-200", "4000mah" or "sku_123"
+TOKEN = re.compile(r"[a-z0-9]+(?:[-_.][a-z0-9]+)*")
+
+_pool = ThreadPoolExecutor(max_workers=4)
+
+
+def tokenize(text):
+    return TOKEN.findall(text.lower())
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed list of documents."""
+
+    def __init__(self, documents, k1=1.5, b=0.75):
+        self.documents = list(documents)
+        counts = [Counter(tokenize(doc.page_content)) for doc in self.documents]
+        lengths = np.array([sum(c.values()) for c in counts], dtype=np.float32)
+        avg_length = float(lengths.mean()) if len(lengths) else 0.0
+
+        postings = defaultdict(lambda: ([], []))
+        for number, count in enumerate(counts):
+            for term, tf in count.items():
+                postings[term][0].append(number)
+                postings[term][1].append(tf)
+
+        n = len(self.documents)
+        self._postings = {}
+        for term, (numbers, tfs) in postings.items():
+            numbers = np.array(numbers, dtype=np.int32)
+            tfs = np.array(tfs, dtype=np.float32)
+            idf = math.log(1 + (n - len(numbers) + 0.5) / (len(numbers) + 0.5))
+            norm = k1 * (1 - b + b * lengths[numbers] / (avg_length or 1.0))
+            self._postings[term] = (numbers, (idf * tfs * (k1 + 1) / (tfs + norm)).astype(np.float32))
+
+    def search(self, query, k=10):
+        """Up to ``k`` ``(document, score)`` pairs that share a term with ``query``, best first."""
+        scores = np.zeros(len(self.documents), dtype=np.float32)
+        for term in set(tokenize(query)):
+            if term in self._postings:
+                numbers, weights = self._postings[term]
+                np.add.at(scores, numbers, weights)
+        matched = np.flatnonzero(scores)
+        if len(matched) > k:
+            matched = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+        matched = matched[np.argsort(-scores[matched])]
+        return [(self.documents[i], float(scores[i])) for i in matched]
+
+
+def reciprocal_rank_fusion(rankings, k, rrf_k=60):
+    """Merge ranked document lists; the same chunk is recognised by its text.
+
+    Ids are not used: chunks read back from a vector store carry their
+    store ids while the split chunks given to ``BM25Index`` usually have none.
+    """
+    scores, docs = defaultdict(float), {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking):
+            scores[doc.page_content] += 1.0 / (rrf_k + rank + 1)
+            docs.setdefault(doc.page_content, doc)
+    best = sorted(scores, key=scores.get, reverse=True)[:k]
+    return [docs[key] for key in best]
+
+
+class HybridRetriever(BaseRetriever):
+    """``k`` documents fused from ``fetch_k`` dense and ``fetch_k`` BM25 results."""
+
+    vector_retriever: Any
+    bm25: Any
+    k: int = 3
+    fetch_k: int = 10
+    rrf_k: int = 60
+
+    def _lexical(self, query):
+        return [doc for doc, _ in self.bm25.search(query, self.fetch_k)]
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        dense = _pool.submit(self.vector_retriever.invoke, query)
+        lexical = self._lexical(query)
+        return reciprocal_rank_fusion([dense.result(), lexical], self.k, self.rrf_k)
+
+    async def _aget_relevant_documents(self, query, *, run_manager=None):
+        dense, lexical = await asyncio.gather(self.vector_retriever.ainvoke(query),
+                                              asyncio.to_thread(self._lexical, query))
+        return reciprocal_rank_fusion([dense, lexical], self.k, self.rrf_k)
+
+
+def hybrid_retriever(vector_store, documents, k=3, fetch_k=10, **kwargs):
+    """Hybrid retriever over ``vector_store`` and a BM25 index of the same ``documents``."""
+    return HybridRetriever(vector_retriever=vector_store.as_retriever(search_kwargs={"k": fetch_k}),
+                           bm25=BM25Index(documents), k=k, fetch_k=fetch_k, **kwargs)
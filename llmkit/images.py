@@ -0,0 +1,131 @@
+"""Image payloads for the vision apps, sized for the requested detail level.
+
+The apps used to base64-encode the uploaded file as is, on every request and
+every Streamlit rerun: a 12-megapixel phone photo is 4-5 MB of JPEG, about
+6 MB of base64, although with ``"detail": "low"`` the model only ever sees a
+512x512 version of it. ``encode_image`` instead
+
+* decodes the image (with JPEG draft mode, so large photos are decoded at a
+  fraction of their size), applies the EXIF orientation and downsizes it to
+  what the detail level uses: 512 px on the long side for ``low``; for
+  ``high``/``auto``, 2048 px on the long side and 768 px on the short side;
+* re-encodes it as a JPEG without EXIF, GPS or other metadata;
+* caches the base64 payload by the SHA-256 of the original bytes and the
+  detail level, so reruns and repeated requests reuse it.
+
+The payload is always a JPEG, so it matches the ``data:image/jpeg`` URLs in
+the prompts even when a PNG was uploaded.
+"""
+import base64
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+
+from PIL import Image, ImageOps
+
+LOW_DETAIL_SIZE = 512
+HIGH_DETAIL_LONG_SIDE = 2048
+HIGH_DETAIL_SHORT_SIDE = 768
+
+
+def target_size(width, height, detail="low"):
+    """Largest size the model uses for a ``width`` x ``height`` image at ``detail``."""
+    if detail == "low":
+        scale = min(1.0, LOW_DETAIL_SIZE / max(width, height))
+    else:
+        scale = min(1.0, HIGH_DETAIL_LONG_SIDE / max(width, height))
+        scale *= min(1.0, HIGH_DETAIL_SHORT_SIDE / (min(width, height) * scale))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def read_image_bytes(source):
+    """Bytes of ``source``: bytes, a path, or a file-like object such as a Streamlit upload."""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return f.read()
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    return source.read()
+
+
+def prepare_image(data, detail="low", quality=85):
+    """JPEG bytes of image ``data`` downsized for ``detail``, without metadata."""
+    with Image.open(io.BytesIO(data)) as image:
+        size = target_size(*image.size, detail=detail)
+        if image.format == "JPEG":
+            # Let libjpeg decode at 1/2, 1/4 or 1/8 scale when that is still large enough
+            image.draft("RGB", size)
+        image = ImageOps.exif_transpose(image)
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, "white")
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        elif image.mode != "RGB":
+            image = image.convert("RGB")
+        size = target_size(*image.size, detail=detail)
+        if size != image.size:
+            image = image.resize(size, Image.Resampling.LANCZOS)
+        out = io.BytesIO()
+        # No exif/icc_profile arguments: the re-encoded image carries no metadata
+        image.save(out, "JPEG", quality=quality, optimize=True)
+    return out.getvalue()
+
+
+def encode_file(path, detail="low"):
+    """Base64 of ``prepare_image`` for the file at ``path``; picklable for worker processes."""
+    with open(path, "rb") as f:
+        return base64.b64encode(prepare_image(f.read(), detail)).decode()
+
+
+class EncodedImageCache:
+    """LRU of base64 payloads keyed by content hash and detail level, bounded in bytes.
+
+    Streamlit reruns and repeated requests with the same upload find its
+    payload here instead of decoding and re-encoding the image again.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0}
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(data, detail):
+        return f"{detail}:{hashlib.sha256(data).hexdigest()}"
+
+    def get(self, data, detail="low"):
+        key = self.key(data, detail)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._entries[key]
+        encoded = base64.b64encode(prepare_image(data, detail)).decode()
+        with self._lock:
+            self.stats["misses"] += 1
+            if key not in self._entries:
+                self._entries[key] = encoded
+                self._size += len(encoded)
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+        return encoded
+
+
+_cache = EncodedImageCache()
+
+
+def encode_image(source, detail="low", cache=None):
+    """Base64 JPEG of ``source`` (bytes, path or upload) sized for ``detail``, cached."""
+    return (cache or _cache).get(read_image_bytes(source), detail)
+
+
+def image_data_url(source, detail="low", cache=None):
+    return f"data:image/jpeg;base64,{encode_image(source, detail, cache)}"
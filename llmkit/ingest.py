@@ -0,0 +1,209 @@
+"""Batched, concurrent embedding pipeline for loading chunks into a vector store.
+
+Chunks are consumed lazily, grouped into batches bounded by an estimated
+token budget and a maximum item count, embedded concurrently (at most
+``concurrency`` requests in flight) and written to the store as each batch
+completes. Rate-limit and timeout errors are retried with exponential
+backoff, honouring ``Retry-After`` when the provider sends one.
+
+Batches are written with the store's public ``add_texts``. To keep it from
+embedding them a second time, build the store with its embeddings wrapped
+in ``PrecomputedEmbeddings``, which hands it the vectors already computed.
+"""
+import asyncio
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from langchain_core.embeddings import Embeddings
+
+from llmkit.embedding_cache import embedding_model_name
+
+DEFAULT_BATCH_TOKENS = 8000
+DEFAULT_BATCH_SIZE = 256
+
+
+def estimate_tokens(text):
+    """Rough token count (about four characters per token for English)."""
+    return max(1, len(text) // 4)
+
+
+def iter_chunks(documents, splitter):
+    """Split ``documents`` one at a time so the corpus is never fully in memory."""
+    for document in documents:
+        yield from splitter.split_documents([document])
+
+
+def token_batches(items, batch_tokens=DEFAULT_BATCH_TOKENS, batch_size=DEFAULT_BATCH_SIZE,
+                  count_tokens=estimate_tokens):
+    """Group ``(id, document)`` pairs into batches under both limits.
+
+    A single chunk larger than ``batch_tokens`` still gets a batch of its own.
+    """
+    batch, tokens = [], 0
+    for item in items:
+        cost = count_tokens(item[1].page_content)
+        if batch and (tokens + cost > batch_tokens or len(batch) >= batch_size):
+            yield batch
+            batch, tokens = [], 0
+        batch.append(item)
+        tokens += cost
+    if batch:
+        yield batch
+
+
+def _is_retryable(exc):
+    if getattr(exc, "status_code", None) in (429, 500, 502, 503, 504):
+        return True
+    name = type(exc).__name__
+    return "RateLimit" in name or "Timeout" in name or isinstance(exc, asyncio.TimeoutError)
+
+
+def _retry_after(exc):
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+async def embed_with_backoff(embeddings, texts, max_retries=6, base_delay=0.5, max_delay=30.0):
+    """``aembed_documents`` with jittered exponential backoff on retryable errors.
+
+    Returns ``(vectors, retries)``.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return await embeddings.aembed_documents(texts), attempt
+        except Exception as exc:
+            if attempt == max_retries or not _is_retryable(exc):
+                raise
+            delay = _retry_after(exc) or min(max_delay, base_delay * 2 ** attempt)
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+
+
+class PrecomputedEmbeddings(Embeddings):
+    """Embedding function for a vector store that also accepts vectors computed elsewhere.
+
+    Within ``supplying(texts, vectors)``, ``embed_documents(texts)`` on the
+    same thread returns ``vectors``; every other call goes to ``underlying``.
+    """
+
+    def __init__(self, underlying):
+        self.underlying = underlying
+        self.model = embedding_model_name(underlying)
+        self._local = threading.local()
+
+    @contextmanager
+    def supplying(self, texts, vectors):
+        self._local.supplied = (list(texts), vectors)
+        try:
+            yield
+        finally:
+            self._local.supplied = None
+
+    def embed_documents(self, texts):
+        supplied = getattr(self._local, "supplied", None)
+        if supplied is not None and supplied[0] == list(texts):
+            return supplied[1]
+        return self.underlying.embed_documents(texts)
+
+    def embed_query(self, text):
+        return self.underlying.embed_query(text)
+
+    async def aembed_documents(self, texts):
+        return await self.underlying.aembed_documents(texts)
+
+    async def aembed_query(self, text):
+        return await self.underlying.aembed_query(text)
+
+
+def write_embedded(vector_store, batch, vectors):
+    """Store already-embedded ``(id, document)`` pairs.
+
+    Stores with ``add_embeddings`` (``llmkit.numpy_index``) take the vectors
+    directly. Other stores go through ``add_texts``, which only reuses them
+    if the store's embeddings are a ``PrecomputedEmbeddings``.
+    """
+    if hasattr(vector_store, "add_embeddings"):
+        vector_store.add_embeddings(batch, vectors)
+        return
+    texts = [doc.page_content for _, doc in batch]
+    options = {"metadatas": [doc.metadata for _, doc in batch], "ids": [doc_id for doc_id, _ in batch]}
+    embeddings = getattr(vector_store, "embeddings", None)
+    if isinstance(embeddings, PrecomputedEmbeddings):
+        with embeddings.supplying(texts, vectors):
+            vector_store.add_texts(texts, **options)
+    else:
+        vector_store.add_texts(texts, **options)
+
+
+def run_sync(coroutine):
+    """``asyncio.run(coroutine)``, on a separate thread if this one already runs an event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with ThreadPoolExecutor(1) as pool:
+        return pool.submit(asyncio.run, coroutine).result()
+
+
+async def aingest(vector_store, items, embeddings, concurrency=4,
+                  batch_tokens=DEFAULT_BATCH_TOKENS, batch_size=DEFAULT_BATCH_SIZE,
+                  max_retries=6, count_tokens=estimate_tokens):
+    """Embed and store ``(id, document)`` pairs; returns a stats dict.
+
+    ``items`` may be a generator: a new batch is only pulled once a slot
+    frees up, so memory stays bounded by ``concurrency`` batches.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    stats = {"chunks": 0, "batches": 0, "retries": 0, "seconds": 0.0}
+    tasks = []
+    start = time.perf_counter()
+
+    async def run(batch):
+        try:
+            vectors, retries = await embed_with_backoff(
+                embeddings, [doc.page_content for _, doc in batch], max_retries=max_retries
+            )
+            write_embedded(vector_store, batch, vectors)
+            stats["chunks"] += len(batch)
+            stats["batches"] += 1
+            stats["retries"] += retries
+        finally:
+            semaphore.release()
+
+    for batch in token_batches(items, batch_tokens, batch_size, count_tokens):
+        await semaphore.acquire()
+        tasks.append(asyncio.create_task(run(batch)))
+    await asyncio.gather(*tasks)
+
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def ingest_documents(vector_store, documents, embeddings, ids=None, **kwargs):
+    """Blocking ``aingest``, also callable from a running event loop; ``ids`` default to random UUIDs."""
+    if ids is None:
+        items = ((str(uuid.uuid4()), doc) for doc in documents)
+    else:
+        items = zip(ids, documents)
+    return run_sync(aingest(vector_store, items, embeddings, **kwargs))
+
+
+def embed_and_write(vector_store, items, embeddings, batch_tokens=DEFAULT_BATCH_TOKENS,
+                    batch_size=DEFAULT_BATCH_SIZE, count_tokens=estimate_tokens):
+    """Blocking, one-batch-at-a-time counterpart of ``aingest`` for small deltas.
+
+    It needs no event loop, so it can run on any thread, repeatedly, with
+    the same embeddings client. Returns the number of chunks written.
+    """
+    written = 0
+    for batch in token_batches(items, batch_tokens, batch_size, count_tokens):
+        write_embedded(vector_store, batch, embeddings.embed_documents([doc.page_content for _, doc in batch]))
+        written += len(batch)
+    return written
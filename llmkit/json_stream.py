@@ -0,0 +1,117 @@
+"""Incremental JSON parsing of a streamed model reply.
+
+The learning path generators ask for one JSON document and could only parse
+it once the last token arrived, so nothing rendered until every week of a
+long roadmap had been generated. ``JSONItemStream`` scans the text as it is
+streamed and yields each element of the array at ``path`` (by default the
+roadmap's ``"weeks"``) as soon as its closing bracket arrives, so the page
+can render week 1, and start its YouTube lookups, while later weeks are
+still being written.
+
+The scanner tracks strings, escapes and nesting, so braces inside string
+values do not confuse it, and it ignores anything before the first ``{``
+(a Markdown code fence, a sentence of preamble). The complete reply in
+``text`` is left to ``llmkit.structured.parse_structured`` to validate.
+"""
+import json
+
+from llmkit.streaming import iter_text
+
+
+class JSONItemStream:
+    """Iterate over the elements of the array at ``path`` while ``chunks`` streams in.
+
+    ``chunks`` may be strings or message chunks (anything ``iter_text``
+    understands). ``text`` holds everything received so far. ``items``
+    counts the elements closed so far; those that are not valid JSON (a
+    trailing comma, say) are not yielded but kept in ``invalid`` by index,
+    so the stream carries on and only they need repairing.
+    """
+
+    def __init__(self, chunks, path=("weeks",)):
+        self._chunks = chunks
+        self.path = tuple(path)
+        self._parts = []
+        # Unscanned text plus the start of the item or string being read
+        self._buffer = ""
+        self._pos = 0
+        # One frame per open container: [kind, path, key, expecting_key]
+        self._stack = []
+        self._started = False
+        self._done = False
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._item_start = None
+        self.items = 0
+        self.invalid = {}
+
+    @property
+    def text(self):
+        return "".join(self._parts)
+
+    def __iter__(self):
+        for text in iter_text(self._chunks):
+            yield from self.feed(text)
+
+    def feed(self, text):
+        """Add ``text`` to the stream; returns the items it completed."""
+        self._parts.append(text)
+        if self._done:
+            return []
+        items = []
+        text, pos = self._buffer + text, self._pos
+        stack = self._stack
+        while pos < len(text):
+            char = text[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    frame = stack[-1] if stack else None
+                    if frame and frame[0] == "object" and frame[3]:
+                        frame[2] = json.loads(text[self._string_start:pos + 1])
+            elif not self._started:
+                if char == "{":
+                    self._started = True
+                    stack.append(["object", (), None, True])
+            elif char == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif char in "{[":
+                parent = stack[-1]
+                child_path = parent[1] + ((parent[2],) if parent[0] == "object" else ("*",))
+                if parent[0] == "array" and parent[1] == self.path and self._item_start is None:
+                    self._item_start = pos
+                stack.append(["object" if char == "{" else "array", child_path, None, char == "{"])
+            elif char in "}]":
+                stack.pop()
+                if not stack:
+                    self._buffer, self._pos = "", 0
+                    self._done = True
+                    return items
+                if self._item_start is not None and stack[-1][0] == "array" and stack[-1][1] == self.path:
+                    raw = text[self._item_start:pos + 1]
+                    try:
+                        items.append(json.loads(raw))
+                    except ValueError:
+                        self.invalid[self.items] = raw
+                    self.items += 1
+                    self._item_start = None
+            elif char == ":" and stack[-1][0] == "object":
+                stack[-1][3] = False
+            elif char == "," and stack[-1][0] == "object":
+                stack[-1][3] = True
+            pos += 1
+        keep = min(p for p in (pos, self._item_start, self._string_start if self._in_string else None)
+                   if p is not None)
+        self._buffer = text[keep:]
+        self._pos = pos - keep
+        if self._item_start is not None:
+            self._item_start -= keep
+        if self._in_string:
+            self._string_start -= keep
+        return items
@@ -0,0 +1,140 @@
+"""Bulk KYC verification of identity documents with the vision prompt.
+
+``kyc_verification.py`` checks one uploaded document at a time.
+``verify_documents`` runs its prompt over a directory or manifest of
+``(image, name, date of birth)`` records:
+
+* images are downsized and re-encoded for the detail level
+  (``llmkit.images``) by a pool of worker processes, so decoding large
+  scans uses every core and never holds up the requests in flight;
+* up to ``concurrency`` records are in progress at once; with a gateway
+  model (``llmkit.gateway``) the vision requests share its connection
+  pool, its requests-per-second limit and its backoff on 429s;
+* each answer is validated as a ``KYCVerdict`` (``llmkit.structured``) and
+  appended to the output JSONL with the record's latency and
+  preprocessing time. As with ``llmkit.batch``, ids already in the output
+  are skipped on a rerun and failures go to ``<output>.errors.jsonl``.
+
+The workers are spawned processes, which re-import the calling script, so
+a plain script must call ``verify_documents`` under
+``if __name__ == "__main__":``.
+"""
+import asyncio
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from langchain_core.runnables import RunnableLambda
+
+from llmkit.batch import arun_records, read_records
+from llmkit.images import encode_file
+from llmkit.schemas import KYCVerdict
+from llmkit.structured import structured_output
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+REQUIRED_FIELDS = ("image", "name", "dob")
+
+
+def _record(base, details):
+    """Variables of one document; missing fields give it an ``invalid`` reason instead of raising."""
+    record = {"image": os.path.join(base, details["image"]) if details.get("image") else None,
+              "user_name": details.get("name"), "user_dob": str(details.get("dob") or "") or None}
+    missing = [field for field in REQUIRED_FIELDS if not details.get(field)]
+    if missing:
+        record["invalid"] = f"missing {', '.join(missing)}"
+    return record
+
+
+def read_kyc_records(source):
+    """``(id, record)`` for every document of a directory or a manifest.
+
+    A manifest is a JSONL or CSV file with ``image``, ``name``, ``dob`` and
+    an optional ``id``; image paths are relative to the manifest. In a
+    directory, each image needs a JSON file with the same name holding its
+    ``name`` and ``dob``, and the id is the file name without extension.
+    Records with missing fields or an unreadable JSON file are yielded with
+    an ``invalid`` reason, so they end up in the errors file.
+    """
+    if os.path.isdir(source):
+        for entry in sorted(os.listdir(source)):
+            stem, extension = os.path.splitext(entry)
+            if extension.lower() not in IMAGE_EXTENSIONS:
+                continue
+            details_path = os.path.join(source, f"{stem}.json")
+            if not os.path.exists(details_path):
+                logger.warning("Skipping %s: no %s.json with its name and dob", entry, stem)
+                continue
+            try:
+                with open(details_path, encoding="utf-8") as f:
+                    details = json.load(f)
+            except ValueError as exc:
+                yield stem, {"image": os.path.join(source, entry), "invalid": f"unreadable {stem}.json: {exc}"}
+                continue
+            yield stem, _record(source, {**details, "image": entry} if isinstance(details, dict) else {})
+        return
+    base = os.path.dirname(os.path.abspath(source))
+    if source.endswith(".csv"):
+        with open(source, newline="", encoding="utf-8") as f:
+            for number, row in enumerate(csv.DictReader(f), start=1):
+                yield str(row.pop("id", None) or number), _record(base, row)
+    else:
+        for record_id, details in read_records(source):
+            yield record_id, _record(base, details)
+
+
+def _with_detail(detail):
+    """Set the ``detail`` of every image in a prompt, to match the size the images were prepared for."""
+
+    def apply(prompt_value):
+        messages = prompt_value.to_messages()
+        for message in messages:
+            if isinstance(message.content, list):
+                for part in message.content:
+                    if isinstance(part, dict) and part.get("type") == "image_url":
+                        part["image_url"] = {**part["image_url"], "detail": detail}
+        return messages
+
+    return RunnableLambda(apply)
+
+
+async def averify_documents(llm, prompt, records, output, concurrency=32, workers=None, detail="low",
+                            progress_every=10.0):
+    """Write a ``KYCVerdict`` for every ``(id, record)`` into the JSONL file ``output``.
+
+    ``prompt`` is the app's chat prompt, with ``user_name``, ``user_dob``
+    and ``image`` (base64 JPEG) variables; its images are sent with
+    ``detail``, whatever the prompt says. ``workers=1`` preprocesses
+    images on a thread of the calling process.
+    """
+    loop = asyncio.get_running_loop()
+    chain = prompt | _with_detail(detail) | structured_output(llm, KYCVerdict)
+    workers = workers or os.cpu_count() or 1
+    pool = None if workers == 1 else ProcessPoolExecutor(workers,
+                                                         mp_context=multiprocessing.get_context("spawn"))
+
+    async def verify(record):
+        if "invalid" in record:
+            raise ValueError(record["invalid"])
+        start = time.perf_counter()
+        image = await loop.run_in_executor(pool, encode_file, record["image"], detail)
+        preprocess = time.perf_counter() - start
+        verdict = await chain.ainvoke({"user_name": record["user_name"], "user_dob": record["user_dob"],
+                                       "image": image})
+        return {"verdict": verdict.model_dump(), "preprocess_seconds": round(preprocess, 3)}, 0
+
+    try:
+        return await arun_records(records, output, verify, concurrency, progress_every)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def verify_documents(llm, prompt, source, output, **kwargs):
+    """Blocking ``averify_documents`` over a directory or manifest; returns the run's stats."""
+    return asyncio.run(averify_documents(llm, prompt, read_kyc_records(source), output, **kwargs))
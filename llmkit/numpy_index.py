@@ -0,0 +1,222 @@
+"""In-process vector store on a float32 NumPy matrix.
+
+For the small corpora of the demos, Chroma's client, SQLite catalogue and
+HNSW index cost more at startup than an exact scan costs per query.
+``NumpyVectorStore`` keeps the L2-normalized vectors in one contiguous
+float32 matrix and answers queries with a matrix-vector product plus
+``argpartition`` (exact cosine search). It is a LangChain ``VectorStore``,
+so ``as_retriever()`` works as with Chroma, and it implements the
+``add_embeddings``/``get``/``delete`` hooks used by ``llmkit.ingest`` and
+``llmkit.vector_index.sync_documents``.
+
+For large corpora ``build_ivf()`` adds an inverted-file index: spherical
+k-means splits the vectors into ``n_lists`` partitions, the rows are
+reordered so every partition is one contiguous slice, and a query scans
+only the ``n_probe`` partitions whose centroids are closest. ``delete``
+keeps the partitions (their centroids are not recomputed; call
+``build_ivf()`` again after large changes). There is no metadata
+filtering: search methods raise ``TypeError`` on ``filter`` or any other
+option they do not support.
+
+``save`` and ``load`` persist everything to a directory; the matrix is
+opened as a read-only memory map, so loading is instant and pages are
+shared between processes.
+"""
+import json
+import os
+import uuid
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+
+from llmkit.similarity import normalize
+
+
+def kmeans(vectors, n_lists, n_iter=10, sample=None, seed=0):
+    """Spherical k-means centroids (unit length) of the rows of ``vectors``."""
+    rng = np.random.default_rng(seed)
+    sample = min(len(vectors), sample or 64 * n_lists)
+    data = normalize(vectors[np.sort(rng.choice(len(vectors), sample, replace=False))])
+    centroids = data[rng.choice(sample, n_lists, replace=False)].copy()
+    for _ in range(n_iter):
+        labels = np.argmax(data @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, data)
+        empty = ~sums.any(axis=1)
+        sums[empty] = data[rng.choice(sample, int(empty.sum()))]
+        centroids = normalize(sums)
+    return centroids
+
+
+def _top_k(scores, k):
+    k = min(k, len(scores))
+    best = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(k)
+    return best[np.argsort(-scores[best])]
+
+
+class NumpyVectorStore(VectorStore):
+    """Exact (flat) or IVF cosine search over a float32 matrix."""
+
+    def __init__(self, embedding, n_probe=8):
+        self._embedding = embedding
+        self.n_probe = n_probe
+        self._vectors = None
+        self._pending = []
+        self._ids = []
+        self._texts = []
+        self._metadatas = []
+        self._centroids = None
+        self._offsets = None
+
+    @property
+    def embeddings(self):
+        return self._embedding
+
+    def __len__(self):
+        return len(self._ids)
+
+    @property
+    def matrix(self):
+        """All vectors as one ``(n, dim)`` float32 matrix, flushing pending appends."""
+        if self._pending:
+            parts = ([] if self._vectors is None else [self._vectors]) + self._pending
+            self._vectors = np.ascontiguousarray(np.concatenate(parts), dtype=np.float32)
+            self._pending = []
+        return self._vectors if self._vectors is not None else np.zeros((0, 0), dtype=np.float32)
+
+    def add_embeddings(self, items, vectors):
+        """Store ``(id, Document)`` pairs with precomputed ``vectors``."""
+        items = list(items)
+        if not items:
+            return []
+        self._pending.append(normalize(vectors))
+        for doc_id, doc in items:
+            self._ids.append(doc_id)
+            self._texts.append(doc.page_content)
+            self._metadatas.append(doc.metadata or {})
+        return [doc_id for doc_id, _ in items]
+
+    def add_texts(self, texts, metadatas=None, ids=None, **kwargs):
+        texts = list(texts)
+        metadatas = metadatas or [{} for _ in texts]
+        ids = ids or [str(uuid.uuid4()) for _ in texts]
+        docs = [Document(page_content=t, metadata=m) for t, m in zip(texts, metadatas)]
+        return self.add_embeddings(zip(ids, docs), self._embedding.embed_documents(texts))
+
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, ids=None, **kwargs):
+        store = cls(embedding, **kwargs)
+        store.add_texts(texts, metadatas, ids)
+        return store
+
+    def get(self, ids=None, include=("documents", "metadatas")):
+        """Stored entries in the shape of ``Chroma.get``."""
+        wanted = None if ids is None else set(ids)
+        rows = [i for i, doc_id in enumerate(self._ids) if wanted is None or doc_id in wanted]
+        result = {"ids": [self._ids[i] for i in rows]}
+        if "documents" in include:
+            result["documents"] = [self._texts[i] for i in rows]
+        if "metadatas" in include:
+            result["metadatas"] = [self._metadatas[i] for i in rows]
+        return result
+
+    def delete(self, ids=None, **kwargs):
+        if not ids:
+            return True
+        drop = set(ids)
+        keep = np.array([i for i, doc_id in enumerate(self._ids) if doc_id not in drop], dtype=np.int64)
+        self._vectors = np.ascontiguousarray(self.matrix[keep])
+        self._ids = [self._ids[i] for i in keep]
+        self._texts = [self._texts[i] for i in keep]
+        self._metadatas = [self._metadatas[i] for i in keep]
+        if self._centroids is not None:
+            # Rows stay grouped by list, so only the list boundaries move
+            indexed = keep[keep < self._offsets[-1]]
+            labels = np.searchsorted(self._offsets, indexed, side="right") - 1
+            self._offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=len(self._centroids)))])
+        return True
+
+    def build_ivf(self, n_lists=None, n_iter=10, chunk_size=65536):
+        """Partition the current vectors into ``n_lists`` k-means lists (default ``sqrt(n)``)."""
+        matrix = self.matrix
+        n_lists = n_lists or max(1, int(np.sqrt(len(matrix))))
+        centroids = kmeans(matrix, n_lists, n_iter)
+        labels = np.concatenate([np.argmax(matrix[i:i + chunk_size] @ centroids.T, axis=1)
+                                 for i in range(0, len(matrix), chunk_size)])
+        order = np.argsort(labels, kind="stable")
+        self._vectors = np.ascontiguousarray(matrix[order])
+        self._ids = [self._ids[i] for i in order]
+        self._texts = [self._texts[i] for i in order]
+        self._metadatas = [self._metadatas[i] for i in order]
+        self._centroids = centroids
+        self._offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=n_lists))])
+
+    def _candidates(self, query):
+        """Row ranges to scan: the nearest lists plus rows added after ``build_ivf``."""
+        matrix = self.matrix
+        if self._centroids is None:
+            return [(0, len(matrix))]
+        lists = _top_k(self._centroids @ query, self.n_probe)
+        ranges = [(int(self._offsets[c]), int(self._offsets[c + 1])) for c in np.sort(lists)]
+        return ranges + [(int(self._offsets[-1]), len(matrix))]
+
+    def similarity_search_with_score_by_vector(self, embedding, k=4, **kwargs):
+        unsupported = sorted(name for name, value in kwargs.items() if value is not None)
+        if unsupported:
+            raise TypeError(f"NumpyVectorStore does not support {', '.join(unsupported)}")
+        if not self._ids:
+            return []
+        query = normalize(embedding)[0]
+        matrix = self.matrix
+        ranges = self._candidates(query)
+        # Each range is a contiguous slice, so a memory-mapped matrix is read sequentially
+        scores = np.concatenate([matrix[start:end] @ query for start, end in ranges])
+        rows = np.concatenate([np.arange(start, end) for start, end in ranges])
+        best = _top_k(scores, k)
+        return [
+            (Document(id=self._ids[rows[i]], page_content=self._texts[rows[i]],
+                      metadata=self._metadatas[rows[i]]), float(scores[i]))
+            for i in best
+        ]
+
+    def similarity_search_with_score(self, query, k=4, **kwargs):
+        return self.similarity_search_with_score_by_vector(self._embedding.embed_query(query), k, **kwargs)
+
+    def similarity_search_by_vector(self, embedding, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k, **kwargs)]
+
+    def similarity_search(self, query, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    def _select_relevance_score_fn(self):
+        # Scores are cosine similarities already; map [-1, 1] onto [0, 1].
+        return lambda score: (score + 1.0) / 2.0
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "vectors.npy"), self.matrix)
+        with open(os.path.join(directory, "documents.jsonl"), "w", encoding="utf-8") as f:
+            for doc_id, text, metadata in zip(self._ids, self._texts, self._metadatas):
+                f.write(json.dumps({"id": doc_id, "text": text, "metadata": metadata}) + "\n")
+        ivf_path = os.path.join(directory, "ivf.npz")
+        if self._centroids is not None:
+            np.savez(ivf_path, centroids=self._centroids, offsets=self._offsets)
+        elif os.path.exists(ivf_path):
+            os.remove(ivf_path)
+
+    @classmethod
+    def load(cls, directory, embedding, mmap=True, **kwargs):
+        store = cls(embedding, **kwargs)
+        store._vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode="r" if mmap else None)
+        with open(os.path.join(directory, "documents.jsonl"), encoding="utf-8") as f:
+            for line in f:
+                row = json.loads(line)
+                store._ids.append(row["id"])
+                store._texts.append(row["text"])
+                store._metadatas.append(row["metadata"])
+        ivf_path = os.path.join(directory, "ivf.npz")
+        if os.path.exists(ivf_path):
+            with np.load(ivf_path) as ivf:
+                store._centroids, store._offsets = ivf["centroids"], ivf["offsets"]
+        return store
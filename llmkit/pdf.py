@@ -0,0 +1,78 @@
+"""Streaming, page-parallel PDF loading.
+
+``PyPDFLoader(path).load()`` parses every page in one thread and returns
+them all at once, so memory grows with the PDF and nothing downstream can
+start until the last page is parsed. ``iter_pdf_pages`` yields pages in
+order as soon as they are extracted: page ranges are parsed by a pool of
+worker processes, and at most ``max_in_flight`` ranges are queued at any
+time, so memory stays bounded whatever the size of the file. Feed it to
+``llmkit.ingest.iter_chunks`` and ``ingest_documents``/``open_persistent_index``
+to split and embed while the rest of the file is still being parsed.
+
+The workers are spawned processes, which re-import the calling script, so
+a plain script must call ``iter_pdf_pages`` under
+``if __name__ == "__main__":``.
+"""
+import os
+from collections import deque
+
+from langchain_core.documents import Document
+
+from llmkit import process_pool
+
+_readers = {}
+
+
+def _reader(path):
+    """One ``PdfReader`` per file and process, so the xref and page tree are parsed once."""
+    key = (path, os.path.getmtime(path))
+    if key not in _readers:
+        from pypdf import PdfReader
+
+        _readers.clear()
+        _readers[key] = PdfReader(path)
+    return _readers[key]
+
+
+def page_count(path):
+    return len(_reader(path).pages)
+
+
+def _extract_pages(path, start, stop):
+    reader = _reader(path)
+    texts = [reader.pages[number].extract_text() for number in range(start, stop)]
+    # Forget the content streams parsed for these pages so memory does not grow with the file
+    reader.resolved_objects.clear()
+    return texts
+
+
+def iter_pdf_pages(path, workers=None, pages_per_task=16, max_in_flight=None):
+    """Yield one ``Document`` per page of ``path``, in page order.
+
+    Metadata matches ``PyPDFLoader``: ``source``, ``page`` (0-based) and
+    ``total_pages``. ``workers=1`` parses in the calling process.
+    """
+    total = page_count(path)
+    workers = workers or min(4, os.cpu_count() or 1)
+    ranges = [(start, min(total, start + pages_per_task)) for start in range(0, total, pages_per_task)]
+
+    def pages(start, texts):
+        for offset, text in enumerate(texts):
+            yield Document(page_content=text,
+                           metadata={"source": path, "page": start + offset, "total_pages": total})
+
+    if workers == 1:
+        for start, stop in ranges:
+            yield from pages(start, _extract_pages(path, start, stop))
+        return
+
+    max_in_flight = max_in_flight or 2 * workers
+    pending = deque()
+    for start, stop in ranges:
+        pending.append((start, process_pool.submit(workers, _extract_pages, path, start, stop)))
+        if len(pending) >= max_in_flight:
+            first, future = pending.popleft()
+            yield from pages(first, future.result())
+    while pending:
+        first, future = pending.popleft()
+        yield from pages(first, future.result())
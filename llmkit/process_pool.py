@@ -0,0 +1,53 @@
+"""Long-lived worker process pools shared across calls.
+
+Spawned workers pay for an interpreter start and their imports (and for
+Whisper, the model load) once, so ``llmkit.pdf`` and
+``llmkit.transcription`` keep one pool per size and initializer instead of
+one per call. A worker that dies (killed for memory, a crash in a native
+library) breaks its ``ProcessPoolExecutor`` for good: every later
+``submit`` raises ``BrokenProcessPool``. ``submit`` then drops the broken
+pool and starts a new one, so a crash only fails the tasks that were
+running at the time.
+"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _pool(workers, initializer):
+    with _pools_lock:
+        key = (workers, initializer)
+        if key not in _pools:
+            _pools[key] = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"),
+                                              initializer=initializer)
+        return _pools[key]
+
+
+def _discard(workers, initializer, pool):
+    with _pools_lock:
+        if _pools.get((workers, initializer)) is pool:
+            del _pools[workers, initializer]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def submit(workers, fn, *args, initializer=None):
+    """Run ``fn(*args)`` in the shared pool of ``workers`` processes; returns the future."""
+    pool = _pool(workers, initializer)
+    try:
+        return pool.submit(fn, *args)
+    except BrokenProcessPool:
+        _discard(workers, initializer, pool)
+        return _pool(workers, initializer).submit(fn, *args)
+
+
+def shutdown():
+    """Stop the worker pools. Needed before a child process that used them can exit."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
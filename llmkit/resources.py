@@ -0,0 +1,53 @@
+"""Model clients that survive Streamlit reruns.
+
+Streamlit re-executes the whole script on every interaction, so a
+module-level ``ChatOpenAI(...)`` or ``ChatBedrock(...)`` builds a new client
+(and HTTP connection pool, boto3 session, TLS handshake) on every keystroke.
+These factories are wrapped in ``st.cache_resource``: one client per
+distinct set of arguments, shared by all sessions of the app. Apps whose
+users pick the arguments (models, sampling sliders) would otherwise grow the
+cache without bound, so at most ``MAX_ENTRIES`` clients per factory are
+kept and each is rebuilt after ``TTL`` seconds. Provider packages are
+imported lazily so an app only needs the ones it uses.
+
+OpenAI and Ollama models go through the process-wide ``llmkit.gateway``,
+so every app and session shares its connection pools, rate limits and
+deduplication of identical in-flight requests.
+
+Chains built from these clients can be cached the same way by wrapping the
+app's own builder function in ``@st.cache_resource`` with the same
+limits. Do not cache objects that hold per-session state, such as
+``StreamlitChatMessageHistory``.
+"""
+import streamlit as st
+
+MAX_ENTRIES = 32
+TTL = 6 * 3600
+
+
+@st.cache_resource(show_spinner=False, max_entries=MAX_ENTRIES, ttl=TTL)
+def chat_openai(model, **kwargs):
+    from llmkit.gateway import chat_model
+
+    return chat_model(model, provider="openai", **kwargs)
+
+
+@st.cache_resource(show_spinner=False, max_entries=MAX_ENTRIES, ttl=TTL)
+def chat_bedrock(model_id, region_name, **kwargs):
+    from langchain_aws import ChatBedrock
+
+    return ChatBedrock(model_id=model_id, region_name=region_name, **kwargs)
+
+
+@st.cache_resource(show_spinner=False, max_entries=MAX_ENTRIES, ttl=TTL)
+def chat_ollama(model, **kwargs):
+    from llmkit.gateway import chat_model
+
+    return chat_model(model, provider="ollama", **kwargs)
+
+
+@st.cache_resource(show_spinner=False, max_entries=MAX_ENTRIES, ttl=TTL)
+def openai_embeddings(**kwargs):
+    from langchain_openai import OpenAIEmbeddings
+
+    return OpenAIEmbeddings(**kwargs)
@@ -0,0 +1,288 @@
+"""Response cache for chat models, with an optional semantic lookup.
+
+LangChain's global ``set_llm_cache`` is skipped by ``.stream()``, which the
+Streamlit apps now use, so caching is done by wrapping the model instead:
+``cached_chat_model(llm, cache, name=...)`` returns a chat model that
+answers from ``cache`` when it can and otherwise calls ``llm`` (streaming
+or not) and stores the reply.
+
+Exact keys are a hash of the model's identifying parameters (model name,
+temperature, top_p, ...), the rendered messages and any call-time options.
+With ``embeddings`` and a ``similarity_threshold`` the cache also reuses the
+reply of a similar earlier prompt when the cosine similarity reaches the
+threshold. Only what the user typed is compared, never the fixed prompt
+text around it, which would make any two inputs look alike: with the
+app's ``templates``, a prompt rendered from one of them is compared by its
+variable values against prompts from the same template; otherwise a chat
+prompt is compared by its last human message against prompts with the
+same earlier messages. A single message from no known template is only
+cached exactly.
+
+Entries expire after ``ttl`` seconds (lookups ignore them at once; they
+are deleted at most every ``expire_every`` seconds) and the least recently
+used ones are evicted beyond ``max_entries``. The prompt embedding is
+computed outside the cache lock, so a slow embedding call never holds up
+other threads' lookups. Hits, semantic hits, misses and the model
+latency saved are counted per ``name`` and persisted in the same SQLite
+file; ``ResponseCache.report()`` returns them.
+"""
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from string import Formatter
+from typing import Any
+
+import numpy as np
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    llm TEXT NOT NULL,
+    response TEXT NOT NULL,
+    latency REAL NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    embedding BLOB
+);
+CREATE INDEX IF NOT EXISTS responses_llm ON responses (llm);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+CREATE TABLE IF NOT EXISTS stats (
+    name TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    semantic_hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0,
+    saved_seconds REAL NOT NULL DEFAULT 0
+);
+"""
+
+
+class ResponseCache:
+    """SQLite-backed store of model replies with TTL and LRU eviction."""
+
+    def __init__(self, path=":memory:", ttl=7 * 24 * 3600, max_entries=10000,
+                 embeddings=None, similarity_threshold=0.95, expire_every=60.0):
+        self.ttl = ttl
+        self.expire_every = expire_every
+        self.max_entries = max_entries
+        self.embeddings = embeddings
+        self.similarity_threshold = similarity_threshold
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._matrices = {}
+        self._next_expiry = 0.0
+
+    @staticmethod
+    def key(llm, prompt):
+        return hashlib.sha256(f"{llm}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def _count(self, name, column, saved=0.0):
+        self._db.execute("INSERT OR IGNORE INTO stats (name) VALUES (?)", (name,))
+        self._db.execute(
+            f"UPDATE stats SET {column} = {column} + 1, saved_seconds = saved_seconds + ? WHERE name = ?",
+            (saved, name),
+        )
+        self._db.commit()
+
+    def _semantic_matrix(self, llm):
+        """``(keys, normalized float32 matrix)`` of the stored prompt embeddings for ``llm``."""
+        if llm not in self._matrices:
+            rows = self._db.execute(
+                "SELECT key, embedding FROM responses WHERE llm = ? AND embedding IS NOT NULL", (llm,)
+            ).fetchall()
+            keys = [k for k, _ in rows]
+            matrix = (np.stack([np.frombuffer(b, dtype=np.float32) for _, b in rows])
+                      if rows else np.zeros((0, 0), dtype=np.float32))
+            self._matrices[llm] = (keys, matrix)
+        return self._matrices[llm]
+
+    def _expire(self, now):
+        if now < self._next_expiry:
+            return
+        self._next_expiry = now + self.expire_every
+        if self._db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,)).rowcount:
+            self._db.commit()
+            self._matrices.clear()
+
+    def _embed(self, prompt):
+        vector = np.asarray(self.embeddings.embed_query(prompt), dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def lookup(self, llm, prompt, name="default", semantic=None):
+        """Return the cached reply text or ``None``; also returns the prompt embedding if computed.
+
+        ``semantic`` is ``(context, text)``: when no reply is stored for
+        ``prompt``, replies stored with the same ``llm`` and ``context`` are
+        candidates, compared by the embedding of ``text``.
+        """
+        key = self.key(llm, prompt)
+        now = time.time()
+        live = "SELECT response, latency FROM responses WHERE key = ? AND created >= ?"
+        with self._lock:
+            self._expire(now)
+            row = self._db.execute(live, (key, now - self.ttl)).fetchone()
+            if row is not None:
+                self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                self._count(name, "hits", row[1])
+                return row[0], None
+            if self.embeddings is None or semantic is None:
+                self._count(name, "misses")
+                return None, None
+
+        group, text = self.key(llm, semantic[0]), semantic[1]
+        vector = self._embed(text)
+        with self._lock:
+            keys, matrix = self._semantic_matrix(group)
+            if len(keys):
+                scores = matrix @ vector
+                # The best match may have expired; the next ones above the threshold still count
+                for best in np.argsort(-scores)[:8]:
+                    if scores[best] < self.similarity_threshold:
+                        break
+                    row = self._db.execute(live, (keys[best], now - self.ttl)).fetchone()
+                    if row is not None:
+                        response, latency = row
+                        self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, keys[best]))
+                        self._count(name, "semantic_hits", latency)
+                        return response, vector
+            self._count(name, "misses")
+            return None, vector
+
+    def update(self, llm, prompt, response, latency, vector=None, semantic=None):
+        """Store ``response``; ``vector`` and ``semantic`` as returned by and passed to ``lookup``."""
+        now = time.time()
+        # Semantic candidates are grouped by model and context, in the ``llm`` column
+        group = self.key(llm, semantic[0]) if vector is not None and semantic is not None else llm
+        blob = vector.astype(np.float32).tobytes() if vector is not None else None
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, llm, response, latency, created, accessed, embedding)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.key(llm, prompt), group, response, latency, now, now, blob),
+            )
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses"
+                " ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._db.commit()
+            self._matrices.pop(group, None)
+
+    def report(self):
+        """Per-name counters: hits, semantic hits, misses, hit rate and seconds saved."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT name, hits, semantic_hits, misses, saved_seconds FROM stats ORDER BY name"
+            ).fetchall()
+        report = []
+        for name, hits, semantic_hits, misses, saved in rows:
+            total = hits + semantic_hits + misses
+            report.append({
+                "name": name, "hits": hits, "semantic_hits": semantic_hits, "misses": misses,
+                "hit_rate": (hits + semantic_hits) / total if total else 0.0,
+                "saved_seconds": saved,
+            })
+        return report
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def response_cache(path, **kwargs):
+    """Process-wide ``ResponseCache`` for ``path``."""
+    with _shared_lock:
+        if path not in _shared:
+            _shared[path] = ResponseCache(path, **kwargs)
+        return _shared[path]
+
+
+@lru_cache(maxsize=256)
+def _template_pattern(template):
+    """Regex matching the f-string ``template`` rendered, capturing each variable."""
+    parts = []
+    for literal, field, _, _ in Formatter().parse(template):
+        parts.append(re.escape(literal))
+        if field is not None:
+            parts.append("(.*?)")
+    return re.compile("".join(parts), re.DOTALL)
+
+
+def _content(message):
+    return message.content if isinstance(message.content, str) else json.dumps(message.content, default=str)
+
+
+class CachedChatModel(BaseChatModel):
+    """Chat model that serves replies from a ``ResponseCache`` before calling ``inner``."""
+
+    inner: Any
+    responses: Any
+    cache_name: str = "default"
+    templates: list = []
+
+    @property
+    def _llm_type(self):
+        return f"cached-{self.inner._llm_type}"
+
+    def _llm_string(self, stop, kwargs):
+        model = next((getattr(self.inner, a) for a in ("model_name", "model_id", "model")
+                      if isinstance(getattr(self.inner, a, None), str)), None)
+        params = {"type": self.inner._llm_type, "model": model, **self.inner._identifying_params,
+                  "stop": stop, **kwargs}
+        return json.dumps(params, sort_keys=True, default=str)
+
+    @staticmethod
+    def _prompt(messages):
+        return json.dumps([[m.type, m.content] for m in messages], default=str)
+
+    def _semantic(self, messages):
+        """``(context, text)`` for a semantic lookup, or ``None`` to only match exactly."""
+        if not messages or messages[-1].type != "human":
+            return None
+        text = _content(messages[-1])
+        for template in self.templates:
+            if getattr(template, "template_format", "f-string") != "f-string":
+                continue
+            if match := _template_pattern(template.template).fullmatch(text):
+                return f"template:{template.template}", "\n".join(match.groups())
+        if len(messages) > 1:
+            return self._prompt(messages[:-1]), text
+        return None
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        text = "".join(chunk.message.content for chunk in self._stream(messages, stop, run_manager, **kwargs))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        llm, prompt, semantic = self._llm_string(stop, kwargs), self._prompt(messages), self._semantic(messages)
+        cached, vector = self.responses.lookup(llm, prompt, self.cache_name, semantic)
+        if cached is not None:
+            yield ChatGenerationChunk(message=AIMessageChunk(content=cached))
+            return
+
+        start = time.perf_counter()
+        parts = []
+        for chunk in self.inner.stream(messages, stop=stop, **kwargs):
+            text = chunk.content if isinstance(chunk.content, str) else "".join(
+                block.get("text", "") for block in chunk.content if isinstance(block, dict)
+            )
+            parts.append(text)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=text))
+        self.responses.update(llm, prompt, "".join(parts), time.perf_counter() - start, vector, semantic)
+
+
+def cached_chat_model(llm, cache, name="default", templates=()):
+    """Wrap ``llm`` so its replies go through ``cache``; ``name`` labels the stats.
+
+    ``templates`` are the ``PromptTemplate``s the app renders its prompts
+    from, so semantic lookups compare only the values filled into them.
+    """
+    return CachedChatModel(inner=llm, responses=cache, cache_name=name, templates=list(templates))
@@ -0,0 +1,82 @@
+"""Pydantic schemas of the apps' structured outputs, for ``llmkit.structured``."""
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, ValidationError, model_validator
+from pydantic_core import InitErrorDetails
+
+
+class MarketingEmail(BaseModel):
+    """Marketing email generated for a product and target audience."""
+
+    subject: str = Field(description="Subject line of the email")
+    audience: str = Field(description="Target audience the email is written for")
+    email: str = Field(description="Body of the email")
+
+
+class Speech(BaseModel):
+    """Speech with its title."""
+
+    title: str = Field(description="Title of the speech")
+    speech: str = Field(description="Full text of the speech")
+
+
+class Resource(BaseModel):
+    type: str = Field(description="book, course, article, playlist or video")
+    title: str
+    note: Optional[str] = None
+
+
+class Week(BaseModel):
+    week: int
+    focus: str = Field(description="Short title of the week's focus")
+    learning_objectives: List[str]
+    recommended_resources: List[Resource]
+    project_idea: str = Field(description="One-sentence project idea")
+    search_keywords: List[str] = Field(default_factory=list,
+                                       description="Keywords to search YouTube or courses")
+
+
+class RoadmapMeta(BaseModel):
+    assessment_checkpoints: List[str] = Field(default_factory=list)
+    final_project: str = ""
+
+
+class Roadmap(BaseModel):
+    """Week-by-week learning roadmap."""
+
+    weeks_total: int
+    weeks: List[Week]
+    meta: RoadmapMeta = Field(default_factory=RoadmapMeta)
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def _all_weeks(cls, data, handler):
+        # A reply cut off mid-roadmap parses with fewer weeks; report each
+        # missing one at its index, along with any other error, so they are
+        # all requested again in one go
+        errors, roadmap = [], None
+        try:
+            roadmap = handler(data)
+        except ValidationError as exc:
+            errors = [InitErrorDetails(**{k: v for k, v in e.items() if k in ("type", "loc", "input", "ctx")})
+                      for e in exc.errors(include_url=False)]
+        weeks, total = (data.get("weeks"), data.get("weeks_total")) if isinstance(data, dict) else (None, None)
+        if isinstance(weeks, list) and isinstance(total, int):
+            errors += [InitErrorDetails(type="missing", loc=("weeks", i), input=None)
+                       for i in range(len(weeks), total)]
+        if errors:
+            raise ValidationError.from_exception_data(cls.__name__, errors)
+        return roadmap
+
+
+class KYCVerdict(BaseModel):
+    """Verification of an identification document against the applicant's details."""
+
+    verified: bool = Field(description="True if the document looks genuine and matches the name and date of birth")
+    name_match: bool
+    dob_match: bool
+    document_type: str = Field(description="passport, driving licence, national ID card or other")
+    extracted_name: Optional[str] = None
+    extracted_dob: Optional[str] = Field(None, description="Date of birth on the document, YYYY-MM-DD")
+    issues: List[str] = Field(default_factory=list,
+                              description="Mismatches or problems: blur, glare, expired, signs of tampering")
@@ -0,0 +1,174 @@
+"""Session-keyed chat history persisted in SQLite.
+
+The demos used to hand ``RunnableWithMessageHistory`` a single history
+object and ignore the ``session_id``, so every user shared one in-process
+conversation that vanished on restart. ``SQLiteChatMessageHistory`` keys
+messages by session instead, in one SQLite file shared by the process:
+
+* WAL journal, with reads on a small pool of read-only connections, so
+  they never wait for a write in progress (an in-memory store has a single
+  connection). Connections are checked out per query, so the short-lived
+  threads of Streamlit reruns do not each keep one open;
+* append-only inserts of ``(session_id, turn)`` rows, the primary key of a
+  ``WITHOUT ROWID`` table, so a session's messages are stored together and
+  the last ``window`` of them is one short index range scan;
+* messages are only read when ``.messages`` is accessed, and only the last
+  ``window`` of them when a window is set.
+
+One ``SQLiteHistoryStore`` (see ``sqlite_history_store``) serves any number
+of sessions; ``SQLiteChatMessageHistory`` objects are cheap views on it and
+can be created per request.
+"""
+import json
+import sqlite3
+import threading
+import uuid
+
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import message_to_dict, messages_from_dict
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    session_id TEXT NOT NULL,
+    turn INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    PRIMARY KEY (session_id, turn)
+) WITHOUT ROWID;
+"""
+
+
+class SQLiteHistoryStore:
+    """Append-only message log for many sessions in one SQLite file."""
+
+    def __init__(self, path=":memory:", max_idle_readers=4):
+        self.path = path
+        self.max_idle_readers = max_idle_readers
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._idle = []
+        self._closed = False
+
+    def _read(self, sql, params):
+        if self.path == ":memory:":
+            # Another connection would open a different, empty database
+            with self._lock:
+                return self._db.execute(sql, params).fetchall()
+        with self._lock:
+            reader = self._idle.pop() if self._idle else None
+        if reader is None:
+            reader = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            reader.execute("PRAGMA query_only=ON")
+        try:
+            return reader.execute(sql, params).fetchall()
+        finally:
+            with self._lock:
+                keep = not self._closed and len(self._idle) < self.max_idle_readers
+                if keep:
+                    self._idle.append(reader)
+            if not keep:
+                reader.close()
+
+    def _write(self, session_id, rows, replace=False):
+        with self._lock:
+            # IMMEDIATE takes the write lock up front, so the next turn number
+            # cannot be claimed by another process between the read and insert.
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                if replace:
+                    self._db.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+                (last,) = self._db.execute(
+                    "SELECT COALESCE(MAX(turn), -1) FROM messages WHERE session_id = ?", (session_id,)
+                ).fetchone()
+                self._db.executemany(
+                    "INSERT INTO messages (session_id, turn, message) VALUES (?, ?, ?)",
+                    [(session_id, last + 1 + i, row) for i, row in enumerate(rows)],
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def append(self, session_id, messages):
+        rows = [json.dumps(message_to_dict(m)) for m in messages]
+        if rows:
+            self._write(session_id, rows)
+
+    def replace(self, session_id, messages):
+        """Atomically replace every message of ``session_id`` with ``messages``."""
+        self._write(session_id, [json.dumps(message_to_dict(m)) for m in messages], replace=True)
+
+    def load(self, session_id, window=None):
+        """Messages of ``session_id`` in order; only the last ``window`` if given."""
+        rows = self._read(
+            "SELECT message FROM messages WHERE session_id = ? ORDER BY turn DESC LIMIT ?",
+            (session_id, -1 if window is None else window),
+        )
+        return messages_from_dict([json.loads(row) for (row,) in reversed(rows)])
+
+    def count(self, session_id):
+        return self._read("SELECT COUNT(*) FROM messages WHERE session_id = ?", (session_id,))[0][0]
+
+    def clear(self, session_id):
+        with self._lock:
+            self._db.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            for reader in self._idle:
+                reader.close()
+            self._idle.clear()
+            self._db.close()
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def sqlite_history_store(path):
+    """Process-wide ``SQLiteHistoryStore`` for ``path``."""
+    with _shared_lock:
+        if path not in _shared:
+            _shared[path] = SQLiteHistoryStore(path)
+        return _shared[path]
+
+
+class SQLiteChatMessageHistory(BaseChatMessageHistory):
+    """History of one session in a ``SQLiteHistoryStore``.
+
+    With ``window`` set, ``messages`` returns only that many of the most
+    recent messages; the rest stay on disk.
+    """
+
+    def __init__(self, session_id, store, window=None):
+        self.session_id = session_id
+        self.store = store
+        self.window = window
+
+    @property
+    def messages(self):
+        return self.store.load(self.session_id, self.window)
+
+    def add_messages(self, messages):
+        self.store.append(self.session_id, messages)
+
+    def replace_messages(self, messages):
+        self.store.replace(self.session_id, messages)
+
+    def clear(self):
+        self.store.clear(self.session_id)
+
+
+def streamlit_session_id(param="session"):
+    """Id of the current browser session, kept in the URL query string.
+
+    Reloading the page or restarting the server resumes the same history.
+    """
+    import streamlit as st
+
+    if param not in st.query_params:
+        st.query_params[param] = uuid.uuid4().hex
+    return st.query_params[param]
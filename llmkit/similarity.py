@@ -0,0 +1,55 @@
+"""Batched cosine similarity between two sets of texts.
+
+Scoring N queries against M candidates pair by pair costs 2·N·M embedding
+calls and as many Python-level dot products. ``similarity_search`` embeds
+each side in one batched ``embed_documents`` call, L2-normalizes both into
+contiguous float32 matrices and gets every cosine similarity from a single
+matrix multiply; the best ``k`` candidates per query are picked with
+``argpartition`` so only those ``k`` are sorted.
+"""
+import numpy as np
+
+
+def normalize(vectors):
+    """Rows of ``vectors`` scaled to unit length, as a contiguous float32 matrix."""
+    matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+    if matrix.size == 0:
+        # No rows, rather than one row of length zero
+        return matrix.reshape(0, matrix.shape[-1] if matrix.ndim == 2 else 0)
+    if matrix.ndim == 1:
+        matrix = matrix[None, :]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def embed_matrix(embeddings, texts):
+    """Embed ``texts`` with one batched call; returns the normalized matrix."""
+    return normalize(embeddings.embed_documents(list(texts)))
+
+
+def cosine_matrix(queries, candidates):
+    """``N x M`` cosine similarities of two normalized matrices."""
+    return queries @ candidates.T
+
+
+def top_k(scores, k):
+    """Column indices and scores of the ``k`` best entries of each row, best first."""
+    k = min(k, scores.shape[1])
+    if k < scores.shape[1]:
+        indices = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        indices = np.broadcast_to(np.arange(k), (scores.shape[0], k))
+    best = np.take_along_axis(scores, indices, axis=1)
+    order = np.argsort(-best, axis=1)
+    return np.take_along_axis(indices, order, axis=1), np.take_along_axis(best, order, axis=1)
+
+
+def similarity_search(embeddings, queries, candidates, k=5):
+    """For each query, the ``k`` most similar candidates as ``[(index, score), ...]``."""
+    queries, candidates = list(queries), list(candidates)
+    if not queries or not candidates:
+        return [[] for _ in queries]
+    scores = cosine_matrix(embed_matrix(embeddings, queries), embed_matrix(embeddings, candidates))
+    indices, best = top_k(scores, k)
+    return [list(zip(row.tolist(), row_scores.tolist())) for row, row_scores in zip(indices, best)]
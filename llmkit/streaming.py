@@ -0,0 +1,74 @@
+"""Progressive rendering of LLM output in Streamlit.
+
+``stream_to_streamlit`` runs a chain with ``.stream()`` and writes tokens as
+they arrive, so the user waits for the first token instead of the last one.
+``TimedStream`` records time-to-first-token and total latency of any stream.
+"""
+import time
+
+import streamlit as st
+
+
+def chunk_text(chunk, key=None):
+    """Text carried by one streamed chunk.
+
+    Handles plain strings (``StrOutputParser``), message chunks whose
+    ``content`` is a string or a list of content blocks (Bedrock/Anthropic),
+    and dict chunks such as those of ``create_retrieval_chain`` when ``key``
+    names the field to follow (e.g. ``"answer"``).
+    """
+    if key is not None:
+        chunk = chunk.get(key, "") if isinstance(chunk, dict) else ""
+    if isinstance(chunk, str):
+        return chunk
+    content = getattr(chunk, "content", "")
+    if isinstance(content, list):
+        return "".join(
+            block.get("text", "") if isinstance(block, dict) else str(block)
+            for block in content
+        )
+    return content or ""
+
+
+def iter_text(chunks, key=None):
+    """Yield the non-empty text of each chunk in ``chunks``."""
+    for chunk in chunks:
+        text = chunk_text(chunk, key)
+        if text:
+            yield text
+
+
+class TimedStream:
+    """Iterator wrapper that measures a token stream.
+
+    After the stream is exhausted, ``ttft`` holds the seconds until the
+    first non-empty chunk, ``total`` the seconds until the last one and
+    ``text`` the concatenated output.
+    """
+
+    def __init__(self, chunks, key=None):
+        self._chunks = iter_text(chunks, key)
+        self._start = time.perf_counter()
+        self._parts = []
+        self.ttft = None
+        self.total = None
+
+    def __iter__(self):
+        for text in self._chunks:
+            if self.ttft is None:
+                self.ttft = time.perf_counter() - self._start
+            self._parts.append(text)
+            yield text
+        self.total = time.perf_counter() - self._start
+
+    @property
+    def text(self):
+        return "".join(self._parts)
+
+
+def stream_to_streamlit(runnable, inputs, config=None, key=None, container=None):
+    """Stream ``runnable`` into ``container`` (default: the page) and return the full text."""
+    container = container or st
+    timed = TimedStream(runnable.stream(inputs, config), key=key)
+    container.write_stream(timed)
+    return timed.text
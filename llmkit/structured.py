@@ -0,0 +1,373 @@
+"""Structured model output validated against a Pydantic schema, repaired in place.
+
+``JsonOutputParser`` over free-form text fails the whole chain on a code
+fence, a trailing comma or an answer cut off at ``max_tokens``, and the
+only way out is to run the full, expensive generation again.
+``structured_output(llm, schema)`` is a drop-in for ``llm | JsonOutputParser()``
+that:
+
+* uses the provider's native mode when there is one: ``response_format``
+  with a JSON schema for the gateway (OpenAI-compatible) models,
+  ``with_structured_output`` (tool calling) for models that support tools,
+  and schema instructions in the prompt otherwise;
+* repairs the text locally when it is almost JSON (fences, surrounding
+  prose, trailing commas, a reply cut off anywhere, which is trimmed back
+  to its last complete member and closed);
+* validates it against ``schema`` and, when some fields are missing or
+  invalid, asks the model again for just those fragments (one week of a
+  roadmap, the ``email`` field of an email) and merges them back.
+
+``parse_structured`` is the validation and repair step on its own, for
+apps that stream the text themselves. Both raise ``StructuredOutputError``
+when the output still does not validate after ``max_repairs`` rounds.
+"""
+import asyncio
+import json
+import re
+from typing import get_args
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
+from pydantic import TypeAdapter, ValidationError
+
+FORMAT_INSTRUCTIONS = ("Respond only with a JSON object that matches this JSON schema, "
+                       "with no other text:\n{schema}")
+
+FRAGMENT_PROMPT = ("Part of your previous answer is missing or invalid:\n{errors}\n"
+                   "Reply only with the JSON value for {path} (no other text), "
+                   "matching this JSON schema:\n{schema}")
+
+
+class StructuredOutputError(ValueError):
+    """Model output that could not be parsed or validated, with the text and errors."""
+
+    def __init__(self, message, text, errors=None):
+        super().__init__(message)
+        self.text = text
+        self.errors = errors or []
+
+
+_SCALAR = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null")
+_WHITESPACE = " \t\r\n"
+
+
+def _string_end(text, i):
+    """Index just past the string starting at ``text[i]``, or ``None`` if it is not closed."""
+    escape = False
+    for j in range(i + 1, len(text)):
+        if escape:
+            escape = False
+        elif text[j] == "\\":
+            escape = True
+        elif text[j] == '"':
+            return j + 1
+    return None
+
+
+def _balance(text):
+    """``(repaired text, cut-off paths)`` of the JSON value at the start of ``text``.
+
+    Trailing commas are dropped and anything after the value (a closing
+    code fence, prose) is ignored. A value cut off mid-way is trimmed back
+    to its last complete member or element (a half key, a key without its
+    value, half a string, number or ``true``) and its open brackets closed;
+    the paths of the list elements closed that way are returned, since
+    fields with defaults would hide what they lost. The text is ``None`` if
+    nothing of the value is usable.
+    """
+    out, complete = [], None
+    # Open containers as [bracket, current key or index]
+    stack = []
+    # What the innermost container expects next: "key", ":", "value" or ","
+    state = "value"
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char in _WHITESPACE:
+            out.append(char)
+            i += 1
+            continue
+        if state == "value" and stack and stack[-1][0] == "[" and char not in "]":
+            stack[-1][1] += 1
+        end = i + 1
+        if char == '"' and state in ("key", "value"):
+            end = _string_end(text, i)
+            if end is None:
+                break
+            if state == "key":
+                stack[-1][1] = json.loads(text[i:end], strict=False)
+            done = state == "value"
+            state = ":" if state == "key" else ","
+        elif char in "{[" and state == "value":
+            stack.append([char, None if char == "{" else -1])
+            state = "key" if char == "{" else "value"
+            done = False
+        elif char in "}]" and stack and stack[-1][0] == "{["["}]".index(char)] and (
+                state in (",", "key" if char == "}" else "value")):
+            while out[-1] in _WHITESPACE + ",":
+                out.pop()
+            stack.pop()
+            done = True
+        elif char == ":" and state == ":":
+            state, done = "value", False
+        elif char == "," and state == "," and stack:
+            state, done = ("key" if stack[-1][0] == "{" else "value"), False
+        elif (state == "value" and (match := _SCALAR.match(text, i))
+              and text[match.end():match.end() + 1] in tuple(_WHITESPACE + ",]}")):
+            end, done = match.end(), True
+        else:
+            break
+        out.append(text[i:end])
+        i = end
+        if char in "{[" or done:
+            if not stack:
+                return "".join(out), []
+            if done:
+                state = ","
+            closers = "".join("}" if bracket == "{" else "]" for bracket, _ in reversed(stack))
+            cut_off = [tuple(part for _, part in stack[:depth]) for depth in range(1, len(stack))
+                       if stack[depth - 1][0] == "["]
+            complete = (len(out), closers, cut_off)
+    if complete is None:
+        return None, []
+    length, closers, cut_off = complete
+    return "".join(out[:length]) + closers, cut_off
+
+
+def _repair(text):
+    """``(value, cut-off paths)`` of model output ``text``; the value is ``None`` if hopeless."""
+    try:
+        return json.loads(text), []
+    except ValueError:
+        pass
+    # Code fence or prose around the JSON
+    start = min((i for i in (text.find("{"), text.find("[")) if i != -1), default=-1)
+    if start == -1:
+        return None, []
+    candidate, cut_off = _balance(text[start:])
+    if candidate is None:
+        return None, []
+    try:
+        return json.loads(candidate, strict=False), cut_off
+    except ValueError:
+        return None, []
+
+
+def repair_json(text):
+    """Parse ``text`` as JSON, fixing what models commonly get wrong; ``None`` if hopeless."""
+    return _repair(text)[0]
+
+
+def _annotation(schema, path):
+    """Type of the value at ``path`` (field names, list indexes and slices) inside ``schema``."""
+    annotation = schema
+    for part in path:
+        if isinstance(part, slice):
+            continue
+        if isinstance(part, int):
+            annotation = get_args(annotation)[0]
+        else:
+            annotation = annotation.model_fields[part].annotation
+    return annotation
+
+
+def _get(data, path):
+    try:
+        for part in path:
+            data = data[part]
+    except (KeyError, IndexError, TypeError):
+        return None
+    return data
+
+
+def _fragments(errors, data):
+    """Smallest parts to re-request: a top-level field, one element of a list,
+    or the missing end of a list as a slice (a reply cut off at ``max_tokens``).
+    """
+    paths = []
+    for error in errors:
+        loc = error["loc"]
+        cut = next((i + 1 for i, part in enumerate(loc) if isinstance(part, int)), min(1, len(loc)))
+        if tuple(loc[:cut]) not in paths:
+            paths.append(tuple(loc[:cut]))
+
+    tails = {}
+    for path in list(paths):
+        if path and isinstance(path[-1], int):
+            items = _get(data, path[:-1])
+            if isinstance(items, list) and path[-1] >= len(items):
+                paths.remove(path)
+                tails[path[:-1]] = max(tails.get(path[:-1], 0), path[-1] + 1)
+    for parent, stop in tails.items():
+        start = len(_get(data, parent))
+        # The cut-off last element is requested along with the rest
+        if parent + (start - 1,) in paths:
+            paths.remove(parent + (start - 1,))
+            start -= 1
+        paths.append(parent + (slice(start, stop),))
+    return paths
+
+
+def _set(data, path, value):
+    for part in path[:-1]:
+        data = data[part]
+    if isinstance(path[-1], slice):
+        if isinstance(value, list):
+            data[path[-1].start:] = value
+    elif isinstance(data, list) and path[-1] >= len(data):
+        data.append(value)
+    else:
+        data[path[-1]] = value
+
+
+def _path_name(path):
+    return "".join(f"[{part}]" if isinstance(part, int) else f".{part}" for part in path).lstrip(".")
+
+
+def _describe(path):
+    if path and isinstance(path[-1], slice):
+        return (f"elements {path[-1].start + 1} to {path[-1].stop} of `{_path_name(path[:-1])}`, "
+                f"as a JSON array")
+    return f"`{_path_name(path)}`" if path else "the whole answer"
+
+
+def parse_structured(text, schema, llm=None, messages=None, max_repairs=2, stats=None):
+    """``schema`` instance from model output ``text``.
+
+    Repairs the JSON locally first. With ``llm`` and the ``messages`` that
+    produced ``text``, invalid fragments are re-requested from the model
+    (at most ``max_repairs`` rounds), or the whole answer when nothing of it
+    could be parsed; ``stats`` counts what was needed.
+    """
+    stats = stats if stats is not None else {}
+    data, cut_off = _repair(text)
+    if data is None and llm is None:
+        raise StructuredOutputError("model output is not JSON", text)
+    if data is not None and not _is_json(text):
+        stats["repaired_locally"] = stats.get("repaired_locally", 0) + 1
+    # List elements the reply was cut off in may validate on defaults alone
+    incomplete = [{"loc": path, "msg": "cut off before it was complete"} for path in cut_off]
+
+    for attempt in range(max_repairs + 1):
+        if data is None:
+            errors = [{"loc": (), "msg": "the answer is not valid JSON"}]
+        else:
+            try:
+                result = schema.model_validate(data)
+                if not incomplete or llm is None:
+                    return result
+                errors = []
+            except ValidationError as exc:
+                errors = exc.errors()
+        errors, incomplete = errors + incomplete, []
+        if llm is None or attempt == max_repairs:
+            raise StructuredOutputError(f"model output does not match {schema.__name__}", text, errors)
+        for path in _fragments(errors, data):
+            if not path or not isinstance(data, dict):
+                # Nothing to keep: ask for the whole object again
+                path, annotation = (), schema
+            else:
+                annotation = _annotation(schema, path)
+            adapter = TypeAdapter(annotation)
+            messages_for_fragment = list(messages or []) + [
+                AIMessage(text),
+                HumanMessage(FRAGMENT_PROMPT.format(
+                    errors="\n".join(f"- {_path_name(e['loc']) or 'answer'}: {e['msg']}" for e in errors),
+                    path=_describe(path),
+                    schema=json.dumps(adapter.json_schema()))),
+            ]
+            stats["fragments"] = stats.get("fragments", 0) + 1
+            value = repair_json(_text(llm.invoke(messages_for_fragment)))
+            if value is None:
+                continue
+            if not path:
+                data = value
+                break
+            else:
+                _set(data, path, value)
+
+
+def _is_json(text):
+    try:
+        json.loads(text)
+        return True
+    except ValueError:
+        return False
+
+
+def _text(message):
+    content = message.content
+    if isinstance(content, list):
+        return "".join(block.get("text", "") if isinstance(block, dict) else str(block) for block in content)
+    return content
+
+
+def _messages(prompt):
+    if hasattr(prompt, "to_messages"):
+        return prompt.to_messages()
+    if isinstance(prompt, str):
+        return [HumanMessage(prompt)]
+    return list(prompt)
+
+
+def _with_instructions(messages, schema):
+    instructions = FORMAT_INSTRUCTIONS.format(schema=json.dumps(schema.model_json_schema()))
+    last = messages[-1] if messages else None
+    if isinstance(last, HumanMessage) and isinstance(last.content, str):
+        return messages[:-1] + [HumanMessage(f"{last.content}\n\n{instructions}")]
+    return messages + [HumanMessage(instructions)]
+
+
+def _supports_tools(llm):
+    return isinstance(llm, BaseChatModel) and type(llm).bind_tools is not BaseChatModel.bind_tools
+
+
+def _tool_result(result):
+    """``(parsed, text)`` from ``with_structured_output(..., include_raw=True)``."""
+    raw = result["raw"]
+    text = json.dumps(raw.tool_calls[0]["args"]) if getattr(raw, "tool_calls", None) else _text(raw)
+    return result["parsed"], text
+
+
+def structured_output(llm, schema, max_repairs=2, stats=None):
+    """Runnable from a prompt (value, messages or string) to a validated ``schema`` instance."""
+    from llmkit.gateway import GatewayChatModel
+
+    response_format = {"type": "json_schema",
+                       "json_schema": {"name": schema.__name__, "schema": schema.model_json_schema()}}
+    native = isinstance(llm, GatewayChatModel)
+    tools = not native and _supports_tools(llm)
+
+    def generate(messages):
+        """``(parsed or None, text)`` from the provider's best structured mode."""
+        if native:
+            return None, _text(llm.invoke(messages, response_format=response_format))
+        if tools:
+            return _tool_result(llm.with_structured_output(schema, include_raw=True).invoke(messages))
+        return None, _text(llm.invoke(_with_instructions(messages, schema)))
+
+    async def agenerate(messages):
+        if native:
+            return None, _text(await llm.ainvoke(messages, response_format=response_format))
+        if tools:
+            return _tool_result(await llm.with_structured_output(schema, include_raw=True).ainvoke(messages))
+        return None, _text(await llm.ainvoke(_with_instructions(messages, schema)))
+
+    def run(prompt):
+        messages = _messages(prompt)
+        parsed, text = generate(messages)
+        if isinstance(parsed, schema):
+            return parsed
+        return parse_structured(text, schema, llm, messages, max_repairs, stats)
+
+    async def arun(prompt):
+        messages = _messages(prompt)
+        parsed, text = await agenerate(messages)
+        if isinstance(parsed, schema):
+            return parsed
+        # Validation is cheap; the rare fragment re-requests are blocking calls
+        return await asyncio.get_running_loop().run_in_executor(
+            None, parse_structured, text, schema, llm, messages, max_repairs, stats)
+
+    return RunnableLambda(run, afunc=arun, name=f"structured_output[{schema.__name__}]")
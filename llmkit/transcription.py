@@ -0,0 +1,177 @@
+"""Whisper model registry and on-disk transcription cache.
+
+``whisper.load_model`` takes seconds and hundreds of MB, so each model size
+is loaded once per process. Transcripts are stored as JSON files named after
+the model size and the SHA-256 of the audio bytes, so the same recording is
+only ever transcribed once per model, across restarts too.
+
+``transcribe_long`` handles long recordings: it cuts the audio at quiet
+points into segments of bounded length, transcribes them in a process pool
+and yields each segment as soon as it is done.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import as_completed
+
+import numpy as np
+
+from llmkit import process_pool
+
+DEFAULT_CACHE_DIR = ".transcripts"
+SAMPLE_RATE = 16000
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def load_whisper_model(size="base"):
+    """Return the process-wide Whisper model for ``size``, loading it on first use."""
+    with _models_lock:
+        if size not in _models:
+            import whisper
+
+            _models[size] = whisper.load_model(size)
+        return _models[size]
+
+
+def _cache_path(cache_dir, size, digest):
+    return os.path.join(cache_dir, f"{size}-{digest}.json")
+
+
+def _read_cache(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_cache(path, result):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+    os.replace(tmp_path, path)
+
+
+def transcribe_bytes(data, suffix=".m4a", size="base", cache_dir=DEFAULT_CACHE_DIR):
+    """Transcribe raw audio bytes; returns Whisper's result dict (``text``, ``segments``).
+
+    The bytes are only written to a temporary file (Whisper needs a path for
+    ffmpeg) when the transcript is not cached yet.
+    """
+    path = _cache_path(cache_dir, size, hashlib.sha256(data).hexdigest())
+    cached = _read_cache(path)
+    if cached is not None:
+        return cached
+
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+        f.write(data)
+        audio_path = f.name
+    try:
+        result = load_whisper_model(size).transcribe(audio_path)
+    finally:
+        os.remove(audio_path)
+
+    result = {"text": result["text"], "language": result.get("language"),
+              "segments": [{"start": s["start"], "end": s["end"], "text": s["text"]}
+                           for s in result.get("segments", [])]}
+    _write_cache(path, result)
+    return result
+
+
+def transcribe_file(audio_path, size="base", cache_dir=DEFAULT_CACHE_DIR):
+    with open(audio_path, "rb") as f:
+        data = f.read()
+    return transcribe_bytes(data, os.path.splitext(audio_path)[1], size, cache_dir)
+
+
+def split_on_silence(audio, max_seconds=60.0, first_seconds=None, frame_seconds=0.03,
+                     sample_rate=SAMPLE_RATE):
+    """Cut ``audio`` into ``(start, end)`` sample ranges of at most ``max_seconds``.
+
+    Each cut is placed at the quietest frame (lowest RMS energy) in the second
+    half of the window, which in speech is almost always a pause between
+    words, so no segment starts or ends mid-word. ``first_seconds`` caps the
+    first segment separately so the first text comes back quickly.
+    """
+    frame = int(sample_rate * frame_seconds)
+    n_frames = len(audio) // frame
+    max_frames = int(max_seconds / frame_seconds)
+    window = int((first_seconds or max_seconds) / frame_seconds)
+    energy = np.sqrt(np.mean(np.square(audio[:n_frames * frame].reshape(n_frames, frame)), axis=1))
+
+    cuts, start = [0], 0
+    while n_frames - start > window:
+        low = start + window // 2
+        start = low + int(np.argmin(energy[low:start + window]))
+        cuts.append(start * frame)
+        window = max_frames
+    cuts.append(len(audio))
+    return list(zip(cuts[:-1], cuts[1:]))
+
+
+def _init_worker():
+    try:
+        import torch
+
+        torch.set_num_threads(1)
+    except ImportError:
+        pass
+
+
+def _transcribe_segment(index, offset, audio, size):
+    result = load_whisper_model(size).transcribe(audio, fp16=False)
+    segments = [{"start": s["start"] + offset, "end": s["end"] + offset, "text": s["text"]}
+                for s in result.get("segments", [])]
+    return index, result["text"], segments, result.get("language")
+
+
+def transcribe_long(data, suffix=".m4a", size="base", workers=None, max_segment_seconds=60.0,
+                    first_segment_seconds=15.0, cache_dir=DEFAULT_CACHE_DIR):
+    """Transcribe long audio in parallel, yielding segments as they finish.
+
+    Yields ``{"index", "start", "end", "text"}`` dicts in completion order
+    (not necessarily in time order); ``index`` gives the position in the
+    recording. The merged transcript is written to the same cache as
+    ``transcribe_bytes``, so a cached file is replayed immediately.
+    """
+    path = _cache_path(cache_dir, size, hashlib.sha256(data).hexdigest())
+    cached = _read_cache(path)
+    if cached is not None:
+        for index, segment in enumerate(cached["segments"]):
+            yield {"index": index, **segment}
+        return
+
+    import whisper
+
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+        f.write(data)
+        audio_path = f.name
+    try:
+        audio = whisper.load_audio(audio_path)
+    finally:
+        os.remove(audio_path)
+
+    ranges = split_on_silence(audio, max_segment_seconds, first_segment_seconds)
+    # Long-lived pool, so each worker loads its model only once
+    workers = workers or min(4, os.cpu_count() or 1)
+    futures = [process_pool.submit(workers, _transcribe_segment, i, start / SAMPLE_RATE, audio[start:end], size,
+                                   initializer=_init_worker)
+               for i, (start, end) in enumerate(ranges)]
+
+    parts, language = {}, None
+    for future in as_completed(futures):
+        index, text, segments, language = future.result()
+        parts[index] = (text, segments)
+        start, end = ranges[index]
+        yield {"index": index, "start": start / SAMPLE_RATE, "end": end / SAMPLE_RATE, "text": text}
+
+    ordered = [parts[i] for i in range(len(ranges))]
+    _write_cache(path, {
+        "text": "".join(text for text, _ in ordered),
+        "language": language,
+        "segments": [s for _, segments in ordered for s in segments],
+    })
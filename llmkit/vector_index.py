@@ -0,0 +1,243 @@
+"""Persistent, content-addressed Chroma index.
+
+``Chroma.from_documents`` re-embeds the whole corpus on every start. The
+helpers here give each chunk a stable id derived from its text, its source
+metadata, the splitter settings and the embedding model, so reopening an
+on-disk store only embeds chunks whose id is not stored yet and drops ids
+that no longer exist in the corpus.
+
+``IndexWatcher`` applies the same diff while an app is running: it polls
+the source files and, when one changes, re-splits only that file and
+embeds only its new chunks, so editing one line costs one or two chunk
+embeddings instead of a rebuild.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from langchain_chroma import Chroma
+
+from llmkit.embedding_cache import embedding_model_name
+from llmkit.ingest import PrecomputedEmbeddings, aingest, embed_and_write, run_sync
+
+logger = logging.getLogger(__name__)
+
+
+def splitter_settings(splitter):
+    """The splitter parameters that change how a corpus is chunked."""
+    return {
+        "type": type(splitter).__name__,
+        "chunk_size": getattr(splitter, "_chunk_size", None),
+        "chunk_overlap": getattr(splitter, "_chunk_overlap", None),
+    }
+
+
+def _digest(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def index_key(embeddings, splitter):
+    """Short hash of the embedding model and splitter settings."""
+    settings = json.dumps(splitter_settings(splitter), sort_keys=True)
+    return _digest(embedding_model_name(embeddings), settings)[:16]
+
+
+def chunk_id(chunk, key):
+    """Stable id of one chunk under a given ``index_key``."""
+    metadata = json.dumps(chunk.metadata, sort_keys=True, default=str)
+    return _digest(key, metadata, chunk.page_content)
+
+
+async def async_documents(vector_store, chunks, key, **ingest_options):
+    """Make ``vector_store`` hold exactly ``chunks``, embedding only new ones.
+
+    New chunks go through ``llmkit.ingest.aingest``; ``ingest_options`` are
+    passed on to it. ``chunks`` may be a generator: it is consumed as the
+    embedding batches go out and only chunk ids are kept, so memory does not
+    grow with the size of the corpus. Returns a ``(added, removed)`` tuple
+    with the number of chunks that had to be embedded and the number of
+    stale chunks deleted.
+    """
+    stored = set(vector_store.get(include=[])["ids"])
+    wanted = set()
+
+    def new_chunks():
+        for chunk in chunks:
+            i = chunk_id(chunk, key)
+            if i in wanted:
+                continue
+            wanted.add(i)
+            if i not in stored:
+                yield i, chunk
+
+    stats = await aingest(vector_store, new_chunks(), vector_store.embeddings, **ingest_options)
+    stale_ids = list(stored - wanted)
+    if stale_ids:
+        vector_store.delete(ids=stale_ids)
+    return stats["chunks"], len(stale_ids)
+
+
+def sync_documents(vector_store, chunks, key, **ingest_options):
+    """Blocking ``async_documents``, also callable from a running event loop."""
+    return run_sync(async_documents(vector_store, chunks, key, **ingest_options))
+
+
+def open_persistent_index(chunks, embeddings, splitter, persist_directory,
+                          collection_prefix="langchain", **ingest_options):
+    """Open (or create) the on-disk store for ``chunks`` and bring it up to date.
+
+    The collection name includes the ``index_key`` so changing the splitter
+    or the embedding model starts a fresh collection instead of mixing
+    vectors from different models.
+    """
+    key = index_key(embeddings, splitter)
+    vector_store = Chroma(
+        collection_name=f"{collection_prefix}-{key}",
+        embedding_function=PrecomputedEmbeddings(embeddings),
+        persist_directory=persist_directory,
+    )
+    sync_documents(vector_store, chunks, key, **ingest_options)
+    return vector_store
+
+
+def _load_text(path):
+    from langchain_community.document_loaders import TextLoader
+
+    return TextLoader(path).load()
+
+
+def _file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class IndexWatcher:
+    """Keep ``vector_store`` in sync with the files at ``paths`` by polling them.
+
+    ``check()`` stats every file; a file whose size or mtime changed is
+    hashed, and only if its content changed is it reloaded (with ``load``,
+    ``TextLoader`` by default), split and diffed against the chunk ids it
+    had before: new chunks are embedded, vanished ones deleted. The first
+    call diffs all files against the whole store, like ``sync_documents``.
+    ``start()`` runs ``check()`` every ``interval`` seconds on a daemon
+    thread; ``on_change(watcher)`` is called after each applied change, e.g.
+    to rebuild a lexical index from ``watcher.chunks()``.
+    """
+
+    def __init__(self, vector_store, paths, splitter, load=_load_text, on_change=None, **ingest_options):
+        self.vector_store = vector_store
+        self.paths = list(paths)
+        self.splitter = splitter
+        self.load = load
+        self.on_change = on_change
+        self.ingest_options = ingest_options
+        self.key = index_key(vector_store.embeddings, splitter)
+        self._signatures = {}
+        self._digests = {}
+        self._chunks = {}
+        self._ids = {}
+        self._synced = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def chunks(self):
+        """Current chunks of all watched files."""
+        return [chunk for path in self.paths for chunk in self._chunks.get(path, [])]
+
+    @staticmethod
+    def _signature(path):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _split(self, path):
+        if not os.path.exists(path):
+            return [], {}
+        chunks = self.splitter.split_documents(self.load(path))
+        return chunks, {chunk_id(chunk, self.key): chunk for chunk in chunks}
+
+    def _apply(self, wanted, stored):
+        new = ((i, chunk) for i, chunk in wanted.items() if i not in stored)
+        added = embed_and_write(self.vector_store, new, self.vector_store.embeddings, **self.ingest_options)
+        stale = list(stored - wanted.keys())
+        if stale:
+            self.vector_store.delete(ids=stale)
+        return added, len(stale)
+
+    def _commit(self, path, seen, chunks, wanted):
+        self._signatures[path], self._digests[path] = seen
+        self._chunks[path] = chunks
+        self._ids[path] = set(wanted)
+
+    def check(self):
+        """Apply pending file changes; returns ``(added, removed)`` chunk counts."""
+        with self._lock:
+            changed = [path for path in self.paths if self._signature(path) != self._signatures.get(path, ())]
+            if not changed:
+                return 0, 0
+
+            # Signatures and digests are only recorded once the store holds the
+            # change, so a failed embedding call is retried on the next check
+            updates, seen = {}, {}
+            for path in changed:
+                signature = self._signature(path)
+                digest = _file_digest(path) if signature else None
+                seen[path] = signature, digest
+                if self._synced and digest == self._digests.get(path):
+                    continue
+                updates[path] = self._split(path)
+
+            added = removed = 0
+            if self._synced:
+                for path, (chunks, wanted) in updates.items():
+                    a, r = self._apply(wanted, self._ids.get(path, set()))
+                    added, removed = added + a, removed + r
+                    self._commit(path, seen[path], chunks, wanted)
+            elif updates:
+                wanted = {i: c for _, ids in updates.values() for i, c in ids.items()}
+                added, removed = self._apply(wanted, set(self.vector_store.get(include=[])["ids"]))
+                self._synced = True
+                for path, (chunks, wanted) in updates.items():
+                    self._commit(path, seen[path], chunks, wanted)
+            for path in seen.keys() - updates.keys():
+                self._signatures[path], self._digests[path] = seen[path]
+            if not updates:
+                return 0, 0
+        if added or removed:
+            logger.info("re-indexed %s: %d chunks added, %d removed", ", ".join(updates), added, removed)
+        if self.on_change is not None:
+            self.on_change(self)
+        return added, removed
+
+    def _run(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("re-indexing failed; will retry")
+
+    def start(self, interval=2.0):
+        """Check once now, then every ``interval`` seconds in the background."""
+        self.check()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, args=(interval,), daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
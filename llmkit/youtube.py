@@ -0,0 +1,113 @@
+"""YouTube playlist search for the learning path generators.
+
+``search_playlists_many`` resolves every keyword of a roadmap at once: the
+lookups run on a thread pool sized to the number of queries (at most
+``MAX_WORKERS``) over one pooled ``requests.Session`` (keep-alive, one TLS
+handshake per connection), so a 24-week roadmap costs about one round-trip
+instead of one per week. ``PlaylistPrefetcher`` does
+the same for keywords that arrive one at a time, e.g. while a roadmap is
+still being streamed.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+SEARCH_URL = "https://www.googleapis.com/youtube/v3/search"
+# Parallel lookups per call; the API quota, not the thread count, is the real limit
+MAX_WORKERS = 32
+
+_session = None
+_pool_size = 0
+_session_lock = threading.Lock()
+
+
+def get_session(pool_size=MAX_WORKERS):
+    """Process-wide session whose connection pool fits ``pool_size`` parallel calls.
+
+    The pool grows when a caller needs more connections than any before it.
+    """
+    global _session, _pool_size
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+        if pool_size > _pool_size:
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+            _pool_size = pool_size
+        return _session
+
+
+def search_playlists(query, api_key, max_results=3, session=None, timeout=10):
+    """
+    Searches YouTube for playlists matching `query`.
+    Returns list of dicts: {title, url}; empty on a missing key or any error.
+    """
+    if not api_key:
+        return []
+    params = {
+        "part": "snippet",
+        "q": query,
+        "type": "playlist",
+        "maxResults": max_results,
+        "key": api_key,
+    }
+    try:
+        r = (session or get_session()).get(SEARCH_URL, params=params, timeout=timeout)
+        r.raise_for_status()
+        results = []
+        for item in r.json().get("items", []):
+            playlist_id = item["id"].get("playlistId")
+            if playlist_id:
+                results.append({
+                    "title": item["snippet"].get("title"),
+                    "url": f"https://www.youtube.com/playlist?list={playlist_id}",
+                })
+        return results
+    except Exception:
+        return []
+
+
+def search_playlists_many(queries, api_key, max_results=3, max_workers=MAX_WORKERS):
+    """Look up all ``queries`` concurrently; returns ``{query: results}``.
+
+    Duplicate queries are only requested once.
+    """
+    unique = list(dict.fromkeys(queries))
+    if not unique or not api_key:
+        return {query: [] for query in unique}
+    workers = min(max_workers, len(unique))
+    session = get_session(workers)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(lambda q: search_playlists(q, api_key, max_results, session), unique)
+        return dict(zip(unique, results))
+
+
+class PlaylistPrefetcher:
+    """Start each lookup as soon as its query is known; every query is requested once.
+
+    ``submit(query)`` returns a ``Future`` of the results. Threads are only
+    started as queries arrive, up to ``max_workers``. Use as a context
+    manager so the worker threads are released.
+    """
+
+    def __init__(self, api_key, max_results=3, max_workers=MAX_WORKERS):
+        self.api_key = api_key
+        self.max_results = max_results
+        self._session = get_session(max_workers)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._futures = {}
+
+    def submit(self, query):
+        if query not in self._futures:
+            self._futures[query] = self._pool.submit(search_playlists, query, self.api_key,
+                                                     self.max_results, self._session)
+        return self._futures[query]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -1,14 +1,32 @@
 import streamlit as st
-from langchain_aws import ChatBedrock
 from langchain.prompts import PromptTemplate
 import random
+from llmkit.streaming import stream_to_streamlit
+from llmkit.resources import chat_bedrock
 
 # --- Initialize LLM (Claude via Bedrock) ---
-llm = ChatBedrock(
+llm = chat_bedrock(
     model_id="anthropic.claude-3-sonnet-20240229-v1:0",
     region_name="us-east-1"
 )
 
+# --- Prompt (built once, not on every click) ---
+prompt_template = PromptTemplate(
+    input_variables=["mood", "goals", "time_of_day"],
+    template="""
+                You are a warm, empathetic mindfulness coach.
+                Based on the user's current mood ({mood}), daily goal ({goals}), and time of day ({time_of_day}),
+                write a short, inspiring reflection to start their day.
+
+                Include:
+                1. A personalized affirmation (1 line)
+                2. A short mindfulness reflection (2–3 lines)
+                3. A journaling prompt (1 question)
+
+                Use a gentle, encouraging tone. Add fitting emojis.
+                """
+)
+
 # --- App Setup ---
 st.set_page_config(page_title="🧘 Mindful Morning Coach", layout="centered")
 
@@ -71,38 +89,18 @@ if st.button("🌸 Get My Mindful Note"):
         st.warning("Please select your mood and enter your goal for the day.")
     else:
         with st.spinner("Breathing in calm energy... ✨"):
-            # --- Prompt ---
-            prompt_template = PromptTemplate(
-                input_variables=["mood", "goals", "time_of_day"],
-                template="""
-                You are a warm, empathetic mindfulness coach.
-                Based on the user's current mood ({mood}), daily goal ({goals}), and time of day ({time_of_day}),
-                write a short, inspiring reflection to start their day.
-
-                Include:
-                1. A personalized affirmation (1 line)
-                2. A short mindfulness reflection (2–3 lines)
-                3. A journaling prompt (1 question)
-
-                Use a gentle, encouraging tone. Add fitting emojis.
-                """
-            )
-
             formatted_prompt = prompt_template.format(
                 mood=mood, goals=goals, time_of_day=time_of_day
             )
 
-            # --- Generate Response ---
-            response = llm.invoke(formatted_prompt)
-
-            # --- Display Output ---
+            # --- Generate and Display Output ---
             st.markdown("### 🌤️ Your Mindful Moment")
-            st.write(response.content)
+            reflection = stream_to_streamlit(llm, formatted_prompt)
 
             # --- Optional Download ---
             st.download_button(
                 label="📥 Save Reflection",
-                data=response.content,
+                data=reflection,
                 file_name=f"mindful_note_{time_of_day.lower()}.txt",
                 mime="text/plain"
             )
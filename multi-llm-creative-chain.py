@@ -1,14 +1,15 @@
 import streamlit as st
-from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from llmkit.streaming import stream_to_streamlit
+from llmkit.resources import chat_openai
 
 st.title("Startup Idea Generator & Critique")
 
 theme = st.text_input("Enter an industry or theme:", "sustainable travel")
 
-idea_llm = ChatOpenAI(model="gpt-5-mini")
-critic_llm = ChatOpenAI(model="gpt-5")
+idea_llm = chat_openai("gpt-5-mini")
+critic_llm = chat_openai("gpt-5")
 
 idea_prompt = PromptTemplate(
     input_variables=["theme"],
@@ -30,7 +31,6 @@ chain = (
 )
 
 if st.button("Generate & Critique"):
-    with st.spinner("Generating and analyzing ideas..."):
-        result = chain.invoke({"theme": theme})
     st.subheader("Results:")
-    st.write(result)
+    with st.spinner("Generating and analyzing ideas..."):
+        stream_to_streamlit(chain, {"theme": theme})
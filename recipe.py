@@ -1,16 +1,16 @@
 import os
-from langchain_openai import ChatOpenAI
 import streamlit as st
 from langchain.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from llmkit.streaming import stream_to_streamlit
+from llmkit.resources import chat_openai
+from llmkit.response_cache import cached_chat_model, response_cache
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 if not OPENAI_API_KEY:
     st.error("OPENAI_API_KEY not found in environment variables.")
     st.stop()
 
-llm = ChatOpenAI(model="gpt-4o", api_key=OPENAI_API_KEY)
-
 title_prompt = PromptTemplate(
     input_variables=["topic"],
     template="""
@@ -28,6 +28,9 @@ speech_prompt = PromptTemplate(
     for the following title: {title}
     """
 )
+llm = cached_chat_model(chat_openai("gpt-4o", api_key=OPENAI_API_KEY),
+                        response_cache("response_cache.sqlite3"), name="recipe",
+                        templates=[title_prompt, speech_prompt])
 
 first_chain = title_prompt | llm | StrOutputParser()
 second_chain = speech_prompt | llm | StrOutputParser()
@@ -41,5 +44,4 @@ if topic:
     st.subheader(f" {title}")
 
     # Generate recipe
-    recipe = second_chain.invoke({"title": title})
-    st.write(recipe)
+    recipe = stream_to_streamlit(second_chain, {"title": title})
@@ -1,12 +1,10 @@
 import os
-from langchain_aws import ChatBedrock
 import streamlit as st
 from langchain.prompts import PromptTemplate
+from llmkit.streaming import stream_to_streamlit
+from llmkit.resources import chat_bedrock
+from llmkit.response_cache import cached_chat_model, response_cache
 
-llm = ChatBedrock(
-    model_id="anthropic.claude-3-sonnet-20240229-v1:0",
-    region_name="us-east-1"
-)
 prompt_template = PromptTemplate(
     input_variables = ["skills","industry"],
     template = """
@@ -19,14 +17,22 @@ prompt_template = PromptTemplate(
     - Tech stack suggestion
     """
 )
+llm = cached_chat_model(
+    chat_bedrock(
+        model_id="anthropic.claude-3-sonnet-20240229-v1:0",
+        region_name="us-east-1"
+    ),
+    response_cache("response_cache.sqlite3"),
+    name="startup-ideator",
+    templates=[prompt_template]
+)
 
 st.title("AI Startup Ideator")
 
 skills = st.text_input("Enter the skills")
 industry = st.text_input("Enter the industry")
 if skills:
-    response = llm.invoke(prompt_template.format(skills=skills,
-                                                 industry=industry
-                                                 ))
-    st.write(response.content)
+    response = stream_to_streamlit(llm, prompt_template.format(skills=skills,
+                                                               industry=industry
+                                                               ))
     print(response)
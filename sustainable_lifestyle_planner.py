@@ -1,14 +1,48 @@
 import streamlit as st
-from langchain_aws import ChatBedrock
 from langchain.prompts import PromptTemplate
 import random
+from llmkit.streaming import stream_to_streamlit
+from llmkit.resources import chat_bedrock
 
 # --- Initialize LLM (AWS Bedrock) ---
-llm = ChatBedrock(
+llm = chat_bedrock(
     model_id="anthropic.claude-3-sonnet-20240229-v1:0",
     region_name="us-east-1"
 )
 
+# --- Prompt Template (built once, not on every click) ---
+prompt_template = PromptTemplate(
+    input_variables=["name", "focus_areas", "plan_type", "goal_duration", "motivation_level"],
+    template="""
+                Create a {plan_type} for {name}, focused on living a sustainable lifestyle.
+                Areas of focus: {focus_areas}.
+                Duration: {goal_duration} weeks.
+                Motivation level: {motivation_level}.
+
+                The plan should include:
+                - Specific daily or weekly eco-friendly actions
+                - Short, practical challenges
+                - Motivation quotes or affirmations
+                - A section called "Eco-Reflection" for journaling progress
+                - One 'Hero Challenge' each week to push limits
+                - End with a short summary called "Your Green Journey Ahead"
+                Format with emojis and clear sections.
+                """
+)
+
+
+def prompt_values(name, focus_areas, plan_type, goal_duration, motivation_level):
+    """Template variables from the form inputs; batch_generate.py renders its records with this too."""
+    return {
+        "name": name,
+        "focus_areas": ", ".join(focus_areas),
+        # "Daily Plan" -> "daily plan", as it reads in the middle of the sentence
+        "plan_type": plan_type.lower(),
+        "goal_duration": goal_duration,
+        "motivation_level": motivation_level,
+    }
+
+
 # --- Streamlit Page Setup ---
 st.set_page_config(
     page_title="🌱 Sustainable Lifestyle Planner",
@@ -50,46 +84,18 @@ if st.button("🌍 Generate My Sustainability Plan"):
         st.warning("Please enter your name and select at least one focus area.")
     else:
         with st.spinner("🌿 Crafting your personalized sustainability plan..."):
-            # --- Prompt Template ---
-            prompt_template = PromptTemplate(
-                input_variables=["name", "focus_areas", "plan_type", "goal_duration", "motivation_level"],
-                template="""
-                Create a {plan_type} for {name}, focused on living a sustainable lifestyle.
-                Areas of focus: {focus_areas}.
-                Duration: {goal_duration} weeks.
-                Motivation level: {motivation_level}.
-
-                The plan should include:
-                - Specific daily or weekly eco-friendly actions
-                - Short, practical challenges
-                - Motivation quotes or affirmations
-                - A section called "Eco-Reflection" for journaling progress
-                - One 'Hero Challenge' each week to push limits
-                - End with a short summary called "Your Green Journey Ahead"
-                Format with emojis and clear sections.
-                """
-            )
-
-            # ✅ Fix here — precompute lowercase version
-            plan_type_clean = plan_type.lower()
-
             formatted_prompt = prompt_template.format(
-                name=name,
-                focus_areas=", ".join(focus_areas),
-                plan_type=plan_type_clean,
-                goal_duration=goal_duration,
-                motivation_level=motivation_level
+                **prompt_values(name, focus_areas, plan_type, goal_duration, motivation_level)
             )
 
-            response = llm.invoke(formatted_prompt)
-
             # --- Display Results ---
-            st.success("✅ Your personalized sustainability plan is ready!")
+            status = st.empty()
             st.markdown("---")
-            st.markdown(response.content)
+            plan = stream_to_streamlit(llm, formatted_prompt)
+            status.success("✅ Your personalized sustainability plan is ready!")
             st.download_button(
                 label="📥 Download Plan as Text",
-                data=response.content,
+                data=plan,
                 file_name=f"{name}_SustainabilityPlan.txt",
                 mime="text/plain"
             )